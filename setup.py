@@ -17,9 +17,19 @@ setup(
     license='MIT',
     packages=find_packages(),
     install_requires=['blessings', 'tabulate'],
+    extras_require={'batch': ['numpy']},
     tests_require=['pytest', 'black', 'bpython', 'isort'],
     entry_points={
-        'console_scripts': ['mancala=src.main:main', 'mancala-series=src.series:main']
+        'console_scripts': [
+            'mancala=src.main:main',
+            'mancala-series=src.series:main',
+            'mancala-tournament=src.tournament:main',
+            'mancala-tablebase=src.tablebase:main',
+            'mancala-book=src.book:main',
+            'mancala-replay=src.record:main',
+            'mancala-server=src.server:main',
+            'mancala-benchmark=src.benchmark:main',
+        ]
     },
     zip_safe=False,
 )
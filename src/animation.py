@@ -0,0 +1,157 @@
+import os
+import select
+import sys
+import time
+from collections import namedtuple
+
+try:
+    import termios
+    import tty
+except ImportError:  # pragma: no cover
+    termios = tty = None
+
+DEFAULT_MAX_MOVE_DURATION = 3
+
+Frame = namedtuple('Frame', 'cups indicator_index')
+
+
+def sow_frames(cups, index):
+    """
+    Precompute the frames shown while sowing the cup at index.
+
+    The first frame shows the emptied cup. Every full lap around the board is
+    collapsed into a single frame, after which the remaining seeds are shown
+    landing one at a time. cups is not modified.
+    """
+    number_of_cups = len(cups)
+    cups = list(cups)
+    seeds = cups[index]
+    cups[index] = 0
+
+    frames = [Frame(tuple(cups), index)]
+
+    laps, remainder = divmod(seeds, number_of_cups)
+    for _ in range(laps):
+        for cup in range(number_of_cups):
+            cups[cup] += 1
+        frames.append(Frame(tuple(cups), index))
+
+    for offset in range(1, remainder + 1):
+        cup = (index + offset) % number_of_cups
+        cups[cup] += 1
+        frames.append(Frame(tuple(cups), cup))
+
+    return frames
+
+
+class _KeypressListener:
+    """
+    Puts a terminal stdin into cbreak mode so a single keypress can be seen
+    without waiting for Enter. When disabled, or when stdin is not a
+    terminal, wait() simply sleeps.
+    """
+
+    def __init__(self, stream=None, enabled=True):
+        self.stream = stream or sys.stdin
+        self.enabled = enabled and termios is not None
+        self._saved = None
+
+    def __enter__(self):
+        if self.enabled:
+            try:
+                if self.stream.isatty():
+                    fd = self.stream.fileno()
+                    self._saved = termios.tcgetattr(fd)
+                    tty.setcbreak(fd)
+            except (AttributeError, ValueError, OSError, termios.error):
+                self._saved = None
+        return self
+
+    def __exit__(self, *args):
+        if self._saved is not None:
+            termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    @property
+    def active(self):
+        return self._saved is not None
+
+    def wait(self, timeout):
+        """
+        Wait up to timeout seconds. Returns True if a key was pressed.
+        """
+        if not self.active:
+            if timeout > 0:
+                time.sleep(timeout)
+            return False
+
+        readable, _, _ = select.select([self.stream], [], [], max(timeout, 0))
+        if readable:
+            # Consume what was typed so it does not leak into the next prompt
+            os.read(self.stream.fileno(), 1024)
+            return True
+        return False
+
+
+class AnimationScheduler:
+    """
+    Plays precomputed frames with a bounded total duration.
+
+    Each frame is shown for frame_wait seconds, shortened so that a whole move
+    never takes longer than max_duration. Frames whose time slot has already
+    passed when the renderer catches up are dropped. The final frame is
+    always drawn, and a keypress skips straight to it.
+    """
+
+    def __init__(
+        self,
+        frame_wait,
+        max_duration=DEFAULT_MAX_MOVE_DURATION,
+        skip_on_keypress=True,
+        input_stream=None,
+    ):
+        self.frame_wait = frame_wait
+        self.max_duration = max_duration
+        self.skip_on_keypress = skip_on_keypress
+        self.input_stream = input_stream
+
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+        self.skipped = False
+
+    def _frame_wait(self, number_of_frames):
+        if self.max_duration is None:
+            return self.frame_wait
+        return min(self.frame_wait, self.max_duration / number_of_frames)
+
+    def play(self, frames, render):
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+        self.skipped = False
+
+        if not frames:
+            return
+
+        wait = self._frame_wait(len(frames))
+        last = len(frames) - 1
+
+        listener = _KeypressListener(self.input_stream, enabled=self.skip_on_keypress)
+
+        with listener:
+            start = time.monotonic()
+            for idx, frame in enumerate(frames):
+                next_deadline = start + (idx + 1) * wait
+
+                if idx != last and time.monotonic() >= next_deadline:
+                    self.frames_dropped += 1
+                    continue
+
+                render(frame)
+                self.frames_drawn += 1
+
+                if listener.wait(next_deadline - time.monotonic()) and idx != last:
+                    self.skipped = True
+                    self.frames_dropped += last - idx - 1
+                    render(frames[last])
+                    self.frames_drawn += 1
+                    return
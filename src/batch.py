@@ -0,0 +1,217 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from src.engine import Side
+from src.player import PlayerType
+
+
+class BatchEngine:
+    """
+    Many games of the same size played in lockstep.
+
+    The cups of every game live in one (games x cups) array. apply_moves sows
+    one cup in every unfinished game with array operations: full laps are
+    added with a single division and only the remainder is spread over the
+    following cups. Games that are over are masked out and left untouched.
+    """
+
+    def __init__(self, number_of_games, side_length=6, initial_seeds=3):
+        if np is None:
+            raise ImportError('numpy is required for batched simulation')
+
+        self.number_of_games = number_of_games
+        self.side_length = side_length
+        self.total_number_of_cups = side_length * 2 + 2
+        self._midpoint = self.total_number_of_cups // 2
+
+        self.store_indices = np.array([0, self._midpoint])
+        self.playable = np.ones(self.total_number_of_cups, dtype=bool)
+        self.playable[self.store_indices] = False
+        self._cup_indices = np.arange(self.total_number_of_cups)
+
+        self.cups = np.zeros(
+            (number_of_games, self.total_number_of_cups), dtype=np.int64
+        )
+        self.cups[:, self.playable] = initial_seeds
+        self.side_to_move = np.full(number_of_games, Side.Player1, dtype=np.int8)
+        self.game_ids = np.arange(number_of_games)
+        self.finished = self.done()
+
+    def legal_mask(self):
+        return (self.cups > 0) & self.playable
+
+    def done(self):
+        return ~self.legal_mask().any(axis=1)
+
+    def free_play_mask(self):
+        """
+        Legal cups whose last seed lands in the store of the side to move.
+        """
+        landing = (self._cup_indices + self.cups) % self.total_number_of_cups
+        stores = self.store_indices[self.side_to_move]
+        return self.legal_mask() & (landing == stores[:, None])
+
+    def apply_moves(self, moves):
+        """
+        Sow moves[g] in game g for every unfinished game and return the index
+        the last seed landed in (-1 for finished games).
+        """
+        moves = np.asarray(moves)
+        number_of_cups = self.total_number_of_cups
+        last_indices = np.full(self.number_of_games, -1, dtype=np.int64)
+
+        games = np.nonzero(~self.finished)[0]
+        if not len(games):
+            return last_indices
+
+        moves = moves[games]
+        seeds = self.cups[games, moves]
+        self.cups[games, moves] = 0
+
+        laps, remainder = np.divmod(seeds, number_of_cups)
+        offsets = (self._cup_indices[None, :] - moves[:, None] - 1) % number_of_cups
+        self.cups[games] += laps[:, None] + (offsets < remainder[:, None])
+
+        last = (moves + seeds) % number_of_cups
+        sides = self.side_to_move[games]
+        extra_turn = last == self.store_indices[sides]
+        self.side_to_move[games] = np.where(extra_turn, sides, 1 - sides)
+
+        last_indices[games] = last
+        self.finished = self.done()
+        return last_indices
+
+    def drop_finished(self):
+        """
+        Remove finished games from the batch so later steps only touch games
+        still in progress. Returns the original ids of the removed games and
+        their winners.
+        """
+        finished = self.finished
+        game_ids = self.game_ids[finished]
+        winners = self.winners()[finished]
+
+        in_progress = ~finished
+        self.cups = self.cups[in_progress]
+        self.side_to_move = self.side_to_move[in_progress]
+        self.game_ids = self.game_ids[in_progress]
+        self.finished = self.finished[in_progress]
+        self.number_of_games = len(self.game_ids)
+
+        return game_ids, winners
+
+    def winners(self):
+        """
+        Per game: 0 when Player1 won, 1 when Player2 won and -1 for a tie.
+        """
+        difference = self.cups[:, 0] - self.cups[:, self._midpoint]
+        return np.where(
+            difference > 0, Side.Player1, np.where(difference < 0, Side.Player2, -1)
+        )
+
+
+def random_moves(engine, rng):
+    """
+    Batch RandomPlayer: a uniformly random legal cup for every game.
+    """
+    keys = rng.random(engine.cups.shape)
+    keys[~engine.legal_mask()] = -1
+    return keys.argmax(axis=1)
+
+
+def improved_random_moves(engine, rng):
+    """
+    Batch ImprovedRandomPlayer: the free play with the fewest seeds when there
+    is one, otherwise a random legal cup.
+    """
+    free_play = engine.free_play_mask()
+    seeds = np.where(free_play, engine.cups, np.iinfo(engine.cups.dtype).max)
+    return np.where(
+        free_play.any(axis=1), seeds.argmin(axis=1), random_moves(engine, rng)
+    )
+
+
+BATCH_POLICIES = {
+    PlayerType.Random: random_moves,
+    PlayerType.ImprovedRandom: improved_random_moves,
+}
+
+
+class BatchSeries:
+    """
+    Series between two batch policies, with every game played at once.
+
+    As in Series, player 1 takes the first seat in even numbered games and the
+    second seat in odd numbered ones.
+    """
+
+    def __init__(
+        self,
+        player1_type,
+        player2_type,
+        number_of_games=10,
+        side_length=6,
+        initial_seeds=3,
+        seed=None,
+    ):
+        if player1_type not in BATCH_POLICIES or player2_type not in BATCH_POLICIES:
+            raise KeyError(
+                f'No batch policy for {player1_type} or {player2_type}. '
+                f'Available: {", ".join(str(key) for key in BATCH_POLICIES)}'
+            )
+
+        self.player1_type = player1_type
+        self.player2_type = player2_type
+        self.number_of_games = number_of_games
+        self.side_length = side_length
+        self.initial_seeds = initial_seeds
+        self.seed = seed
+
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+
+    def run_games(self):
+        rng = np.random.default_rng(self.seed)
+        engine = BatchEngine(
+            self.number_of_games,
+            side_length=self.side_length,
+            initial_seeds=self.initial_seeds,
+        )
+
+        # Side played by player 1 in each game
+        player1_sides = np.arange(self.number_of_games) % 2
+        player1_policy = BATCH_POLICIES[self.player1_type]
+        player2_policy = BATCH_POLICIES[self.player2_type]
+
+        wins = ties = 0
+        while engine.number_of_games:
+            moves = np.where(
+                engine.side_to_move == player1_sides[engine.game_ids],
+                player1_policy(engine, rng),
+                player2_policy(engine, rng),
+            )
+            engine.apply_moves(moves)
+
+            if engine.finished.any():
+                game_ids, winners = engine.drop_finished()
+                wins += int(np.count_nonzero(winners == player1_sides[game_ids]))
+                ties += int(np.count_nonzero(winners == -1))
+
+        self.wins += wins
+        self.ties += ties
+        self.losses += self.number_of_games - wins - ties
+
+    def final_results(self):
+        print()
+        print(f'Player 1 ({self.player1_type.value}):')
+        print(f'    Wins: {self.wins}')
+        print(f'    Losses: {self.losses}')
+        print(f'    Ties: {self.ties}')
+        print()
+        print(f'Player 2 ({self.player2_type.value}):')
+        print(f'    Wins: {self.losses}')
+        print(f'    Losses: {self.wins}')
+        print(f'    Ties: {self.ties}')
@@ -0,0 +1,347 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from collections import namedtuple
+
+from tabulate import tabulate
+
+from src.board import Board
+from src.engine import Engine
+from src.game import Game
+from src.geometry import BoardGeometry
+from src.player import (
+    AlphaBetaPlayer,
+    DefensivePlayer,
+    ImprovedRandomPlayer,
+    MonteCarloPlayer,
+    Player,
+    RandomPlayer,
+)
+from src.series import Series
+from src.utils import generate_sequence
+
+DEFAULT_BASELINE = os.path.join('benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_REPEAT = 5
+
+# A mid-game position used by every decision benchmark
+MIDGAME_CUPS = (5, 1, 5, 0, 6, 5, 4, 3, 4, 0, 7, 1, 0, 2)
+
+# Results only compare when these match. Python versions are compared up to
+# the minor version.
+ENVIRONMENT_FIELDS = ('python', 'implementation', 'machine')
+
+Comparison = namedtuple('Comparison', 'name baseline current ratio regressed')
+
+
+def _midgame_engine(player):
+    engine = Engine(6)
+    engine.assign_player(player)
+    engine.assign_player(Player('Opponent'))
+    engine.initialize_cups(3)
+    engine.cups[:] = MIDGAME_CUPS
+    return engine
+
+
+def _sow_benchmark(board, seeds):
+    start = list(board.cups)
+    start[1] = seeds
+    cup = board.index_to_cup[1]
+
+    def sow():
+        board.cups[:] = start
+        if board.renders:
+            board.sow(cup)
+        else:
+            board.sow_index(1)
+
+    return sow
+
+
+def _quiet_board():
+    board = Board(
+        6,
+        animation_wait=0,
+        player1=Player('Player1'),
+        player2=Player('Player2'),
+    )
+    board.initialize_cups(4)
+    board.renderer.stream = io.StringIO()
+    return board
+
+
+def _decision_benchmark(player):
+    engine = _midgame_engine(player)
+    player.seed(0)
+
+    def take_turn():
+        # Forget anything kept from the previous call, e.g. a search tree
+        player.assign_board(engine)
+        return player.take_turn()
+
+    return take_turn
+
+
+def _game_benchmark():
+    player1 = ImprovedRandomPlayer('Player1', wait_time=0)
+    player2 = RandomPlayer('Player2', wait_time=0)
+
+    def play():
+        # Reseeding replays the same game every time, so its length does not
+        # vary from one batch to the next
+        player1.seed(1)
+        player2.seed(2)
+        Game(player1=player1, player2=player2, initial_seeds=4, headless=True).run()
+
+    return play
+
+
+def _series_benchmark():
+    def play():
+        Series(
+            player1=DefensivePlayer('Player1', wait_time=0),
+            player2=RandomPlayer('Player2', wait_time=0),
+            number_of_games=10,
+            headless=True,
+            seed=0,
+        ).run_games()
+
+    return play
+
+
+def benchmarks():
+    """
+    Every benchmark as a dict of name to a zero argument callable. Names are
+    stable so results can be compared between runs.
+    """
+    engine = Engine(6)
+    engine.initialize_cups(4)
+    board = _quiet_board()
+    defensive = DefensivePlayer('Defensive', wait_time=0)
+    _midgame_engine(defensive)
+
+    return {
+        'engine.sow[seeds=4]': _sow_benchmark(engine, 4),
+        'engine.sow[seeds=20]': _sow_benchmark(engine, 20),
+        'engine.sow[seeds=200]': _sow_benchmark(engine, 200),
+        'board.sow[seeds=4]': _sow_benchmark(board, 4),
+        'board.sow[seeds=20]': _sow_benchmark(board, 20),
+        'board.display_cups': board.display_cups,
+        'geometry.build[side=6]': lambda: BoardGeometry(6),
+        'geometry.build[side=500]': lambda: BoardGeometry(500),
+        'engine.init[side=6]': lambda: Engine(6),
+        'generate_sequence[1000]': lambda: generate_sequence(1000),
+        'random.take_turn': _decision_benchmark(RandomPlayer('Random', wait_time=0)),
+        'improved_random.take_turn': _decision_benchmark(
+            ImprovedRandomPlayer('ImprovedRandom', wait_time=0)
+        ),
+        'defensive.take_turn': _decision_benchmark(
+            DefensivePlayer('Defensive', wait_time=0)
+        ),
+        'defensive._score_moves': defensive._score_moves,
+        'alpha_beta.take_turn[depth=4]': _decision_benchmark(
+            AlphaBetaPlayer('AlphaBeta', wait_time=0, depth=4)
+        ),
+        'monte_carlo.take_turn[playouts=100]': _decision_benchmark(
+            MonteCarloPlayer('MonteCarlo', wait_time=0, playouts=100)
+        ),
+        'game.headless': _game_benchmark(),
+        'series.headless[games=10]': _series_benchmark(),
+    }
+
+
+def measure(function, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    """
+    Seconds per call of function. The call count is grown until one batch
+    takes at least min_time, then the fastest of repeat batches is kept,
+    which is the least disturbed by whatever else the machine was doing.
+    """
+    timer = timeit.Timer(function)
+
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 10 >= min_time else 10
+
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number))
+    return {'seconds_per_op': best / number, 'number': number, 'repeat': repeat}
+
+
+def run(names=None, min_time=DEFAULT_MIN_TIME, repeat=DEFAULT_REPEAT):
+    results = {}
+    for name, function in benchmarks().items():
+        if names and not any(part in name for part in names):
+            continue
+        results[name] = measure(function, min_time=min_time, repeat=repeat)
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'timestamp': time.time(),
+        'benchmarks': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two sets of results. A benchmark has regressed when it got more
+    than threshold slower than the baseline. Benchmarks missing from either
+    side are skipped.
+    """
+    comparisons = []
+    for name, result in current['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+
+        before = baseline['benchmarks'][name]['seconds_per_op']
+        after = result['seconds_per_op']
+        ratio = after / before if before else float('inf')
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline=before,
+                current=after,
+                ratio=ratio,
+                regressed=ratio > 1 + threshold,
+            )
+        )
+    return comparisons
+
+
+def _environment_value(results, field):
+    value = results.get(field)
+    if field == 'python' and value:
+        return '.'.join(value.split('.')[:2])
+    return value
+
+
+def environment_differences(baseline, current):
+    """
+    (field, baseline value, current value) for every ENVIRONMENT_FIELDS
+    entry that differs. Timings taken in different environments say nothing
+    about the code, so main refuses to compare them.
+    """
+    return [
+        (field, baseline.get(field), current.get(field))
+        for field in ENVIRONMENT_FIELDS
+        if _environment_value(baseline, field) != _environment_value(current, field)
+    ]
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def _print_results(current):
+    print(
+        tabulate(
+            [
+                [name, _format_seconds(result['seconds_per_op'])]
+                for name, result in current['benchmarks'].items()
+            ],
+            headers=['Benchmark', 'Time'],
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Time the hot paths and compare them with a baseline'
+    )
+    parser.add_argument(
+        'names', nargs='*', help='Only run benchmarks whose name contains one'
+    )
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='Write the results to the baseline instead of comparing',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='Fail when a benchmark is this fraction slower than the baseline',
+    )
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    try:
+        current = run(args.names, min_time=args.min_time, repeat=args.repeat)
+    except KeyboardInterrupt:
+        return
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        _print_results(current)
+        return
+
+    if not os.path.exists(args.baseline):
+        _print_results(current)
+        print(
+            f'\nNo baseline at {args.baseline}. Record one in this environment '
+            'with --save-baseline first.'
+        )
+        sys.exit(1)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    comparisons = compare(baseline, current, threshold=args.threshold)
+    print(
+        tabulate(
+            [
+                [
+                    comparison.name,
+                    _format_seconds(comparison.baseline),
+                    _format_seconds(comparison.current),
+                    f'{comparison.ratio:.2f}x',
+                    'REGRESSED' if comparison.regressed else '',
+                ]
+                for comparison in comparisons
+            ],
+            headers=['Benchmark', 'Baseline', 'Current', 'Ratio', ''],
+        )
+    )
+
+    differences = environment_differences(baseline, current)
+    if differences:
+        print(f'\nThe baseline in {args.baseline} was recorded elsewhere:')
+        for field, before, after in differences:
+            print(f'    {field}: {before} (baseline) vs {after} (current)')
+        print(
+            'Timings from different environments cannot be compared. Rerun '
+            'with --save-baseline here to record a baseline for this one.'
+        )
+        sys.exit(1)
+
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(
+            f'\n{len(regressions)} benchmark(s) regressed by more than '
+            f'{args.threshold:.0%}'
+        )
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
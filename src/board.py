@@ -1,30 +1,21 @@
-import itertools
 import time
-from collections import namedtuple
 
-from src.terminal import Location, Terminal
-from src.utils import generate_sequence
+from src.animation import DEFAULT_MAX_MOVE_DURATION, AnimationScheduler, sow_frames
+from src.engine import (  # noqa: F401
+    EmptyCup,
+    Engine,
+    InvalidCup,
+    NotEnoughPlayers,
+    TooManyPlayers,
+)
+from src.geometry import HORIZONTAL_SPACING, Indicator  # noqa: F401
+from src.renderer import FrameRenderer
+from src.terminal import get_terminal
 
-Indicator = namedtuple('Indicator', 'location symbol')
 
+class Board(Engine):
+    renders = True
 
-class InvalidCup(Exception):
-    pass
-
-
-class EmptyCup(Exception):
-    pass
-
-
-class TooManyPlayers(Exception):
-    pass
-
-
-class NotEnoughPlayers(Exception):
-    pass
-
-
-class Board:
     def __init__(
         self,
         side_length,
@@ -33,6 +24,8 @@ class Board:
         index_color=None,
         player1=None,
         player2=None,
+        max_move_duration=DEFAULT_MAX_MOVE_DURATION,
+        metrics=None,
     ):
         """
         Indexes and their associated letters:
@@ -42,49 +35,27 @@ class Board:
         0                               8
             15  14  13  12  11  10  9
             h   i   j   k   l   m   n
-        """
-        self.term = Terminal()
-        self.side_length = side_length
-        self.total_number_of_cups = self.side_length * 2 + 2
-        self.cups = [0] * self.total_number_of_cups
 
+        metrics, if given, is a src.metrics.Metrics that the time spent
+        drawing is recorded in.
+        """
+        super().__init__(side_length)
+        self.term = get_terminal()
+        self.renderer = FrameRenderer(self.term, metrics=metrics)
         self._SEED_COLOR = seed_color
         self._INDEX_COLOR = index_color
 
         self._ANIMATION_WAIT = animation_wait
-
-        self._INITIAL_LOCATION = Location(5, 10)
-        self._HORIZONTAL_SPACER = Location(0, 4)
-
-        self._TOP_ROW_INDICATOR_LOCATION = (
-            self._INITIAL_LOCATION + self._HORIZONTAL_SPACER
-        )
-        self._TOP_ROW_INDICES_LOCATION = self._TOP_ROW_INDICATOR_LOCATION + Location(
-            1, 0
-        )
-        self._TOP_ROW_LOCATION = self._TOP_ROW_INDICES_LOCATION + Location(1, 0)
-
-        self._PLAYER_1_LOCATION = Location(
-            self._TOP_ROW_LOCATION.row + 1, self._INITIAL_LOCATION.column
-        )
-        self._PLAYER_2_LOCATION = self._PLAYER_1_LOCATION + Location(
-            0, self._HORIZONTAL_SPACER.column * (self.side_length + 1)
-        )
-
-        self._BOTTOM_ROW_LOCATION = (
-            self._PLAYER_1_LOCATION + self._HORIZONTAL_SPACER + Location(1, 0)
+        self._animation = AnimationScheduler(
+            animation_wait, max_duration=max_move_duration
         )
-        self._BOTTOM_ROW_INDICES_LOCATION = self._BOTTOM_ROW_LOCATION + Location(1, 0)
-        self._BOTTOM_ROW_INDICATOR_LOCATION = (
-            self._BOTTOM_ROW_INDICES_LOCATION + Location(1, 0)
-        )
-
-        self._PLAYER_1_INDICATOR = self._PLAYER_1_LOCATION - self._HORIZONTAL_SPACER
-        self._PLAYER_2_INDICATOR = self._PLAYER_2_LOCATION + self._HORIZONTAL_SPACER
 
-        self._build_index_dicts()
+        # First row position drawn when the board is wider than the terminal
+        self._window_start = 0
 
-        self.players = []
+        # Seconds the last sow spent animating and drawing rather than
+        # moving seeds
+        self.presentation_time = 0.0
 
         if player1:
             self.assign_player(player1)
@@ -92,228 +63,146 @@ class Board:
         if player2:
             self.assign_player(player2)
 
-    @property
-    def ready_to_play(self):
-        return len(self.players) == 2
-
-    def assign_player(self, player):
-        if len(self.players) == 2:
-            raise TooManyPlayers('Cannot add any more players to this board')
-
-        if not self.players:
-            self.player1 = player
-            self.player1.assign_board(self)
-        elif len(self.players) == 1:
-            self.player2 = player
-            self.player2.assign_board(self)
-        self.players.append(player)
+    def reset(self, initial_seeds=None, player1=None, player2=None):
+        super().reset(initial_seeds=initial_seeds, player1=player1, player2=player2)
+        self._window_start = 0
 
     @property
     def max_row(self):
-        return self._BOTTOM_ROW_INDICATOR_LOCATION.row
+        return self.geometry.max_row
 
     @property
     def max_column(self):
-        return self._PLAYER_2_INDICATOR.column
+        return self.geometry.max_column - self._hidden_width(self.visible_columns)
 
     @property
     def min_row(self):
-        return self._INITIAL_LOCATION.row
+        return self.geometry.min_row
 
     @property
     def min_column(self):
-        return self._INITIAL_LOCATION.column
-
-    @property
-    def top_row(self):
-        return self.cups[1 : self._midpoint]
-
-    @property
-    def top_row_indices(self):
-        return [i for i in range(1, self._midpoint)]
+        return self.geometry.min_column
 
     @property
-    def top_row_cups(self):
-        return sorted([self.index_to_cup[idx] for idx in self.top_row_indices])
-
-    @property
-    def bottom_row(self):
-        return self.cups[self._midpoint + 1 :]
-
-    @property
-    def bottom_row_indices(self):
-        return [i for i in range(self._midpoint + 1, len(self.cups))]
-
-    @property
-    def bottom_row_cups(self):
-        return sorted([self.index_to_cup[idx] for idx in self.bottom_row_indices])
-
-    @property
-    def player_1_cup_index(self):
-        return 0
-
-    @property
-    def player_2_cup_index(self):
-        return self._midpoint
-
-    @property
-    def player_1_cup(self):
-        return self.cups[self.player_1_cup_index]
-
-    @property
-    def player_2_cup(self):
-        return self.cups[self.player_2_cup_index]
-
-    @property
-    def _midpoint(self):
-        return len(self.cups) // 2
+    def visible_columns(self):
+        """
+        How many cups of each row fit in the terminal. Every cup is shown
+        when the width is unknown.
+        """
+        width = self.term.width
+        if width is None:
+            return self.side_length
+        return self.geometry.columns_that_fit(width)
 
-    def cup_seeds(self, cup):
-        return self.cups[self.cup_to_index[cup]]
+    def _hidden_width(self, visible):
+        return (self.side_length - visible) * HORIZONTAL_SPACING
 
-    def cup_seeds_by_index(self, index):
-        return self.cups[index]
+    def scroll_to(self, index, visible=None):
+        """
+        Move the window just far enough for the cup at index to be drawn.
+        Stores are always drawn.
+        """
+        if visible is None:
+            visible = self.visible_columns
 
-    @property
-    def cup_to_index(self):
-        return self._cup_to_index
+        position = self.geometry.row_positions[index]
+        if position is None:
+            return
 
-    @property
-    def index_to_cup(self):
-        return self._index_to_cup
-
-    def _build_index_dicts(self):
-        self._cup_to_index = dict()
-        self._index_to_cup_indicator = dict()
-
-        letter_sequence = generate_sequence(len(self.cups) - 2)
-
-        for i in range(1, self._midpoint):
-            letter = letter_sequence.pop(0)
-            self._cup_to_index[letter] = i
-
-        for i in range(len(self.cups) - 1, self._midpoint, -1):
-            letter = letter_sequence.pop(0)
-            self._cup_to_index[letter] = i
-
-        self._index_to_cup = {v: k for k, v in self._cup_to_index.items()}
-
-        for i in range(len(self.cups)):
-            if i == 0:  # Player1's cup
-                self._index_to_cup_indicator[i] = Indicator(
-                    self._PLAYER_1_INDICATOR, '>'
-                )
-            elif i < self._midpoint:  # Top row
-                self._index_to_cup_indicator[i] = Indicator(
-                    (i - 1) * self._HORIZONTAL_SPACER
-                    + self._TOP_ROW_INDICATOR_LOCATION,
-                    'v',
-                )
-            elif i == self._midpoint:  # Player2's cup
-                self._index_to_cup_indicator[i] = Indicator(
-                    self._PLAYER_2_INDICATOR, '<'
-                )
-            else:  # Bottom row cups
-                self._index_to_cup_indicator[i] = Indicator(
-                    (len(self.cups) - i - 1) * self._HORIZONTAL_SPACER
-                    + self._BOTTOM_ROW_INDICATOR_LOCATION,
-                    '^',
-                )
+        if position < self._window_start:
+            self._window_start = position
+        elif position >= self._window_start + visible:
+            self._window_start = position - visible + 1
 
     def clear_indicators(self):
-        for idx, indicator in self._index_to_cup_indicator.items():
-            self.term.move(indicator.location)
-            self.term.display(' ')
-
-    def done(self):
-        return all(val == 0 for val in itertools.chain(self.top_row, self.bottom_row))
-
-    def initialize_cups(self, seeds):
-        for i in range(len(self.cups)):
-            if i == 0 or i == self._midpoint:
-                continue
-
-            self.cups[i] = int(seeds)
+        self.display_cups()
 
     def sow(self, cup, color=None):
         if cup not in self.cup_to_index:
             raise InvalidCup(f'Invalid cup. Got {cup}.')
 
-        self.clear_indicators()
         index = self.cup_to_index[cup]
         seeds = self.cups[index]
 
         if seeds == 0:
             raise EmptyCup(f"Cup '{cup}' is empty.")
 
-        self._draw_indicator(index, color=color)
-        print()
-        self.cups[index] = 0
-        self.display_cups()
-        time.sleep(self._ANIMATION_WAIT)
-
-        while seeds:
-            index += 1
-            self.cups[index % len(self.cups)] += 1
-            seeds -= 1
-            self.clear_board()
-            self.display_cups()
-            self._draw_indicator(index % len(self.cups), color=color)
-
-            print()
-            time.sleep(self._ANIMATION_WAIT)
-
-        return index % len(self.cups)
+        if not self._ANIMATION_WAIT:
+            # Nothing to animate, so skip the per-seed redraws entirely
+            last_index = self.sow_index(index)
+            start = time.perf_counter()
+            self.display_cups(indicator_index=last_index, color=color)
+            self.presentation_time = time.perf_counter() - start
+            return last_index
+
+        start = time.perf_counter()
+        frames = sow_frames(self.cups, index)
+        framed = time.perf_counter()
+        last_index = self.sow_index(index)
+        sown = time.perf_counter()
+        self._animation.play(
+            frames,
+            lambda frame: self.display_cups(
+                indicator_index=frame.indicator_index, color=color, cups=frame.cups
+            ),
+        )
+        self.presentation_time = framed - start + time.perf_counter() - sown
 
-    def _draw_indicator(self, index, color=None):
-        indicator = self._index_to_cup_indicator[index]
-        self.term.move(indicator.location)
-        self.term.display(indicator.symbol, color=color)
+        return last_index
 
     def clear_board(self):
-        for row in range(self.min_row, self.max_row):
-            # Iterate to max_columns + 1 in case player2's cup has 10 or more seeds
-            for column in range(self.min_column, self.max_column + 1):
-                self.term.move(row, column)
-                self.term.display(' ')
-
-        self.clear_indicators()
-
-    def display_cups(self):
-        self.term.move(self._PLAYER_1_LOCATION)
-        self.term.display(self.player_1_cup, color=self.player1.color)
-
-        self.term.move(self._PLAYER_2_LOCATION)
-        self.term.display(self.player_2_cup, color=self.player2.color)
-
-        # Draw the top row
-        # Draw cup indices
-        current_location = self._TOP_ROW_INDICES_LOCATION
-
-        for key in self.top_row_cups:
-            self.term.move(current_location)
-            self.term.display(key, color=self._INDEX_COLOR)
-            current_location += self._HORIZONTAL_SPACER
+        self.renderer.clear()
 
-        current_location = self._TOP_ROW_LOCATION
-
-        for val in self.top_row:
-            self.term.move(current_location)
-            self.term.display(val, color=self._SEED_COLOR)
-            current_location += self._HORIZONTAL_SPACER
-
-        # Draw player cups
-        # Draw bottom row
-        current_location = self._BOTTOM_ROW_LOCATION
-
-        for val in reversed(self.bottom_row):
-            self.term.move(current_location)
-            self.term.display(val, color=self._SEED_COLOR)
-            current_location += self._HORIZONTAL_SPACER
-
-        current_location = self._BOTTOM_ROW_INDICES_LOCATION
+    def display_cups(self, indicator_index=None, color=None, cups=None):
+        """
+        Draw the board, plus the indicator for indicator_index if given.
+        cups can be passed to draw a frame other than the current state.
+        Only cells that changed since the last call are written.
+        """
+        renderer = self.renderer
+        geometry = self.geometry
+        cups = self.cups if cups is None else cups
+        value_locations = geometry.value_locations
+        label_locations = geometry.label_locations
+        index_to_cup = geometry.index_to_cup
+
+        # Boards wider than the terminal show a window of columns that
+        # follows the indicator. Cups in the window are shifted left by shift
+        # and Player2's store by everything that is hidden.
+        visible = self.visible_columns
+        if indicator_index is not None:
+            self.scroll_to(indicator_index, visible)
+        self._window_start = min(self._window_start, self.side_length - visible)
+        shift = self._window_start * HORIZONTAL_SPACING
+        hidden = self._hidden_width(visible)
+
+        renderer.draw(
+            value_locations[self.player_1_cup_index],
+            cups[self.player_1_cup_index],
+            color=self.player1.color,
+        )
+        row, column = value_locations[self.player_2_cup_index]
+        renderer.draw(
+            (row, column - hidden),
+            cups[self.player_2_cup_index],
+            color=self.player2.color,
+        )
 
-        for key in self.bottom_row_cups:
-            self.term.move(current_location)
-            self.term.display(key, color=self._INDEX_COLOR)
-            current_location += self._HORIZONTAL_SPACER
+        for idx in geometry.window_indices(self._window_start, visible):
+            row, column = label_locations[idx]
+            renderer.draw(
+                (row, column - shift), index_to_cup[idx], color=self._INDEX_COLOR
+            )
+            row, column = value_locations[idx]
+            renderer.draw((row, column - shift), cups[idx], color=self._SEED_COLOR)
+
+        if indicator_index is not None:
+            indicator = geometry.indicators[indicator_index]
+            row, column = indicator.location
+            if indicator_index == self.player_2_cup_index:
+                column -= hidden
+            elif indicator_index != self.player_1_cup_index:
+                column -= shift
+            renderer.draw((row, column), indicator.symbol, color=color)
+
+        renderer.flush()
@@ -0,0 +1,258 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+from src.engine import Position, Side
+from src.player import AlphaBetaPlayer
+from src.transposition import TranspositionTable, ZobristKeys
+
+MAGIC = b'MBOK'
+VERSION = 1
+DEFAULT_BOOK_DIRECTORY = os.path.join(os.path.dirname(__file__), 'books')
+DEFAULT_BOOK_PLIES = 3
+DEFAULT_BOOK_DEPTH = 8
+
+_HEADER = struct.Struct('<4sHHHI')
+
+
+class BookError(Exception):
+    pass
+
+
+def book_filename(side_length, initial_seeds):
+    return f'book-{side_length}-{initial_seeds}.bin'
+
+
+def starting_position(side_length, initial_seeds):
+    number_of_cups = side_length * 2 + 2
+    cups = [initial_seeds] * number_of_cups
+    cups[0] = cups[number_of_cups // 2] = 0
+    return Position(cups, Side.Player1)
+
+
+class BookTable:
+    """
+    Best moves for the opening positions of one (side_length, initial_seeds)
+    pair, keyed by Zobrist hash.
+
+    Keys and moves live in two parallel typed arrays sorted by key, so a
+    lookup is a binary search and the file format is just the two arrays.
+    """
+
+    def __init__(self, side_length, initial_seeds, keys, moves):
+        if len(keys) != len(moves):
+            raise ValueError('keys and moves must be the same length')
+
+        self.side_length = side_length
+        self.initial_seeds = initial_seeds
+        self._keys = keys
+        self._moves = moves
+        self._zobrist = ZobristKeys.for_cups(side_length * 2 + 2)
+
+    @classmethod
+    def from_moves(cls, side_length, initial_seeds, best_moves):
+        """
+        Build a table from a dict mapping Positions to move indices.
+        """
+        zobrist = ZobristKeys.for_cups(side_length * 2 + 2)
+        entries = sorted(
+            (zobrist.hash_position(position), move)
+            for position, move in best_moves.items()
+        )
+        return cls(
+            side_length,
+            initial_seeds,
+            array('Q', (key for key, move in entries)),
+            array('H', (move for key, move in entries)),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise BookError(f'{path} is too short to be an opening book')
+
+            magic, version, side_length, initial_seeds, count = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise BookError(f'{path} is not a version {VERSION} opening book')
+
+            keys = array('Q')
+            moves = array('H')
+            try:
+                keys.fromfile(f, count)
+                moves.fromfile(f, count)
+            except (EOFError, ValueError):
+                raise BookError(f'{path} is truncated') from None
+
+        if sys.byteorder == 'big':
+            keys.byteswap()
+            moves.byteswap()
+
+        return cls(side_length, initial_seeds, keys, moves)
+
+    def write(self, path):
+        keys = array('Q', self._keys)
+        moves = array('H', self._moves)
+        if sys.byteorder == 'big':
+            keys.byteswap()
+            moves.byteswap()
+
+        with open(path, 'wb') as f:
+            f.write(
+                _HEADER.pack(
+                    MAGIC, VERSION, self.side_length, self.initial_seeds, len(keys)
+                )
+            )
+            keys.tofile(f)
+            moves.tofile(f)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def move(self, position):
+        """
+        Index of the book move for position, or None if it is not in the
+        book.
+        """
+        if len(position.cups) != self.side_length * 2 + 2:
+            return None
+
+        key = self._zobrist.hash_position(position)
+        slot = bisect_left(self._keys, key)
+        if slot == len(self._keys) or self._keys[slot] != key:
+            return None
+
+        move = self._moves[slot]
+        # Guard against a hash collision handing back an empty cup
+        if not position.cups[move]:
+            return None
+        return move
+
+
+class OpeningBook:
+    """
+    The opening books in a directory.
+
+    Nothing is read up front. The first lookup for a (side_length,
+    initial_seeds) pair loads that pair's file, if there is one, and keeps
+    it for later games. Pickling keeps only the directory, so worker
+    processes load just the books they end up needing.
+    """
+
+    def __init__(self, directory=DEFAULT_BOOK_DIRECTORY):
+        self.directory = directory
+        self._tables = {}
+
+    def __getstate__(self):
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.directory = state['directory']
+        self._tables = {}
+
+    def table(self, side_length, initial_seeds):
+        """
+        The BookTable for side_length and initial_seeds, or None when the
+        directory has no book for them.
+        """
+        config = (side_length, initial_seeds)
+        if config not in self._tables:
+            path = os.path.join(
+                self.directory, book_filename(side_length, initial_seeds)
+            )
+            self._tables[config] = (
+                BookTable.load(path) if os.path.exists(path) else None
+            )
+        return self._tables[config]
+
+    def move(self, position, initial_seeds):
+        if initial_seeds is None:
+            return None
+
+        side_length = (len(position.cups) - 2) // 2
+        table = self.table(side_length, initial_seeds)
+        if table is None:
+            return None
+        return table.move(position)
+
+
+def opening_positions(side_length, initial_seeds, plies):
+    """
+    Every position with a legal move reachable from the start in at most
+    plies moves by either side.
+    """
+    frontier = [starting_position(side_length, initial_seeds)]
+    seen = set(frontier)
+
+    for _ in range(plies):
+        next_frontier = []
+        for position in frontier:
+            for index in position.legal_moves():
+                child = position.apply_move(index)
+                if child not in seen:
+                    seen.add(child)
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    return [position for position in seen if position.legal_moves()]
+
+
+def build_book(side_length, initial_seeds, plies=DEFAULT_BOOK_PLIES, depth=None):
+    """
+    Search every opening position to depth and return the BookTable of best
+    moves.
+    """
+    searcher = AlphaBetaPlayer(
+        'Book',
+        wait_time=0,
+        depth=depth or DEFAULT_BOOK_DEPTH,
+        transposition_table=TranspositionTable(),
+    )
+
+    best_moves = {
+        position: searcher._search(position)
+        for position in opening_positions(side_length, initial_seeds, plies)
+    }
+    return BookTable.from_moves(side_length, initial_seeds, best_moves)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Search the opening moves and write an opening book'
+    )
+    parser.add_argument('--side-lengths', type=int, nargs='+', default=[6])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[3, 4])
+    parser.add_argument('--plies', type=int, default=DEFAULT_BOOK_PLIES)
+    parser.add_argument('--depth', type=int, default=DEFAULT_BOOK_DEPTH)
+    parser.add_argument('--directory', default=DEFAULT_BOOK_DIRECTORY)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+
+    try:
+        for side_length in args.side_lengths:
+            for initial_seeds in args.seeds:
+                start = time.perf_counter()
+                table = build_book(
+                    side_length, initial_seeds, plies=args.plies, depth=args.depth
+                )
+                path = os.path.join(
+                    args.directory, book_filename(side_length, initial_seeds)
+                )
+                table.write(path)
+                print(
+                    f'{len(table):,} positions for side length {side_length} '
+                    f'with {initial_seeds} seeds in '
+                    f'{time.perf_counter() - start:.1f}s. Wrote {path}'
+                )
+    except KeyboardInterrupt:
+        return
+
+
+if __name__ == '__main__':
+    main()
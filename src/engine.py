@@ -0,0 +1,631 @@
+from array import array
+from enum import IntEnum
+
+from src.geometry import board_geometry
+from src.utils import read_varint, write_varint
+
+DEFAULT_MOVE_STACK_DEPTH = 64
+# Undo slots per move: origin cup, seeds sown, full laps, side to move
+_UNDO_SLOTS = 4
+
+
+class InvalidCup(Exception):
+    pass
+
+
+class EmptyCup(Exception):
+    pass
+
+
+class TooManyPlayers(Exception):
+    pass
+
+
+class NotEnoughPlayers(Exception):
+    pass
+
+
+class Side(IntEnum):
+    Player1 = 0
+    Player2 = 1
+
+    @property
+    def opponent(self):
+        return Side(1 - self)
+
+
+def sow_cups(cups, index):
+    """
+    Sow the cup at index of a mutable cups sequence in place and return the
+    index the last seed landed in.
+
+    Work is proportional to the number of cups rather than the number of
+    seeds: every full lap around the board is added to all cups at once and
+    only the remainder is dealt out one cup at a time.
+    """
+    number_of_cups = len(cups)
+    seeds = cups[index]
+    cups[index] = 0
+
+    laps, remainder = divmod(seeds, number_of_cups)
+    if laps:
+        for cup in range(number_of_cups):
+            cups[cup] += laps
+
+    end = index + 1 + remainder
+    for cup in range(index + 1, min(end, number_of_cups)):
+        cups[cup] += 1
+    for cup in range(end - number_of_cups):
+        cups[cup] += 1
+
+    return (index + seeds) % number_of_cups
+
+
+class Cups(list):
+    """
+    The list of seed counts held by an Engine.
+
+    Every write goes through __setitem__, which keeps running aggregates in
+    step with the cups so the common rule queries never rescan the board:
+
+    seeds_in_play: seeds in both rows, i.e. everything not yet in a store
+    landing_in_store: per Side, the playable cups whose last seed would
+        currently land in that side's store
+    """
+
+    __slots__ = (
+        '_midpoint',
+        '_store_sides',
+        'seeds_in_play',
+        'landing_in_store',
+    )
+
+    def __init__(self, number_of_cups):
+        super().__init__([0] * number_of_cups)
+        self._midpoint = number_of_cups // 2
+        self._store_sides = {0: Side.Player1, self._midpoint: Side.Player2}
+        self._reset_aggregates()
+
+    def __reduce__(self):
+        return (_rebuild_cups, (list(self),))
+
+    def _reset_aggregates(self):
+        self.seeds_in_play = 0
+        self.landing_in_store = (set(), set())
+
+    def _recompute_aggregates(self):
+        self._reset_aggregates()
+        for index in range(len(self)):
+            self._update(index, 0, list.__getitem__(self, index))
+
+    def _update(self, index, old, new):
+        if index == 0 or index == self._midpoint:
+            return
+
+        self.seeds_in_play += new - old
+
+        number_of_cups = len(self)
+        if old:
+            side = self._store_sides.get((index + old) % number_of_cups)
+            if side is not None:
+                self.landing_in_store[side].discard(index)
+
+        if new:
+            side = self._store_sides.get((index + new) % number_of_cups)
+            if side is not None:
+                self.landing_in_store[side].add(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index, value)
+            self._recompute_aggregates()
+            return
+
+        if index < 0:
+            index += len(self)
+
+        old = list.__getitem__(self, index)
+        list.__setitem__(self, index, value)
+        self._update(index, old, value)
+
+
+def _rebuild_cups(values):
+    cups = Cups(len(values))
+    cups[:] = values
+    return cups
+
+
+class Position:
+    """
+    Immutable snapshot of the cups plus the side to move.
+
+    The hash is computed once up front, so positions are cheap to use as dict
+    keys and to share between searches. apply_move never mutates self; it
+    returns a new Position with the extra-turn rule already applied.
+    """
+
+    __slots__ = ('cups', 'side_to_move', '_hash')
+
+    def __init__(self, cups, side_to_move=Side.Player1):
+        cups = tuple(cups)
+        side_to_move = Side(side_to_move)
+
+        object.__setattr__(self, 'cups', cups)
+        object.__setattr__(self, 'side_to_move', side_to_move)
+        object.__setattr__(self, '_hash', hash((cups, side_to_move)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Position is immutable')
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Position):
+            return NotImplemented
+
+        return (
+            self._hash == other._hash
+            and self.side_to_move == other.side_to_move
+            and self.cups == other.cups
+        )
+
+    def __repr__(self):
+        return f'<Position {self.cups} {self.side_to_move.name} to move>'
+
+    def __reduce__(self):
+        return (self.__class__, (self.cups, int(self.side_to_move)))
+
+    @property
+    def player_1_cup_index(self):
+        return 0
+
+    @property
+    def player_2_cup_index(self):
+        return len(self.cups) // 2
+
+    def store_index(self, side):
+        return (
+            self.player_1_cup_index if side == Side.Player1 else self.player_2_cup_index
+        )
+
+    def landing_index(self, index, seeds):
+        return (index + seeds) % len(self.cups)
+
+    def store_difference(self):
+        """
+        Seeds in the side to move's store minus seeds in the opponent's.
+        """
+        mine = self.cups[self.store_index(self.side_to_move)]
+        theirs = self.cups[self.store_index(self.side_to_move.opponent)]
+        return mine - theirs
+
+    def legal_moves(self):
+        midpoint = self.player_2_cup_index
+        return [
+            index
+            for index, seeds in enumerate(self.cups)
+            if seeds and index != 0 and index != midpoint
+        ]
+
+    def done(self):
+        return not self.legal_moves()
+
+    def apply_move(self, index):
+        """
+        Return the Position reached by sowing the cup at index.
+        """
+        cups = list(self.cups)
+        last_index = sow_cups(cups, index)
+
+        side_to_move = self.side_to_move
+        if last_index != self.store_index(side_to_move):
+            side_to_move = side_to_move.opponent
+
+        return Position(cups, side_to_move)
+
+    def pack(self):
+        """
+        Pack into bytes: one byte of side to move followed by the cups as
+        unsigned varints, so counts below 128 take a single byte and no
+        count is too large to pack.
+        """
+        packed = bytearray((self.side_to_move,))
+        for seeds in self.cups:
+            write_varint(seeds, packed)
+        return bytes(packed)
+
+    @classmethod
+    def unpack(cls, data):
+        cups = []
+        offset = 1
+        while offset < len(data):
+            seeds, offset = read_varint(data, offset)
+            cups.append(seeds)
+        return cls(cups, data[0])
+
+
+_SIDES = (Side.Player1, Side.Player2)
+
+
+class MutablePosition:
+    """
+    Cups plus the side to move, changed in place by make_move and restored
+    by unmake_move.
+
+    Each move pushes just enough to undo it, the origin cup, the seeds that
+    were sown, the number of full laps and the side that moved, onto a
+    typed array allocated up front and doubled if a search goes deeper, so
+    making and unmaking moves allocates nothing. cups is used as given, not
+    copied, and supports the same queries as Position, so searches and
+    tablebase probes can use either.
+    """
+
+    __slots__ = ('cups', 'side_to_move', '_undo', '_top', '_stores')
+
+    def __init__(self, cups, side_to_move=Side.Player1, depth=DEFAULT_MOVE_STACK_DEPTH):
+        self.cups = cups
+        self.side_to_move = Side(side_to_move)
+        self._undo = array('q', bytes(8 * _UNDO_SLOTS * max(depth, 1)))
+        self._top = 0
+        self._stores = (0, len(cups) // 2)
+
+    @classmethod
+    def from_position(cls, position, depth=DEFAULT_MOVE_STACK_DEPTH):
+        return cls(list(position.cups), position.side_to_move, depth=depth)
+
+    def __len__(self):
+        """
+        Number of moves that can be unmade.
+        """
+        return self._top // _UNDO_SLOTS
+
+    def clear(self):
+        """
+        Forget every move made so far, e.g. after the cups were replaced.
+        """
+        self._top = 0
+
+    def to_position(self):
+        return Position(self.cups, self.side_to_move)
+
+    def store_index(self, side):
+        return self._stores[side]
+
+    def landing_index(self, index, seeds):
+        return (index + seeds) % len(self.cups)
+
+    def store_difference(self):
+        mine, theirs = self._stores
+        if self.side_to_move == Side.Player2:
+            mine, theirs = theirs, mine
+        return self.cups[mine] - self.cups[theirs]
+
+    def legal_moves(self):
+        cups = self.cups
+        midpoint = self._stores[Side.Player2]
+        return [
+            index for index in range(1, len(cups)) if cups[index] and index != midpoint
+        ]
+
+    def sow_index(self, index):
+        """
+        Sow the cup at index, remembering how to take it back with unsow,
+        and return the index the last seed landed in. The side to move is
+        left alone.
+        """
+        cups = self.cups
+        seeds = cups[index]
+
+        undo = self._undo
+        top = self._top
+        if top == len(undo):
+            undo.extend(undo)
+        undo[top] = index
+        undo[top + 1] = seeds
+        undo[top + 2] = seeds // len(cups)
+        undo[top + 3] = self.side_to_move
+        self._top = top + _UNDO_SLOTS
+
+        return sow_cups(cups, index)
+
+    def unsow(self):
+        """
+        Take back the last sow, restoring the cups exactly, and return the
+        side that was to move before it.
+        """
+        if not self._top:
+            raise IndexError('No move to unmake')
+
+        top = self._top - _UNDO_SLOTS
+        self._top = top
+
+        undo = self._undo
+        index = undo[top]
+        seeds = undo[top + 1]
+        laps = undo[top + 2]
+
+        cups = self.cups
+        number_of_cups = len(cups)
+        if laps:
+            for cup in range(number_of_cups):
+                cups[cup] -= laps
+
+        end = index + 1 + seeds - laps * number_of_cups
+        for cup in range(index + 1, min(end, number_of_cups)):
+            cups[cup] -= 1
+        for cup in range(end - number_of_cups):
+            cups[cup] -= 1
+
+        cups[index] = seeds
+        return _SIDES[undo[top + 3]]
+
+    def make_move(self, index):
+        """
+        Sow the cup at index, hand the move to the other side unless the
+        last seed landed in the mover's store, and return the index the last
+        seed landed in.
+        """
+        side = self.side_to_move
+        last_index = self.sow_index(index)
+        if last_index != self._stores[side]:
+            self.side_to_move = _SIDES[1 - side]
+        return last_index
+
+    def unmake_move(self):
+        """
+        Take back the last move made, restoring the cups and side to move
+        exactly.
+        """
+        self.side_to_move = self.unsow()
+
+
+class Engine:
+    """
+    Headless mancala rules.
+
+    Holds the cups and seat assignments and knows how to apply moves, but
+    never touches the terminal. Board builds on top of this to draw the game;
+    anything that only needs the rules (simulations, AI lookahead) can use an
+    Engine directly.
+
+    Indexes and their associated letters:
+
+        a   b   c   d   e   f   g
+        1   2   3   4   5   6   7
+    0                               8
+        15  14  13  12  11  10  9
+        h   i   j   k   l   m   n
+    """
+
+    renders = False
+
+    def __init__(self, side_length, player1=None, player2=None):
+        self.side_length = side_length
+        self.geometry = board_geometry(side_length)
+        self.total_number_of_cups = self.geometry.number_of_cups
+        self.cups = Cups(self.total_number_of_cups)
+        self.initial_seeds = None
+
+        # Shared, read-only views owned by the geometry
+        self._midpoint = self.geometry.midpoint
+        self._cup_to_index = self.geometry.cup_to_index
+        self._index_to_cup = self.geometry.index_to_cup
+
+        self.players = []
+        # Undo stack for make_move, created on first use
+        self._moves = None
+
+        if player1:
+            self.assign_player(player1)
+
+        if player2:
+            self.assign_player(player2)
+
+    @property
+    def ready_to_play(self):
+        return len(self.players) == 2
+
+    def assign_player(self, player):
+        if len(self.players) == 2:
+            raise TooManyPlayers('Cannot add any more players to this board')
+
+        if not self.players:
+            self.player1 = player
+            self.player1.assign_board(self)
+        elif len(self.players) == 1:
+            self.player2 = player
+            self.player2.assign_board(self)
+        self.players.append(player)
+
+    @property
+    def top_row(self):
+        return self.cups[1 : self._midpoint]
+
+    @property
+    def top_row_indices(self):
+        return self.geometry.top_row_indices
+
+    @property
+    def top_row_cups(self):
+        return self.geometry.top_row_cups
+
+    @property
+    def bottom_row(self):
+        return self.cups[self._midpoint + 1 :]
+
+    @property
+    def bottom_row_indices(self):
+        return self.geometry.bottom_row_indices
+
+    @property
+    def bottom_row_cups(self):
+        return self.geometry.bottom_row_cups
+
+    @property
+    def player_1_cup_index(self):
+        return 0
+
+    @property
+    def player_2_cup_index(self):
+        return self._midpoint
+
+    @property
+    def player_1_cup(self):
+        return self.cups[self.player_1_cup_index]
+
+    @property
+    def player_2_cup(self):
+        return self.cups[self.player_2_cup_index]
+
+    def store_index(self, side):
+        return self.geometry.store_indices[side]
+
+    def cup_seeds(self, cup):
+        return self.cups[self.cup_to_index[cup]]
+
+    def landing_index(self, index, seeds):
+        """
+        Index the last seed lands in when a cup holding seeds is sown from
+        index.
+        """
+        return (index + seeds) % self.total_number_of_cups
+
+    def cup_seeds_by_index(self, index):
+        return self.cups[index]
+
+    @property
+    def cup_to_index(self):
+        return self._cup_to_index
+
+    @property
+    def index_to_cup(self):
+        return self._index_to_cup
+
+    def initialize_cups(self, seeds):
+        self.initial_seeds = int(seeds)
+
+        for i in range(len(self.cups)):
+            if i == 0 or i == self._midpoint:
+                continue
+
+            self.cups[i] = int(seeds)
+
+    def reset(self, initial_seeds=None, player1=None, player2=None):
+        """
+        Put the board back in a starting position without reallocating it.
+
+        initial_seeds defaults to the previous game's. When both players are
+        given they take the seats in that order, e.g. swapped; otherwise the
+        current players keep their seats.
+        """
+        if (player1 is None) != (player2 is None):
+            raise ValueError('Both players must be given to change seats')
+
+        if player1 is not None:
+            players = (player1, player2)
+        else:
+            players = tuple(self.players)
+
+        # Players drop their board when a game ends, so seat them again
+        self.players.clear()
+        for player in players:
+            self.assign_player(player)
+
+        seeds = self.initial_seeds if initial_seeds is None else initial_seeds
+        self._moves = None
+        self.cups[self.player_1_cup_index] = 0
+        self.cups[self.player_2_cup_index] = 0
+        self.initialize_cups(seeds)
+
+    def legal_moves(self):
+        """
+        Indices of every non-empty playable cup, in ascending order.
+        """
+        cups = self.cups
+        return [index for index in self.geometry.playable_indices if cups[index]]
+
+    def legal_cups(self):
+        """
+        Labels of every non-empty playable cup, in label order.
+        """
+        cups = self.cups
+        index_to_cup = self._index_to_cup
+        return [
+            index_to_cup[index] for index in self.geometry.label_order if cups[index]
+        ]
+
+    def free_play_moves(self, side):
+        """
+        Indices of the non-empty cups whose last seed lands in side's store,
+        in ascending order.
+        """
+        return sorted(self.cups.landing_in_store[side])
+
+    def done(self):
+        return self.cups.seeds_in_play == 0
+
+    def sow(self, cup, color=None):
+        if cup not in self.cup_to_index:
+            raise InvalidCup(f'Invalid cup. Got {cup}.')
+
+        index = self.cup_to_index[cup]
+
+        if self.cups[index] == 0:
+            raise EmptyCup(f"Cup '{cup}' is empty.")
+
+        return self.sow_index(index)
+
+    def sow_index(self, index):
+        """
+        Move every seed out of the cup at index and return the index of the
+        cup the last seed landed in. No validation is done here; callers are
+        expected to pass a legal, non-empty cup.
+        """
+        return sow_cups(self.cups, index)
+
+    def make_move(self, index):
+        """
+        Sow the cup at index like sow_index, remembering how to take it back
+        with unmake_move. Whose turn it is stays the caller's business, see
+        next_side.
+        """
+        if self._moves is None:
+            self._moves = MutablePosition(self.cups)
+        return self._moves.sow_index(index)
+
+    def unmake_move(self):
+        if self._moves is None:
+            raise IndexError('No move to unmake')
+        self._moves.unsow()
+
+    def to_position(self, side_to_move=Side.Player1):
+        return Position(self.cups, side_to_move)
+
+    def load_position(self, position):
+        if len(position.cups) != len(self.cups):
+            raise ValueError(
+                f'Position has {len(position.cups)} cups, expected {len(self.cups)}.'
+            )
+
+        self.cups[:] = position.cups
+        self._moves = None
+
+    def next_side(self, side, last_index):
+        """
+        Landing in your own store earns another turn, otherwise play passes
+        to the opponent.
+        """
+        if last_index == self.store_index(side):
+            return side
+        return side.opponent
+
+    def winner(self):
+        """
+        Return the Side with more seeds in its store, or None for a tie.
+        """
+        if self.player_1_cup > self.player_2_cup:
+            return Side.Player1
+        elif self.player_1_cup < self.player_2_cup:
+            return Side.Player2
+        return None
@@ -1,7 +1,9 @@
 from src.player import (
+    AlphaBetaPlayer,
     DefensivePlayer,
     HumanPlayer,
     ImprovedRandomPlayer,
+    MonteCarloPlayer,
     PlayerType,
     RandomPlayer,
 )
@@ -15,11 +17,15 @@ class PlayerFactory:
         cls._player_classes[player_type] = player_class
 
     @classmethod
-    def create(cls, player_type, player_name=None):
+    def create(cls, player_type, player_name=None, **kwargs):
         if player_type not in cls._player_classes:
             raise KeyError(f'Could not find a Player class of type {player_type}')
 
-        return cls._player_classes[player_type](name=player_name)
+        return cls._player_classes[player_type](name=player_name, **kwargs)
+
+    @classmethod
+    def all_types(cls):
+        return cls._player_classes.keys()
 
     @classmethod
     def all_classes(cls):
@@ -30,3 +36,5 @@ PlayerFactory.register(PlayerType.Human, HumanPlayer)
 PlayerFactory.register(PlayerType.Random, RandomPlayer)
 PlayerFactory.register(PlayerType.ImprovedRandom, ImprovedRandomPlayer)
 PlayerFactory.register(PlayerType.Defensive, DefensivePlayer)
+PlayerFactory.register(PlayerType.AlphaBeta, AlphaBetaPlayer)
+PlayerFactory.register(PlayerType.MonteCarlo, MonteCarloPlayer)
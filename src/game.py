@@ -1,6 +1,18 @@
+import time
+
+from src.animation import DEFAULT_MAX_MOVE_DURATION
 from src.board import Board, EmptyCup, InvalidCup
-from src.player import Result
-from src.terminal import Location, Terminal
+from src.engine import Engine, Side
+from src.metric_names import (
+    DECISION,
+    EXTRA_TURNS,
+    INVALID_CUP_RETRIES,
+    SEEDS_MOVED,
+    SOW,
+)
+from src.player import MESSAGE_LOCATION, Result
+from src.record import GameRecord
+from src.terminal import Location, NullTerminal, get_terminal
 
 
 class Game:
@@ -14,30 +26,54 @@ class Game:
         player_1_color=None,
         player_2_color=None,
         animation_wait=0.1,
+        max_move_duration=DEFAULT_MAX_MOVE_DURATION,
+        headless=False,
+        recorder=None,
+        metrics=None,
     ):
-        self.term = Terminal()
+        """
+        recorder, if given, is a GameRecordWriter that the finished game is
+        appended to.
+
+        metrics, if given, is a src.metrics.Metrics that records how long
+        each player takes to decide and to sow, how long drawing takes, and
+        counts seeds moved, extra turns and invalid cups. Deciding and
+        sowing leave out time spent printing, animating and pausing for
+        whoever is watching, so they measure the same work as in a headless
+        game.
+        """
+        self.term = NullTerminal() if headless else get_terminal()
+        self.headless = headless
+        self.recorder = recorder
+        self.metrics = metrics
+        self.moves = []
 
-        if player_1_color is None:
-            player_1_color = self.term.bold + self.term.red
+        self.player1 = player1
+        self.player2 = player2
 
-        if player_2_color is None:
-            player_2_color = self.term.bold + self.term.blue
+        if self.headless:
+            self.board = Engine(side_length)
+        else:
+            if player_1_color is None:
+                player_1_color = self.term.bold + self.term.red
 
-        seed_color = self.term.green
-        index_color = self.term.yellow
+            if player_2_color is None:
+                player_2_color = self.term.bold + self.term.blue
 
-        self.term.clear()
-        self.term.move(Location(5, 5))
+            seed_color = self.term.green
+            index_color = self.term.yellow
 
-        self.board = Board(
-            side_length,
-            seed_color=seed_color,
-            index_color=index_color,
-            animation_wait=animation_wait,
-        )
+            self.term.clear()
+            self.term.move(Location(5, 5))
 
-        self.player1 = player1
-        self.player2 = player2
+            self.board = Board(
+                side_length,
+                seed_color=seed_color,
+                index_color=index_color,
+                animation_wait=animation_wait,
+                max_move_duration=max_move_duration,
+                metrics=metrics,
+            )
 
         self.board.assign_player(self.player1)
         self.board.assign_player(self.player2)
@@ -47,51 +83,123 @@ class Game:
 
         seeds = initial_seeds or self._get_initial_seeds()
         self.board.initialize_cups(seeds)
-        self.board.clear_board()
-        self.board.display_cups()
+
+        if not self.headless:
+            self.board.display_cups()
+
+    def reset(self, swap_seats=False):
+        """
+        Set up a new game on the same board with the same number of seeds,
+        with the players trading seats if swap_seats is set.
+        """
+        if swap_seats:
+            self.player1, self.player2 = self.player2, self.player1
+
+        self.board.reset(player1=self.player1, player2=self.player2)
+        self.current_player = self.player1
+        self._players = (self.player1, self.player2)
+        self.moves.clear()
+
+        if not self.headless:
+            self.board.display_cups()
 
     def _get_initial_seeds(self):
         seeds = input('Enter the initial number of seeds per cup: ')
         return seeds
 
     def clear_screen(self):
-        self.term.clear()
+        if not self.headless:
+            self.term.clear()
+            self.board.renderer.invalidate()
 
     def run(self):
         self.clear_screen()
         while not self.board.done():
-            self.board.clear_board()
-            self.board.display_cups()
+            if not self.headless:
+                self.board.display_cups()
 
             try:
-                cup = self.current_player._take_turn()
-                last_cup = self.board.sow(cup, color=self.current_player.color)
+                if self.metrics is None:
+                    cup = self.current_player._take_turn()
+                    last_cup = self.board.sow(cup, color=self.current_player.color)
+                else:
+                    cup, last_cup = self._measured_turn()
             except (EmptyCup, InvalidCup):
+                if self.metrics is not None:
+                    self.metrics.increment(
+                        INVALID_CUP_RETRIES, self.current_player.name
+                    )
                 continue
 
+            self.moves.append(self.board.cup_to_index[cup])
             self._determine_next_player(last_cup)
-            self.clear_screen()
-        self.board.display_cups()
 
-        print()
-        print()
-        if self.board.player_1_cup > self.board.player_2_cup:
-            print(f'{self.player1.name} Wins!')
+        winner = self.board.winner()
+
+        if self.recorder is not None:
+            self.recorder.write(self.record())
+
+        if not self.headless:
+            self.board.display_cups()
+
+            self.term.move(MESSAGE_LOCATION)
+            self.term.clear_eos()
+            if winner == Side.Player1:
+                print(f'{self.player1.name} Wins!')
+            elif winner == Side.Player2:
+                print(f'{self.player2.name} Wins!')
+            else:
+                print('Tie game!')
+
+        if winner == Side.Player1:
             self.board.player1.game_over(Result.Win)
             self.board.player2.game_over(Result.Loss)
-        elif self.board.player_1_cup < self.board.player_2_cup:
-            print(f'{self.player2.name} Wins!')
+        elif winner == Side.Player2:
             self.board.player1.game_over(Result.Loss)
             self.board.player2.game_over(Result.Win)
         else:
-            print('Tie game!')
             self.board.player1.game_over(Result.Tie)
             self.board.player2.game_over(Result.Tie)
 
+    def _measured_turn(self):
+        player = self.current_player
+        metrics = self.metrics
+
+        start = time.perf_counter()
+        cup = player._take_turn()
+        decided = time.perf_counter()
+        metrics.observe(
+            DECISION, player.name, decided - start - player.presentation_time
+        )
+
+        index = self.board.cup_to_index.get(cup)
+        seeds = self.board.cups[index] if index is not None else 0
+        last_cup = self.board.sow(cup, color=player.color)
+        sowing = time.perf_counter() - decided
+        if self.board.renders:
+            sowing -= self.board.presentation_time
+        metrics.observe(SOW, player.name, sowing)
+        metrics.increment(SEEDS_MOVED, player.name, seeds)
+
+        return cup, last_cup
+
+    def record(self):
+        return GameRecord(
+            side_length=self.board.side_length,
+            initial_seeds=self.board.initial_seeds,
+            player1_type=type(self.player1).__name__,
+            player2_type=type(self.player2).__name__,
+            moves=tuple(self.moves),
+        )
+
+    @property
+    def current_side(self):
+        return Side.Player1 if self.current_player == self.player1 else Side.Player2
+
     def _determine_next_player(self, last_cup):
-        if self.current_player == self.player1:
-            if last_cup != self.board.player_1_cup_index:
-                self.current_player = self.player2
-        elif self.current_player == self.player2:
-            if last_cup != self.board.player_2_cup_index:
-                self.current_player = self.player1
+        current_side = self.current_side
+        next_side = self.board.next_side(current_side, last_cup)
+
+        if self.metrics is not None and next_side == current_side:
+            self.metrics.increment(EXTRA_TURNS, self.current_player.name)
+        self.current_player = self._players[next_side]
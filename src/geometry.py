@@ -0,0 +1,199 @@
+import functools
+from collections import namedtuple
+from types import MappingProxyType
+
+from src.utils import generate_sequence
+
+Indicator = namedtuple('Indicator', 'location symbol')
+
+# Screen layout shared by every board size
+INITIAL_LOCATION = (5, 10)
+HORIZONTAL_SPACING = 4
+
+
+class BoardGeometry:
+    """
+    Everything about a board that only depends on its side length.
+
+    Label maps, row indices, store indices and where each cup is drawn are
+    worked out once and never change, so a single instance per side length
+    is shared by every Engine and Board. Use board_geometry() rather than
+    building one directly.
+
+    Indexes and their associated letters:
+
+        a   b   c   d   e   f   g
+        1   2   3   4   5   6   7
+    0                               8
+        15  14  13  12  11  10  9
+        h   i   j   k   l   m   n
+    """
+
+    __slots__ = (
+        'side_length',
+        'number_of_cups',
+        'midpoint',
+        'player_1_cup_index',
+        'player_2_cup_index',
+        'store_indices',
+        'top_row_indices',
+        'bottom_row_indices',
+        'playable_indices',
+        'label_order',
+        'row_positions',
+        'cup_to_index',
+        'index_to_cup',
+        'top_row_cups',
+        'bottom_row_cups',
+        'first_cup_column',
+        'value_locations',
+        'label_locations',
+        'indicators',
+        'min_row',
+        'min_column',
+        'max_row',
+        'max_column',
+    )
+
+    def __init__(self, side_length):
+        if side_length <= 0:
+            raise ValueError(f'side_length must be positive. Got {side_length}.')
+
+        number_of_cups = side_length * 2 + 2
+        midpoint = number_of_cups // 2
+
+        top_row_indices = tuple(range(1, midpoint))
+        bottom_row_indices = tuple(range(midpoint + 1, number_of_cups))
+
+        # Labels run along the top row left to right, then along the bottom
+        # row left to right, which is descending index order
+        label_order = top_row_indices + bottom_row_indices[::-1]
+        labels = generate_sequence(len(label_order))
+        cup_to_index = dict(zip(labels, label_order))
+        index_to_cup = dict(zip(label_order, labels))
+
+        # How far along its row, from the left, each cup is drawn
+        row_positions = [None] * number_of_cups
+        for position, idx in enumerate(top_row_indices):
+            row_positions[idx] = position
+        for position, idx in enumerate(reversed(bottom_row_indices)):
+            row_positions[idx] = position
+
+        values = self._layout(side_length, number_of_cups, midpoint)
+
+        fields = dict(
+            side_length=side_length,
+            number_of_cups=number_of_cups,
+            midpoint=midpoint,
+            player_1_cup_index=0,
+            player_2_cup_index=midpoint,
+            store_indices=(0, midpoint),
+            top_row_indices=top_row_indices,
+            bottom_row_indices=bottom_row_indices,
+            playable_indices=top_row_indices + bottom_row_indices,
+            label_order=label_order,
+            row_positions=tuple(row_positions),
+            cup_to_index=MappingProxyType(cup_to_index),
+            index_to_cup=MappingProxyType(index_to_cup),
+            top_row_cups=tuple(index_to_cup[idx] for idx in top_row_indices),
+            bottom_row_cups=tuple(
+                index_to_cup[idx] for idx in reversed(bottom_row_indices)
+            ),
+            **values,
+        )
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _layout(side_length, number_of_cups, midpoint):
+        row, column = INITIAL_LOCATION
+        first_cup_column = column + HORIZONTAL_SPACING
+
+        top_indicator_row = row
+        top_labels_row = row + 1
+        top_values_row = row + 2
+        stores_row = row + 3
+        bottom_values_row = row + 4
+        bottom_labels_row = row + 5
+        bottom_indicator_row = row + 6
+
+        player_1_column = column
+        player_2_column = column + HORIZONTAL_SPACING * (side_length + 1)
+
+        value_locations = [None] * number_of_cups
+        label_locations = [None] * number_of_cups
+        indicators = [None] * number_of_cups
+
+        value_locations[0] = (stores_row, player_1_column)
+        indicators[0] = Indicator(
+            (stores_row, player_1_column - HORIZONTAL_SPACING), '>'
+        )
+        value_locations[midpoint] = (stores_row, player_2_column)
+        indicators[midpoint] = Indicator(
+            (stores_row, player_2_column + HORIZONTAL_SPACING), '<'
+        )
+
+        for idx in range(1, midpoint):
+            cup_column = first_cup_column + (idx - 1) * HORIZONTAL_SPACING
+            value_locations[idx] = (top_values_row, cup_column)
+            label_locations[idx] = (top_labels_row, cup_column)
+            indicators[idx] = Indicator((top_indicator_row, cup_column), 'v')
+
+        for idx in range(midpoint + 1, number_of_cups):
+            cup_column = first_cup_column + (number_of_cups - idx - 1) * (
+                HORIZONTAL_SPACING
+            )
+            value_locations[idx] = (bottom_values_row, cup_column)
+            label_locations[idx] = (bottom_labels_row, cup_column)
+            indicators[idx] = Indicator((bottom_indicator_row, cup_column), '^')
+
+        return dict(
+            first_cup_column=first_cup_column,
+            value_locations=tuple(value_locations),
+            label_locations=tuple(label_locations),
+            indicators=tuple(indicators),
+            min_row=row,
+            min_column=column,
+            max_row=bottom_indicator_row,
+            max_column=player_2_column + HORIZONTAL_SPACING,
+        )
+
+    def columns_that_fit(self, width):
+        """
+        How many cup columns can be drawn in a terminal width characters wide.
+        """
+        # The last column is followed by Player2's store and its indicator
+        fit = (width - 1 - self.first_cup_column) // HORIZONTAL_SPACING - 1
+        return max(1, min(self.side_length, fit))
+
+    def window_indices(self, start, columns):
+        """
+        Indices, in label order, of the cups drawn in row positions start to
+        start + columns.
+        """
+        end = min(start + columns, self.side_length)
+        if start == 0 and end == self.side_length:
+            return self.label_order
+
+        number_of_cups = self.number_of_cups
+        return tuple(range(start + 1, end + 1)) + tuple(
+            range(number_of_cups - 1 - start, number_of_cups - 1 - end, -1)
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError('BoardGeometry is immutable')
+
+    def __reduce__(self):
+        # Unpickle to the shared instance rather than a copy
+        return (board_geometry, (self.side_length,))
+
+    def __repr__(self):
+        return f'<BoardGeometry side_length={self.side_length}>'
+
+
+@functools.lru_cache(maxsize=None)
+def board_geometry(side_length):
+    """
+    The shared BoardGeometry for side_length, built on first use.
+    """
+    return BoardGeometry(side_length)
@@ -1,8 +1,20 @@
+import argparse
+import contextlib
+
 from src.game import Game
 from src.player import DefensivePlayer, HumanPlayer
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Play a game of mancala')
+    parser.add_argument(
+        '--profile',
+        default=None,
+        metavar='PATH',
+        help='Profile the game and write PATH.pstats and PATH.collapsed',
+    )
+    args = parser.parse_args()
+
     player1 = DefensivePlayer(
         'Player1',
     )
@@ -11,11 +23,20 @@ def main():
     )
     game = Game(player1=player1, player2=player2)
 
+    profile = None
+    if args.profile:
+        from src.profiling import Profile
+
+        profile = Profile(args.profile)
     try:
-        game.run()
+        with profile or contextlib.nullcontext():
+            game.run()
     except KeyboardInterrupt:
         pass
 
+    if profile is not None:
+        print(profile.summary())
+
 
 if __name__ == '__main__':
     main()
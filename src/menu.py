@@ -1,4 +1,4 @@
-from src.terminal import Location, Terminal
+from src.terminal import Location, get_terminal
 
 INITIAL_MENU_LOCATION = Location(5, 5)
 
@@ -9,7 +9,7 @@ class GetUserInput:
         prompt,
         choices=None,
     ):
-        self.term = Terminal()
+        self.term = get_terminal()
         self.prompt = prompt
         self.choices = list(choices) if choices else None
 
@@ -0,0 +1,12 @@
+# Names shared by the instrumented code and src.metrics. They live apart from
+# Metrics so that recording them does not import its reporting dependencies.
+
+# Phases timed while a game is played
+DECISION = 'decision'
+SOW = 'sow'
+RENDER = 'render'
+
+# Counters kept per player
+SEEDS_MOVED = 'seeds_moved'
+EXTRA_TURNS = 'extra_turns'
+INVALID_CUP_RETRIES = 'invalid_cup_retries'
@@ -0,0 +1,208 @@
+from bisect import bisect_left
+
+from src.metric_names import (  # noqa: F401
+    DECISION,
+    EXTRA_TURNS,
+    INVALID_CUP_RETRIES,
+    RENDER,
+    SEEDS_MOVED,
+    SOW,
+)
+
+# Bucket upper bounds in seconds, four per doubling from 1us to about 134s,
+# so an estimated percentile is never more than about 19% off
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(4 * 27 + 1))
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+PREFIX = 'mancala'
+
+
+class Histogram:
+    """
+    Latency histogram with fixed, exponentially sized buckets.
+
+    Observing is a binary search and an increment, and histograms with the
+    same bounds merge by adding their counts, so each worker process can
+    keep its own and hand it back.
+    """
+
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        # The extra bucket holds anything above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        if other.bounds != self.bounds:
+            raise ValueError('Cannot merge histograms with different buckets')
+
+        for idx, count in enumerate(other.counts):
+            self.counts[idx] += count
+        self.count += other.count
+        self.sum += other.sum
+
+        for value in (other.min, other.max):
+            if value is None:
+                continue
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def percentile(self, quantile):
+        """
+        Estimate of the quantile'th latency, interpolated linearly within the
+        bucket it falls in. None if nothing has been observed.
+        """
+        if not self.count:
+            return None
+
+        rank = quantile * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[idx - 1] if idx else 0.0
+                upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+
+class Metrics:
+    """
+    Latency histograms keyed by (phase, player) and counters keyed by
+    (name, player).
+
+    Instrumented code holds a Metrics or None and only calls into it when it
+    is not None, so a run without metrics pays for one comparison per call
+    site.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, phase, player, seconds):
+        key = (phase, player)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def increment(self, name, player, amount=1):
+        key = (name, player)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def merge(self, other):
+        for key, histogram in other.histograms.items():
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(histogram.bounds)
+            self.histograms[key].merge(histogram)
+
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self):
+        """
+        Tables of the latency percentiles and the counters.
+        """
+        from tabulate import tabulate
+
+        latencies = tabulate(
+            [
+                [phase, player or '', histogram.count]
+                + [
+                    f'{histogram.percentile(quantile) * 1000:.3f}'
+                    for quantile in PERCENTILES
+                ]
+                for (phase, player), histogram in sorted(
+                    self.histograms.items(), key=lambda item: _sort_key(item[0])
+                )
+            ],
+            headers=['Phase', 'Player', 'Count']
+            + [f'p{quantile * 100:g} (ms)' for quantile in PERCENTILES],
+        )
+        counters = tabulate(
+            [
+                [name, player or '', value]
+                for (name, player), value in sorted(
+                    self.counters.items(), key=lambda item: _sort_key(item[0])
+                )
+            ],
+            headers=['Counter', 'Player', 'Value'],
+        )
+        return f'{latencies}\n\n{counters}'
+
+    def to_prometheus(self):
+        """
+        Everything in the Prometheus text exposition format.
+        """
+        lines = [
+            f'# HELP {PREFIX}_phase_seconds Time spent in each phase of a turn.',
+            f'# TYPE {PREFIX}_phase_seconds histogram',
+        ]
+        for (phase, player), histogram in sorted(
+            self.histograms.items(), key=lambda item: _sort_key(item[0])
+        ):
+            labels = _labels(phase=phase, player=player)
+
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{PREFIX}_phase_seconds_bucket{{{labels},le="{bound:.6g}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(
+                f'{PREFIX}_phase_seconds_bucket{{{labels},le="+Inf"}} '
+                f'{histogram.count}'
+            )
+            lines.append(f'{PREFIX}_phase_seconds_sum{{{labels}}} {histogram.sum!r}')
+            lines.append(f'{PREFIX}_phase_seconds_count{{{labels}}} {histogram.count}')
+
+        for name in sorted({name for name, player in self.counters}):
+            lines.append(f'# TYPE {PREFIX}_{name}_total counter')
+            for (counter, player), value in sorted(
+                self.counters.items(), key=lambda item: _sort_key(item[0])
+            ):
+                if counter == name:
+                    lines.append(
+                        f'{PREFIX}_{name}_total{{{_labels(player=player)}}} {value}'
+                    )
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+
+def _sort_key(key):
+    name, player = key
+    return name, player or ''
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(
+        f'{name}="{_escape(value)}"'
+        for name, value in labels.items()
+        if value is not None
+    )
@@ -1,12 +1,21 @@
-import itertools
+import math
 import random
 import time
+from collections import namedtuple
 from enum import Enum, IntEnum
 
-from src.terminal import Location, Terminal
+from src.engine import MutablePosition, Side, sow_cups
+from src.rng import RandomSource, create_rng, derive_seed, rand
+from src.terminal import Location, get_terminal
+from src.transposition import Bound, ZobristKeys
 
 RANDOM_PLAYER_WAIT_TIME = 0.5
-rand = random.SystemRandom()
+DEFAULT_SEARCH_DEPTH = 6
+MESSAGE_LOCATION = Location(19, 0)
+DEFAULT_PLAYOUTS = 1000
+TREE_REUSE_DEPTH = 4
+
+SearchStats = namedtuple('SearchStats', 'nodes elapsed nodes_per_second')
 
 
 class NoGameInProgress(Exception):
@@ -18,31 +27,99 @@ class Result(IntEnum):
     Loss = 1
     Win = 2
 
+    @property
+    def opposite(self):
+        if self == Result.Win:
+            return Result.Loss
+        elif self == Result.Loss:
+            return Result.Win
+        return Result.Tie
+
 
 class PlayerType(Enum):
     Human = 'human'
     Random = 'random'
     ImprovedRandom = 'improved_random'
     Defensive = 'defensive'
+    AlphaBeta = 'alpha_beta'
+    MonteCarlo = 'monte_carlo'
 
 
 class Player:
-    def __init__(self, name, board=None, color=None, wait_time=None):
-        self.term = Terminal()
+    def __init__(
+        self,
+        name,
+        board=None,
+        color=None,
+        wait_time=None,
+        opening_book=None,
+        rng=None,
+    ):
+        """
+        rng is the random.Random the player draws its choices from. Players
+        without one share a process wide generator; see src.rng.
+        """
+        self.term = get_terminal()
         self.name = f'{name} ({self.__class__.__name__})'
         self.board = board
         self.color = color
+        self.opening_book = opening_book
 
         self.wins = 0
         self.losses = 0
         self.ties = 0
 
+        self.rand = rand if rng is None else rng
+
+        # Seconds the current turn has spent printing and pausing for
+        # whoever is watching, as opposed to deciding
+        self.presentation_time = 0.0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['term']
+        state['board'] = None
+
+        # The shared generator belongs to the process and SystemRandom cannot
+        # be pickled; both are picked back up when the player is unpickled.
+        if state['rand'] is rand:
+            del state['rand']
+        elif isinstance(state['rand'], random.SystemRandom):
+            state['rand'] = RandomSource.System
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'rand' not in state:
+            self.rand = rand
+        elif state['rand'] == RandomSource.System:
+            self.rand = create_rng(source=RandomSource.System)
+        self.term = get_terminal()
+
+    def seed(self, seed):
+        """
+        Replace the player's random source with one seeded from seed so its
+        choices can be reproduced.
+        """
+        self.use_rng(create_rng(seed))
+
+    def use_rng(self, rng):
+        """
+        Draw every random choice from rng from now on.
+        """
+        self.rand = rng
+
     def _take_turn(self):
         if self.board is None:
             raise NoGameInProgress('No board has been assigned to this player')
 
-        self.term.move(*Location(19, 0))
-        print(f"{self.color or ''}{self.name}{self.term.normal}'s turn")
+        self.presentation_time = 0.0
+        if self.board.renders:
+            start = time.perf_counter()
+            self.term.move(*MESSAGE_LOCATION)
+            self.term.clear_eos()
+            print(f"{self.color or ''}{self.name}{self.term.normal}'s turn")
+            self.presentation_time += time.perf_counter() - start
         cup = self.take_turn()
 
         if cup is None:
@@ -52,6 +129,18 @@ class Player:
     def take_turn(self):
         raise NotImplementedError('take_turn must be implemented by subclasses')
 
+    def _book_move(self):
+        """
+        Cup the opening book plays in the current position, or None.
+        """
+        if self.opening_book is None:
+            return None
+
+        index = self.opening_book.move(self.position, self.board.initial_seeds)
+        if index is None:
+            return None
+        return self.board.index_to_cup[index]
+
     def assign_board(self, board):
         self.board = board
 
@@ -79,6 +168,14 @@ class Player:
     def is_player2(self):
         return self.board.player2 == self
 
+    @property
+    def side(self):
+        return Side.Player1 if self.is_player1 else Side.Player2
+
+    @property
+    def position(self):
+        return self.board.to_position(self.side)
+
     @property
     def cup_index(self):
         return (
@@ -110,78 +207,63 @@ class RandomPlayer(Player):
 
     @property
     def _legal_cups(self):
-        return [
-            cup
-            for cup in itertools.chain(
-                self.board.top_row_cups, self.board.bottom_row_cups
-            )
-            if self.board.cup_seeds(cup) > 0
-        ]
+        return self.board.legal_cups()
+
+    def _pause(self):
+        if self.board.renders:
+            start = time.perf_counter()
+            time.sleep(self.wait_time)
+            self.presentation_time += time.perf_counter() - start
+
+    def _announce(self, cup):
+        if self.board.renders:
+            start = time.perf_counter()
+            print(f'{self.color}{self.name}{self.term.normal} chooses {cup}')
+            time.sleep(self.wait_time)
+            self.presentation_time += time.perf_counter() - start
 
     def take_turn(self):
-        time.sleep(self.wait_time)
+        self._pause()
 
-        cup = rand.choice(self._legal_cups)
-        print(f'{self.color}{self.name}{self.term.normal} chooses {cup}')
-        time.sleep(self.wait_time)
+        cup = self.rand.choice(self._legal_cups)
+        self._announce(cup)
         return cup
 
 
 class ImprovedRandomPlayer(RandomPlayer):
     def _free_play_moves(self):
-        moves = []
-
-        for index in itertools.chain(
-            self.board.top_row_indices, self.board.bottom_row_indices
-        ):
-            seeds = self.board.cup_seeds_by_index(index)
-
-            if seeds == 0:
-                continue
-
-            if (index + seeds) % len(self.board.cups) == (
-                self.board.player_1_cup_index
-                if self.is_player1
-                else self.board.player_2_cup_index
-            ):
-                moves.append({'cup': self.board.index_to_cup[index], 'seeds': seeds})
+        moves = [
+            {
+                'cup': self.board.index_to_cup[index],
+                'seeds': self.board.cup_seeds_by_index(index),
+            }
+            for index in self.board.free_play_moves(self.side)
+        ]
 
         moves.sort(key=lambda x: x['seeds'])
         return moves
 
     def take_turn(self):
-        time.sleep(self.wait_time)
+        self._pause()
         free_play_moves = self._free_play_moves()
         if free_play_moves:
             next_move = free_play_moves[0]['cup']
         else:
-            next_move = rand.choice(self._legal_cups)
+            next_move = self.rand.choice(self._legal_cups)
 
-        print(f'{self.color}{self.name}{self.term.normal} chooses {next_move}')
-        time.sleep(self.wait_time)
+        self._announce(next_move)
         return next_move
 
 
 class DefensivePlayer(ImprovedRandomPlayer):
     def _defensive_move(self):
-        opp_free_moves = []
-
-        for index in itertools.chain(
-            self.board.top_row_indices, self.board.bottom_row_indices
-        ):
-            seeds = self.board.cup_seeds_by_index(index)
-
-            if seeds == 0:
-                continue
-
-            if (index + seeds) % len(self.board.cups) == (
-                self.board.player_2_cup_index
-                if self.is_player1
-                else self.board.player_1_cup_index
-            ):
-                opp_free_moves.append(
-                    {'cup': self.board.index_to_cup[index], 'seeds': seeds}
-                )
+        opp_free_moves = [
+            {
+                'cup': self.board.index_to_cup[index],
+                'seeds': self.board.cup_seeds_by_index(index),
+            }
+            for index in self.board.free_play_moves(self.side.opponent)
+        ]
 
         if opp_free_moves:
             opp_free_moves.sort(key=lambda x: x['seeds'], reverse=True)
@@ -248,11 +330,15 @@ class DefensivePlayer(ImprovedRandomPlayer):
 
     def _score_moves(self):
         legal_cups = self._legal_cups
+        # Each candidate is sown on one scratch copy of the cups and taken
+        # back before the next
+        lookahead = MutablePosition.from_position(self.position, depth=1)
+        fake_board_cups = lookahead.cups
 
         possible_moves = []
 
         for legal_cup in legal_cups:
-            fake_board_cups = self._fake_sow(legal_cup)
+            lookahead.make_move(self.board.cup_to_index[legal_cup])
             board_score = -1 if self._will_finish_in_opp_cup(legal_cup) else 0
 
             for cup_index in range(len(fake_board_cups)):
@@ -274,6 +360,7 @@ class DefensivePlayer(ImprovedRandomPlayer):
                 ):
                     board_score -= 1
 
+            lookahead.unmake_move()
             possible_moves.append({'cup': legal_cup, 'score': board_score})
 
         return possible_moves
@@ -284,22 +371,6 @@ class DefensivePlayer(ImprovedRandomPlayer):
             self.board.player_2_cup_index,
         )
 
-    def _fake_sow(self, cup):
-        board_cups = self.board.cups.copy()
-
-        index = self.board.cup_to_index[cup]
-        seeds = self.board.cup_seeds(cup)
-
-        if seeds == 0:
-            return board_cups
-
-        board_cups[index] = 0
-        while seeds:
-            index += 1
-            board_cups[index % len(board_cups)] += 1
-            seeds -= 1
-        return board_cups
-
     def _will_finish_in_my_cup(self, cup, fake_board_cups=None):
         board_cups = fake_board_cups or self.board.cups
 
@@ -313,7 +384,7 @@ class DefensivePlayer(ImprovedRandomPlayer):
         if seeds == 0:
             return False
 
-        if (cup_index + seeds) % len(board_cups) == self._my_cup_index:
+        if self.board.landing_index(cup_index, seeds) == self._my_cup_index:
             return True
 
         return False
@@ -331,14 +402,18 @@ class DefensivePlayer(ImprovedRandomPlayer):
         if seeds == 0:
             return False
 
-        if (cup_index + seeds) % len(board_cups) == self._opp_cup_index:
+        if self.board.landing_index(cup_index, seeds) == self._opp_cup_index:
             return True
 
         return False
 
     def take_turn(self):
-        free_play_moves = self._free_play_moves()
+        next_move = self._book_move()
+        if next_move:
+            self._announce(next_move)
+            return next_move
 
+        free_play_moves = self._free_play_moves()
         if free_play_moves:
             next_move = free_play_moves[0]['cup']
         else:
@@ -351,7 +426,7 @@ class DefensivePlayer(ImprovedRandomPlayer):
                 possible_moves.sort(key=lambda x: x['score'], reverse=True)
                 max_score = possible_moves[0]['score']
 
-                next_move = rand.choice(
+                next_move = self.rand.choice(
                     [
                         move['cup']
                         for move in possible_moves
@@ -359,6 +434,446 @@ class DefensivePlayer(ImprovedRandomPlayer):
                     ]
                 )
 
-        print(f'{self.color}{self.name}{self.term.normal} chooses {next_move}')
-        time.sleep(self.wait_time)
+        self._announce(next_move)
+        return next_move
+
+
+class AlphaBetaPlayer(ImprovedRandomPlayer):
+    """
+    Negamax search with alpha-beta pruning. The search makes and unmakes
+    moves on one MutablePosition instead of building a Position per node.
+
+    Scores are the store difference from the point of view of the side to
+    move. When a move earns an extra turn the same side moves again, so the
+    child's score is not negated and the window is not flipped.
+    """
+
+    def __init__(
+        self,
+        name,
+        board=None,
+        wait_time=RANDOM_PLAYER_WAIT_TIME,
+        depth=DEFAULT_SEARCH_DEPTH,
+        transposition_table=None,
+        tablebase=None,
+        **kwargs,
+    ):
+        if depth < 1:
+            raise ValueError(f'depth must be at least 1. Got {depth}.')
+
+        super().__init__(name, board=board, wait_time=wait_time, **kwargs)
+        self.depth = depth
+        self.transposition_table = transposition_table
+        self.tablebase = tablebase
+
+        self.last_search_stats = None
+        self.total_nodes = 0
+        self.total_search_time = 0
+
+    def _order_moves(self, position, moves, hash_move=None):
+        store_index = position.store_index(position.side_to_move)
+
+        free_play_moves = []
+        other_moves = []
+        for index in moves:
+            seeds = position.cups[index]
+            if position.landing_index(index, seeds) == store_index:
+                free_play_moves.append((seeds, index))
+            else:
+                other_moves.append(index)
+
+        free_play_moves.sort()
+        ordered = [index for seeds, index in free_play_moves] + other_moves
+
+        if hash_move is not None and hash_move in ordered:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
+        return ordered
+
+    def _child_score(self, board, index, depth, alpha, beta, key):
+        side = board.side_to_move
+
+        child_key = None
+        if key is not None:
+            seeds = board.cups[index]
+            child_key = key ^ self._zobrist.sown_cups_key(board.cups, index, seeds)
+
+        board.make_move(index)
+        if key is not None:
+            child_key ^= self._zobrist.sown_cups_key(board.cups, index, seeds)
+            if board.side_to_move != side:
+                child_key ^= self._zobrist.side_key
+
+        if board.side_to_move == side:
+            score = self._negamax_in_place(board, depth - 1, alpha, beta, child_key)
+        else:
+            score = -self._negamax_in_place(board, depth - 1, -beta, -alpha, child_key)
+
+        board.unmake_move()
+        return score
+
+    def _negamax_in_place(self, board, depth, alpha, beta, key=None):
+        """
+        Negamax over a single MutablePosition. Children are visited by making
+        a move and unmaking it afterwards, so no node copies the cups.
+        """
+        self._nodes += 1
+        moves = board.legal_moves()
+
+        if self.tablebase is not None:
+            score = self.tablebase.score(board)
+            if score is not None:
+                return score
+
+        if depth <= 0 or not moves:
+            return board.store_difference()
+
+        hash_move = None
+        original_alpha = alpha
+        if key is not None:
+            entry = self.transposition_table.probe(key)
+
+            if entry is not None:
+                hash_move = entry.best_move
+
+                if entry.depth >= depth:
+                    if entry.bound == Bound.Exact:
+                        return entry.score
+                    elif entry.bound == Bound.Lower:
+                        alpha = max(alpha, entry.score)
+                    else:
+                        beta = min(beta, entry.score)
+
+                    if alpha >= beta:
+                        return entry.score
+
+        best_score = -math.inf
+        best_move = None
+        for index in self._order_moves(board, moves, hash_move=hash_move):
+            score = self._child_score(board, index, depth, alpha, beta, key)
+
+            if score > best_score:
+                best_score = score
+                best_move = index
+
+            if score > alpha:
+                alpha = score
+
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            if best_score <= original_alpha:
+                bound = Bound.Upper
+            elif best_score >= beta:
+                bound = Bound.Lower
+            else:
+                bound = Bound.Exact
+            self.transposition_table.store(key, depth, bound, best_score, best_move)
+
+        return best_score
+
+    def _search(self, position):
+        self._nodes = 1
+        start = time.perf_counter()
+
+        if self.tablebase is not None:
+            best_index = self.tablebase.best_move(position)
+            if best_index is not None:
+                self._record_search_stats(start)
+                return best_index
+
+        key = None
+        hash_move = None
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+            self._zobrist = ZobristKeys.for_cups(len(position.cups))
+            key = self._zobrist.hash_position(position)
+
+            entry = self.transposition_table.probe(key)
+            if entry is not None:
+                hash_move = entry.best_move
+
+        board = MutablePosition.from_position(position, depth=self.depth + 1)
+        alpha, beta = -math.inf, math.inf
+        best_index = None
+        for index in self._order_moves(board, board.legal_moves(), hash_move=hash_move):
+            score = self._child_score(board, index, self.depth, alpha, beta, key)
+
+            if best_index is None or score > alpha:
+                alpha = score
+                best_index = index
+
+        if key is not None:
+            self.transposition_table.store(
+                key, self.depth, Bound.Exact, alpha, best_index
+            )
+
+        self._record_search_stats(start)
+        return best_index
+
+    def _record_search_stats(self, start):
+        elapsed = time.perf_counter() - start
+        self.last_search_stats = SearchStats(
+            nodes=self._nodes,
+            elapsed=elapsed,
+            nodes_per_second=self._nodes / elapsed if elapsed else math.inf,
+        )
+        self.total_nodes += self._nodes
+        self.total_search_time += elapsed
+
+    def take_turn(self):
+        self._pause()
+        next_move = self._book_move()
+        if next_move:
+            self._announce(next_move)
+            return next_move
+
+        next_move = self.board.index_to_cup[self._search(self.position)]
+
+        if self.board.renders:
+            stats = self.last_search_stats
+            print(
+                f'{self.name} searched {stats.nodes} nodes '
+                f'({stats.nodes_per_second:,.0f} nodes/sec)'
+            )
+
+        self._announce(next_move)
+        return next_move
+
+
+class _TreeNode:
+    __slots__ = ('position', 'parent', 'move', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, position, parent=None, move=None):
+        self.position = position
+        self.parent = parent
+        self.move = move
+        self.children = {}
+        self.untried = position.legal_moves()
+        self.visits = 0
+        # Accumulated reward from the point of view of the side that made the
+        # move into this node, i.e. the parent's side to move.
+        self.value = 0.0
+
+    def best_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.value / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+class MonteCarloPlayer(ImprovedRandomPlayer):
+    """
+    UCT Monte Carlo tree search.
+
+    Each move runs playouts until either the playout count or the wall-clock
+    time budget is used up, whichever comes first, and always at least one.
+    At least one of the two limits must be set. Playouts sow a plain list of
+    cups and never touch the board. The tree from the previous move is kept
+    and reused when the current position is already in it.
+    """
+
+    def __init__(
+        self,
+        name,
+        board=None,
+        wait_time=RANDOM_PLAYER_WAIT_TIME,
+        playouts=DEFAULT_PLAYOUTS,
+        time_budget=None,
+        exploration=math.sqrt(2),
+        improved_playouts=True,
+        tablebase=None,
+        **kwargs,
+    ):
+        if playouts is None and time_budget is None:
+            raise ValueError('Either playouts or time_budget must be given')
+        if playouts is not None and playouts < 1:
+            raise ValueError(f'playouts must be at least 1. Got {playouts}.')
+
+        super().__init__(name, board=board, wait_time=wait_time, **kwargs)
+        self.playouts = playouts
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.improved_playouts = improved_playouts
+        self.tablebase = tablebase
+
+        self._root = None
+        # Playouts draw from the player's generator until seed() gives them
+        # a stream of their own
+        self._playout_rand = self.rand
+
+        self.last_search_stats = None
+        self.last_reused_visits = 0
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Picked back up with rand, so an unseeded player never carries a
+        # copy of the shared generator into another process
+        if self._playout_rand is self.rand:
+            del state['_playout_rand']
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if '_playout_rand' not in state:
+            self._playout_rand = self.rand
+
+    def assign_board(self, board):
+        super().assign_board(board)
+        self._root = None
+
+    def use_rng(self, rng):
+        super().use_rng(rng)
+        self._playout_rand = rng
+
+    def seed(self, seed):
+        super().seed(seed)
+        self._playout_rand = create_rng(derive_seed(seed, 1))
+
+    def _find_root(self, position):
+        if self._root is None:
+            return _TreeNode(position)
+
+        frontier = [self._root]
+        for _ in range(TREE_REUSE_DEPTH):
+            next_frontier = []
+            for node in frontier:
+                if node.position == position:
+                    node.parent = None
+                    node.move = None
+                    return node
+                next_frontier.extend(node.children.values())
+            frontier = next_frontier
+
+        return _TreeNode(position)
+
+    def _playout_move(self, cups, side):
+        number_of_cups = len(cups)
+        midpoint = number_of_cups // 2
+        store_index = 0 if side == Side.Player1 else midpoint
+
+        moves = []
+        best_free_play = None
+        for index in range(1, number_of_cups):
+            seeds = cups[index]
+            if not seeds or index == midpoint:
+                continue
+
+            moves.append(index)
+            if (
+                self.improved_playouts
+                and (index + seeds) % number_of_cups == store_index
+                and (best_free_play is None or seeds < cups[best_free_play])
+            ):
+                best_free_play = index
+
+        if best_free_play is not None:
+            return best_free_play
+        if moves:
+            return self._playout_rand.choice(moves)
+        return None
+
+    def _playout(self, position):
+        """
+        Play random moves to the end of the game and return the winning Side,
+        or None for a tie. Positions covered by the tablebase are scored with
+        perfect play instead.
+        """
+        if self.tablebase is not None:
+            score = self.tablebase.score(position)
+            if score is not None:
+                if score > 0:
+                    return position.side_to_move
+                elif score < 0:
+                    return position.side_to_move.opponent
+                return None
+
+        cups = list(position.cups)
+        side = position.side_to_move
+        midpoint = len(cups) // 2
+
+        index = self._playout_move(cups, side)
+        while index is not None:
+            last_index = sow_cups(cups, index)
+            if last_index != (0 if side == Side.Player1 else midpoint):
+                side = side.opponent
+            index = self._playout_move(cups, side)
+
+        if cups[0] > cups[midpoint]:
+            return Side.Player1
+        elif cups[0] < cups[midpoint]:
+            return Side.Player2
+        return None
+
+    def _iterate(self, root):
+        node = root
+        while not node.untried and node.children:
+            node = node.best_child(self.exploration)
+
+        if node.untried:
+            move = node.untried.pop()
+            child = _TreeNode(node.position.apply_move(move), parent=node, move=move)
+            node.children[move] = child
+            node = child
+
+        winner = self._playout(node.position)
+
+        while node is not None:
+            node.visits += 1
+            if node.parent is not None:
+                mover = node.parent.position.side_to_move
+                if winner is None:
+                    node.value += 0.5
+                elif winner == mover:
+                    node.value += 1
+            node = node.parent
+
+    def _search(self, position):
+        root = self._find_root(position)
+        self.last_reused_visits = root.visits
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+
+        # The first playout always runs, so the root has a child to pick
+        playouts = 0
+        while True:
+            self._iterate(root)
+            playouts += 1
+
+            if self.playouts is not None and playouts >= self.playouts:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.last_search_stats = SearchStats(
+            nodes=playouts,
+            elapsed=elapsed,
+            nodes_per_second=playouts / elapsed if elapsed else math.inf,
+        )
+
+        self._root = root
+        return max(root.children.values(), key=lambda child: child.visits).move
+
+    def take_turn(self):
+        self._pause()
+        next_move = self._book_move()
+        if next_move:
+            self._announce(next_move)
+            return next_move
+
+        next_move = self.board.index_to_cup[self._search(self.position)]
+
+        if self.board.renders:
+            stats = self.last_search_stats
+            print(
+                f'{self.name} ran {stats.nodes} playouts '
+                f'({stats.nodes_per_second:,.0f} playouts/sec)'
+            )
+
+        self._announce(next_move)
         return next_move
@@ -0,0 +1,149 @@
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+
+from tabulate import tabulate
+
+from src.board import Board
+from src.engine import Engine
+from src.metric_names import DECISION, RENDER, SOW
+from src.player import Player
+from src.renderer import FrameRenderer
+
+DEFAULT_SAMPLING_INTERVAL = 0.001
+OTHER = 'other'
+
+# Frames that start a phase. A sample belongs to the innermost phase on its
+# stack, so drawing done while sowing counts as rendering.
+PHASE_CODES = {
+    Player._take_turn.__code__: DECISION,
+    Engine.sow.__code__: SOW,
+    Board.sow.__code__: SOW,
+    Board.display_cups.__code__: RENDER,
+    FrameRenderer.flush.__code__: RENDER,
+}
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread from a background thread.
+
+    Each sample is reduced to a tuple of frame labels, outermost first,
+    prefixed with the phase the thread was in, and counted. The counts are
+    written out in the collapsed stack format that flame graph tools read.
+    Nothing is hooked into the sampled thread, so it runs at full speed
+    between samples. While sampling, the interpreter's switch interval is
+    lowered to the sampling interval, otherwise a busy thread would only
+    hand over the GIL every 5ms.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLING_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def start(self):
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.interval, self._switch_interval))
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._sample(frame)] += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = self._labels[code] = f'{os.path.basename(code.co_filename)}:{name}'
+        return label
+
+    def _sample(self, frame):
+        phase = None
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            if phase is None:
+                phase = PHASE_CODES.get(code)
+            labels.append(self._label(code))
+            frame = frame.f_back
+
+        labels.append(phase or OTHER)
+        labels.reverse()
+        return tuple(labels)
+
+    def phase_samples(self):
+        samples = Counter()
+        for stack, count in self.stacks.items():
+            samples[stack[0]] += count
+        return samples
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f'{";".join(stack)} {count}\n')
+
+
+class Profile:
+    """
+    Profiles the code run inside it, both deterministically with cProfile
+    and by sampling, and writes path.pstats and path.collapsed on exit.
+
+    Only the thread that enters is profiled. Games played in worker
+    processes are not.
+    """
+
+    def __init__(self, path, interval=DEFAULT_SAMPLING_INTERVAL):
+        self.path = path
+        self.pstats_path = f'{path}.pstats'
+        self.collapsed_path = f'{path}.collapsed'
+
+        self.profile = cProfile.Profile()
+        self.sampler = SamplingProfiler(interval=interval)
+
+    def __enter__(self):
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.profile.disable()
+        self.sampler.stop()
+
+        self.profile.dump_stats(self.pstats_path)
+        self.sampler.write_collapsed(self.collapsed_path)
+
+    def summary(self):
+        samples = self.sampler.phase_samples()
+        total = sum(samples.values()) or 1
+
+        table = tabulate(
+            [
+                [phase, count, f'{count / total:.1%}']
+                for phase, count in samples.most_common()
+            ],
+            headers=['Phase', 'Samples', 'Share'],
+        )
+        return f'{table}\n\nWrote {self.pstats_path} and {self.collapsed_path}'
@@ -0,0 +1,308 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+from src.board import Board
+from src.engine import Engine, Side
+from src.player import Player
+from src.utils import read_varint, write_varint
+
+MAGIC = b'MREC'
+VERSION = 1
+DEFAULT_BUFFER_BYTES = 64 * 1024
+INDEX_SUFFIX = '.idx'
+
+_HEADER = MAGIC + bytes((VERSION,))
+_OFFSET = struct.Struct('<Q')
+
+GameRecord = namedtuple(
+    'GameRecord', 'side_length initial_seeds player1_type player2_type moves'
+)
+
+
+class RecordError(Exception):
+    pass
+
+
+def _read_varint(data, offset):
+    try:
+        return read_varint(data, offset)
+    except IndexError:
+        raise RecordError('Record ends in the middle of a number') from None
+
+
+def encode_record(record):
+    """
+    Encode a GameRecord as its length followed by the side length, initial
+    seeds, both player types and the moves, all as unsigned varints. Moves
+    are cup indices, so each one fits in a single byte on boards with fewer
+    than 128 cups.
+    """
+    body = bytearray()
+    write_varint(record.side_length, body)
+    write_varint(record.initial_seeds, body)
+
+    for player_type in (record.player1_type, record.player2_type):
+        encoded = player_type.encode()
+        write_varint(len(encoded), body)
+        body += encoded
+
+    write_varint(len(record.moves), body)
+    for move in record.moves:
+        write_varint(move, body)
+
+    framed = bytearray()
+    write_varint(len(body), framed)
+    return bytes(framed + body)
+
+
+def decode_record(data, offset=0):
+    """
+    Decode the record starting at offset. Returns the GameRecord and the
+    offset of the next record.
+    """
+    length, offset = _read_varint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise RecordError('Record is truncated')
+
+    side_length, offset = _read_varint(data, offset)
+    initial_seeds, offset = _read_varint(data, offset)
+
+    player_types = []
+    for _ in range(2):
+        size, offset = _read_varint(data, offset)
+        player_types.append(bytes(data[offset : offset + size]).decode())
+        offset += size
+
+    number_of_moves, offset = _read_varint(data, offset)
+    moves = []
+    for _ in range(number_of_moves):
+        move, offset = _read_varint(data, offset)
+        moves.append(move)
+
+    if offset != end:
+        raise RecordError('Record length does not match its contents')
+
+    return GameRecord(side_length, initial_seeds, *player_types, tuple(moves)), end
+
+
+class GameRecordWriter:
+    """
+    Appends encoded GameRecords to a file.
+
+    Records are collected in memory and written out whenever more than
+    buffer_bytes are waiting, and on flush() and close(). Each record's
+    offset goes to a sidecar index file, written after the records it
+    points at, so GameRecordReader can seek straight to game N.
+    """
+
+    def __init__(self, path, buffer_bytes=DEFAULT_BUFFER_BYTES):
+        self.path = os.fspath(path)
+        self.index_path = self.path + INDEX_SUFFIX
+        self.buffer_bytes = buffer_bytes
+
+        self._file = open(self.path, 'ab')
+        self._index = open(self.index_path, 'ab')
+
+        self._offset = self._file.tell()
+        if self._offset == 0:
+            self._file.write(_HEADER)
+            self._offset = len(_HEADER)
+
+        self._buffer = bytearray()
+        self._index_buffer = bytearray()
+        self.records_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, record):
+        encoded = encode_record(record)
+
+        self._index_buffer += _OFFSET.pack(self._offset)
+        self._buffer += encoded
+        self._offset += len(encoded)
+        self.records_written += 1
+
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+        if self._index_buffer:
+            self._index.write(self._index_buffer)
+            self._index_buffer.clear()
+        self._index.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+
+def rebuild_index(path):
+    """
+    Write path's index file from scratch by scanning every record.
+    """
+    path = os.fspath(path)
+    with GameRecordReader(path, use_index=False) as reader:
+        offsets = [offset for offset, record in reader._scan()]
+
+    with open(path + INDEX_SUFFIX, 'wb') as f:
+        for offset in offsets:
+            f.write(_OFFSET.pack(offset))
+
+
+class GameRecordReader:
+    """
+    Reads a file written by GameRecordWriter.
+
+    The records file is memory-mapped. Iterating decodes the records in
+    order. Indexing with reader[n] looks up game n's offset in the index
+    file and decodes only that record.
+    """
+
+    def __init__(self, path, use_index=True):
+        self.path = os.fspath(path)
+
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(_HEADER)] != _HEADER:
+            self._mmap.close()
+            raise RecordError(f'{self.path} is not a version {VERSION} game record')
+
+        self._index = None
+        if use_index:
+            self._index = open(self.path + INDEX_SUFFIX, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+        if self._index is not None:
+            self._index.close()
+
+    def __len__(self):
+        if self._index is None:
+            return sum(1 for _ in self._scan())
+        return os.fstat(self._index.fileno()).st_size // _OFFSET.size
+
+    def __getitem__(self, game_number):
+        if game_number < 0:
+            game_number += len(self)
+        if not 0 <= game_number < len(self):
+            raise IndexError(f'No game {game_number} in {self.path}')
+
+        if self._index is None:
+            for idx, (offset, record) in enumerate(self._scan()):
+                if idx == game_number:
+                    return record
+
+        self._index.seek(game_number * _OFFSET.size)
+        (offset,) = _OFFSET.unpack(self._index.read(_OFFSET.size))
+        return decode_record(self._mmap, offset)[0]
+
+    def __iter__(self):
+        for offset, record in self._scan():
+            yield record
+
+    def _scan(self):
+        offset = len(_HEADER)
+        while offset < len(self._mmap):
+            record, next_offset = decode_record(self._mmap, offset)
+            yield offset, record
+            offset = next_offset
+
+
+def replay(record, board=None):
+    """
+    Play the moves of record and return the board.
+
+    Without a board the game is replayed on a headless Engine. A Board,
+    with players assigned, draws every move through display_cups.
+    """
+    if board is None:
+        board = Engine(record.side_length)
+    elif board.side_length != record.side_length:
+        raise ValueError(
+            f'Record is for side length {record.side_length}, '
+            f'board has {board.side_length}.'
+        )
+
+    board.initialize_cups(record.initial_seeds)
+    if board.renders:
+        board.display_cups()
+
+    side = Side.Player1
+    for move in record.moves:
+        if move not in board.legal_moves():
+            raise RecordError(f'Illegal move {move} in record')
+
+        if board.renders:
+            color = (board.player1, board.player2)[side].color
+            last_index = board.sow(board.index_to_cup[move], color=color)
+        else:
+            last_index = board.sow_index(move)
+        side = board.next_side(side, last_index)
+
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded mancala games')
+    parser.add_argument('path')
+    parser.add_argument('game', nargs='?', type=int, help='Game number to show')
+    parser.add_argument('--animation-wait', type=float, default=0.1)
+    args = parser.parse_args()
+
+    with GameRecordReader(args.path) as reader:
+        if args.game is None:
+            start = time.perf_counter()
+            wins = [0, 0, 0]
+            for record in reader:
+                winner = replay(record).winner()
+                wins[2 if winner is None else winner] += 1
+
+            elapsed = time.perf_counter() - start
+            print(
+                f'Replayed {sum(wins):,} games in {elapsed:.2f}s. '
+                f'Player 1: {wins[0]}, Player 2: {wins[1]}, Ties: {wins[2]}'
+            )
+            return
+
+        record = reader[args.game]
+
+    board = Board(
+        record.side_length,
+        animation_wait=args.animation_wait,
+        player1=Player(record.player1_type),
+        player2=Player(record.player2_type),
+    )
+    board.term.clear()
+    try:
+        replay(record, board)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import sys
+import time
+
+from src.metric_names import RENDER
+
+
+class FrameRenderer:
+    """
+    Draws frames made of positioned text, writing only what changed.
+
+    A frame is built up with draw() calls and sent with flush(). The renderer
+    remembers what it last put on screen, so flush() only emits escape codes
+    for cells whose text or color differ from the previous frame. Cells that
+    were drawn before but are missing from the new frame are blanked. The
+    whole update goes to the stream in a single write.
+
+    With a Metrics, the time each flush takes is recorded as the render
+    phase.
+    """
+
+    def __init__(self, term, stream=None, metrics=None):
+        self.term = term
+        self.stream = stream
+        self.metrics = metrics
+        self._previous = {}
+        self._current = {}
+
+    def draw(self, location, value, color=None):
+        self._current[(location[0], location[1])] = (str(value), color)
+
+    def invalidate(self):
+        """
+        Forget what is on screen, e.g. after the screen has been cleared, so
+        the next flush redraws every cell.
+        """
+        self._previous = {}
+
+    def flush(self):
+        if self.metrics is None:
+            self._flush()
+            return
+
+        start = time.perf_counter()
+        self._flush()
+        self.metrics.observe(RENDER, None, time.perf_counter() - start)
+
+    def _flush(self):
+        normal = self.term.normal
+        output = []
+
+        for (row, column), cell in self._current.items():
+            previous = self._previous.get((row, column))
+            if previous == cell:
+                continue
+
+            text, color = cell
+            output.append(self.term.move_sequence(row, column))
+            if color:
+                output.append(color)
+            output.append(text)
+            if color:
+                output.append(normal)
+
+            # Blank out what is left of a wider value drawn here before
+            if previous is not None and len(previous[0]) > len(text):
+                output.append(' ' * (len(previous[0]) - len(text)))
+
+        for (row, column), (text, color) in self._previous.items():
+            if (row, column) not in self._current:
+                output.append(self.term.move_sequence(row, column))
+                output.append(' ' * len(text))
+
+        self._previous = self._current
+        self._current = {}
+
+        if output:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(output))
+            stream.flush()
+
+    def clear(self):
+        """
+        Blank everything drawn by the last frame.
+        """
+        self._current = {}
+        self.flush()
@@ -0,0 +1,49 @@
+import os
+import random
+from enum import Enum
+
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+class RandomSource(Enum):
+    Fast = 'fast'
+    System = 'system'
+
+
+def splitmix64(value):
+    value = (value + _GOLDEN_GAMMA) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def derive_seed(seed, stream):
+    """
+    Seed for the stream'th generator derived from seed. This is the
+    splitmix64 sequence started at seed, so nearby seeds and streams still
+    give unrelated generators, and the result is the same on every platform
+    and in every process.
+    """
+    return splitmix64((seed + stream * _GOLDEN_GAMMA) & _MASK_64)
+
+
+def create_rng(seed=None, source=RandomSource.Fast):
+    """
+    A new random generator. Fast is a seedable random.Random, seeded from
+    the OS when seed is None. System reads os.urandom on every draw, so it
+    cannot be seeded or reproduced.
+    """
+    if source == RandomSource.System:
+        if seed is not None:
+            raise ValueError('SystemRandom cannot be seeded')
+        return random.SystemRandom()
+    return random.Random(seed)
+
+
+# Shared by every player that has not been given its own generator
+rand = create_rng()
+
+if hasattr(os, 'register_at_fork'):
+    # Forked worker processes would otherwise all draw the same stream
+    os.register_at_fork(after_in_child=rand.seed)
@@ -1,9 +1,47 @@
-import sys
+import contextlib
 
 from src.factory import PlayerFactory
 from src.game import Game
 from src.menu import GetUserInput
-from src.terminal import Terminal
+from src.metrics import Metrics
+from src.player import Result
+from src.record import GameRecordWriter
+from src.rng import RandomSource, create_rng, derive_seed
+from src.terminal import NullTerminal, get_terminal
+
+_worker_series = None
+
+
+def game_seed(series_seed, game_index):
+    """
+    Derive the seed for one game of a series. Every game gets its own seed so
+    that the outcome does not depend on which process plays it.
+    """
+    return derive_seed(series_seed, game_index)
+
+
+def _initialize_worker(series):
+    global _worker_series
+    _worker_series = series
+
+
+def _play_worker_game(game_index):
+    player1 = _worker_series.player1
+    results_before = (player1.wins, player1.losses, player1.ties)
+
+    # Each game gets its own metrics so the parent can merge them in order
+    if _worker_series.metrics is not None:
+        _worker_series.metrics = Metrics()
+
+    game = _worker_series._play_game(game_index)
+    record = game.record() if _worker_series.record_path else None
+    metrics = _worker_series.metrics
+
+    if player1.wins > results_before[0]:
+        return Result.Win, record, metrics
+    elif player1.losses > results_before[1]:
+        return Result.Loss, record, metrics
+    return Result.Tie, record, metrics
 
 
 class Series:
@@ -11,17 +49,55 @@ class Series:
         self,
         initial_seeds=3,
         number_of_games=10,
+        side_length=6,
         animation_wait=0.001,
         player1=None,
         player2=None,
+        headless=False,
+        transposition_table=None,
+        workers=None,
+        seed=None,
+        record_path=None,
+        metrics=None,
+        random_source=RandomSource.Fast,
     ):
-        self.term = Terminal()
+        """
+        When workers is greater than one, games are played headless in a
+        pool of worker processes and their results are merged back in game
+        order. With a seed, every game's players are reseeded from it, so a
+        parallel run gives the same results as a sequential one. Players that
+        carry state from one game to the next (a transposition table, for
+        example) each get their own copy in every worker.
+
+        With a record_path, every finished game is appended to that file in
+        game order; see src.record.
+
+        random_source System gives both players their own SystemRandom. Their
+        games cannot be reproduced, so it cannot be combined with a seed.
+
+        With a src.metrics.Metrics, every game's latencies and counters are
+        collected into it and summarised by final_results.
+
+        A transposition_table's statistics are only reported for sequential
+        runs. In a pool every worker fills its own copy, and the parent's
+        table is never probed.
+        """
+        self.headless = headless
+        self.term = NullTerminal() if headless else get_terminal()
+        self.transposition_table = transposition_table
+        self.workers = workers
+        self.seed = seed
+        self.record_path = record_path
+        self._recorder = None
+        self._game = None
+        self.metrics = metrics
 
         if number_of_games is None:
             number_of_games = GetUserInput('Enter number of games: ').get_response()
 
         self.number_of_games = number_of_games
         self.initial_seeds = initial_seeds
+        self.side_length = side_length
         self.animation_wait = animation_wait
 
         player_1_color = self.term.bold + self.term.red
@@ -47,24 +123,110 @@ class Series:
         else:
             self.player2 = player2
 
+        if random_source == RandomSource.System:
+            if seed is not None:
+                raise ValueError('A seeded series cannot use SystemRandom')
+            for player in (self.player1, self.player2):
+                player.use_rng(create_rng(source=RandomSource.System))
+
+        if self.transposition_table is not None:
+            for player in (self.player1, self.player2):
+                if hasattr(player, 'transposition_table'):
+                    player.transposition_table = self.transposition_table
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['term']
+        state['_recorder'] = None
+        state['_game'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.term = NullTerminal() if self.headless else get_terminal()
+
+    @property
+    def parallel(self):
+        return bool(self.workers and self.workers > 1)
+
+    def _play_game(self, idx):
+        if self.seed is not None:
+            seed = game_seed(self.seed, idx)
+            self.player1.seed(derive_seed(seed, 0))
+            self.player2.seed(derive_seed(seed, 1))
+
+        if idx % 2 == 0:
+            player1, player2 = self.player1, self.player2
+        else:
+            player1, player2 = self.player2, self.player1
+
+        # One Game, and so one board, is reset and replayed for every game
+        # this process plays
+        game = self._game
+        if game is None or game.headless != self.headless:
+            game = self._game = Game(
+                player1=player1,
+                player2=player2,
+                side_length=self.side_length,
+                initial_seeds=self.initial_seeds,
+                animation_wait=self.animation_wait,
+                headless=self.headless,
+                metrics=self.metrics,
+            )
+        else:
+            game.reset(swap_seats=game.player1 is not player1)
+
+        game.recorder = self._recorder
+        game.metrics = self.metrics
+        game.run()
+        return game
+
     def run_games(self):
-        for idx in range(self.number_of_games):
-            if idx % 2 == 0:
-                game = Game(
-                    player1=self.player1,
-                    player2=self.player2,
-                    initial_seeds=self.initial_seeds,
-                    animation_wait=self.animation_wait,
-                )
-            else:
-                game = Game(
-                    player1=self.player2,
-                    player2=self.player1,
-                    initial_seeds=self.initial_seeds,
-                    animation_wait=self.animation_wait,
+        if self.record_path:
+            self._recorder = GameRecordWriter(self.record_path)
+
+        try:
+            if self.parallel:
+                self._run_games_in_pool()
+                return
+
+            for idx in range(self.number_of_games):
+                self._play_game(idx)
+        finally:
+            if self._recorder is not None:
+                self._recorder.close()
+                self._recorder = None
+
+    def _run_games_in_pool(self):
+        # Only needed with workers, and slow to import
+        from concurrent.futures import ProcessPoolExecutor
+
+        headless = self.headless
+        self.headless = True
+
+        chunksize = max(1, self.number_of_games // (self.workers * 4))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_initialize_worker,
+                initargs=(self,),
+            ) as executor:
+                results = executor.map(
+                    _play_worker_game, range(self.number_of_games), chunksize=chunksize
                 )
 
-            game.run()
+                # map yields in submission order, so merging is deterministic
+                # no matter which worker finished first.
+                for result, record, metrics in results:
+                    self.player1.game_over(result)
+                    self.player2.game_over(result.opposite)
+
+                    if record is not None:
+                        self._recorder.write(record)
+                    if metrics is not None:
+                        self.metrics.merge(metrics)
+        finally:
+            self.headless = headless
 
     def final_results(self):
         print()
@@ -78,21 +240,97 @@ class Series:
         print(f'    Losses: {self.player2.losses}')
         print(f'    Ties: {self.player2.ties}')
 
+        if self.transposition_table is not None and not self.parallel:
+            stats = self.transposition_table.stats
+            print()
+            print('Transposition Table:')
+            print(f'    Hit Rate: {stats.hit_rate:.1%} ({stats.hits}/{stats.probes})')
+            print(f'    Collisions: {stats.collisions}')
+            print(f'    Evictions: {stats.evictions}')
+            print(
+                f'    Occupancy: {stats.occupancy:.1%} ({stats.occupied}/{stats.size})'
+            )
+
+        if self.metrics is not None:
+            print()
+            print(self.metrics.summary())
+
 
 def main():
-    number_of_games = None
+    import argparse
 
-    if len(sys.argv) == 2:
-        number_of_games = int(sys.argv[1])
+    parser = argparse.ArgumentParser(description='Play a series of mancala games')
+    parser.add_argument('number_of_games', nargs='?', type=int)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Play games headless across this many processes',
+    )
+    randomness = parser.add_mutually_exclusive_group()
+    randomness.add_argument('--seed', type=int, default=None)
+    randomness.add_argument(
+        '--system-random',
+        action='store_true',
+        help='Draw every random choice from the OS. Runs cannot be reproduced',
+    )
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--record', default=None, help='Append game records here')
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='Report latency percentiles and counters at the end',
+    )
+    parser.add_argument(
+        '--metrics-file',
+        default=None,
+        help='Also write the metrics here in the Prometheus text format',
+    )
+    parser.add_argument(
+        '--profile',
+        default=None,
+        metavar='PATH',
+        help=(
+            'Profile the games played in this process and write PATH.pstats '
+            'and PATH.collapsed'
+        ),
+    )
+    args = parser.parse_args()
+
+    metrics = Metrics() if args.metrics or args.metrics_file else None
+    profile = None
+    if args.profile:
+        from src.profiling import Profile
+
+        profile = Profile(args.profile)
 
     try:
-        series = Series(number_of_games=number_of_games, animation_wait=0.25)
+        series = Series(
+            number_of_games=args.number_of_games,
+            animation_wait=0.25,
+            headless=args.headless,
+            workers=args.workers,
+            seed=args.seed,
+            record_path=args.record,
+            metrics=metrics,
+            random_source=(
+                RandomSource.System if args.system_random else RandomSource.Fast
+            ),
+        )
 
-        series.run_games()
+        with profile or contextlib.nullcontext():
+            series.run_games()
         series.final_results()
+
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
     except KeyboardInterrupt:
         pass
 
+    if profile is not None:
+        print()
+        print(profile.summary())
+
 
 if __name__ == '__main__':
     main()
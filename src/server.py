@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.engine import EmptyCup, Engine, InvalidCup, Side
+from src.factory import PlayerFactory
+from src.player import Player, PlayerType, Result
+
+DEFAULT_PORT = 7777
+PROMPT = 'Your move: '
+CELL_WIDTH = 4
+
+
+def render_text(board):
+    """
+    Plain text drawing of board, one row per line, for clients that cannot
+    be relied on to understand terminal escape codes.
+    """
+    geometry = board.geometry
+    cups = board.cups
+    margin = ' ' * CELL_WIDTH
+
+    def row(values):
+        return margin + ''.join(f'{value:>{CELL_WIDTH}}' for value in values)
+
+    bottom_row_indices = geometry.bottom_row_indices[::-1]
+    return '\n'.join(
+        [
+            row(geometry.top_row_cups),
+            row(cups[idx] for idx in geometry.top_row_indices),
+            f'{cups[geometry.player_1_cup_index]:>{CELL_WIDTH}}'
+            + ' ' * (CELL_WIDTH * board.side_length)
+            + f'{cups[geometry.player_2_cup_index]:>{CELL_WIDTH}}',
+            row(cups[idx] for idx in bottom_row_indices),
+            row(geometry.bottom_row_cups),
+        ]
+    )
+
+
+class RemotePlayer(Player):
+    """
+    A human playing over a stream connection.
+
+    take_turn_async prompts on the writer and waits for a line from the
+    reader without blocking the event loop. An empty read means the client
+    went away.
+    """
+
+    def __init__(self, name, reader, writer, **kwargs):
+        super().__init__(name, **kwargs)
+        self.reader = reader
+        self.writer = writer
+
+    def take_turn(self):
+        raise NotImplementedError('RemotePlayer only supports take_turn_async')
+
+    async def take_turn_async(self):
+        self.writer.write(PROMPT.encode())
+        await self.writer.drain()
+
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError('Client disconnected')
+        return line.decode(errors='replace').strip().lower()
+
+
+class Session:
+    """
+    One game between a remote human and an AI opponent.
+
+    Mirrors Game.run on a headless Engine. Everything meant for the client
+    is collected with send() and written in one go by flush(), so a turn
+    costs a single write however many lines it draws. The AI's moves run on
+    the executor so the event loop keeps serving other sessions meanwhile.
+    """
+
+    def __init__(self, human, opponent, executor, side_length=6, initial_seeds=3):
+        self.human = human
+        self.opponent = opponent
+        self.executor = executor
+
+        self.board = Engine(side_length)
+        self.board.assign_player(human)
+        self.board.assign_player(opponent)
+        self.board.initialize_cups(initial_seeds)
+
+        self.current_player = human
+        self._players = (human, opponent)
+        self._output = []
+
+    def send(self, text=''):
+        self._output.append(text)
+        self._output.append('\n')
+
+    async def flush(self):
+        if self._output:
+            self.human.writer.write(''.join(self._output).encode())
+            self._output.clear()
+        await self.human.writer.drain()
+
+    @property
+    def current_side(self):
+        return Side.Player1 if self.current_player == self.human else Side.Player2
+
+    async def _take_turn(self):
+        if self.current_player is self.human:
+            self.send(f'Legal moves: {" ".join(self.board.legal_cups())}')
+            await self.flush()
+            return await self.human.take_turn_async()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.opponent._take_turn)
+
+    async def run(self):
+        self.send(f'{self.human.name} vs {self.opponent.name}')
+
+        while not self.board.done():
+            self.send()
+            self.send(render_text(self.board))
+
+            cup = await self._take_turn()
+            if cup == 'quit':
+                self.send('Goodbye!')
+                await self.flush()
+                return None
+
+            try:
+                last_index = self.board.sow(cup)
+            except (EmptyCup, InvalidCup) as e:
+                self.send(str(e))
+                continue
+
+            if self.current_player is self.opponent:
+                self.send(f'{self.opponent.name} chooses {cup}')
+
+            next_side = self.board.next_side(self.current_side, last_index)
+            self.current_player = self._players[next_side]
+
+        winner = self.board.winner()
+
+        self.send()
+        self.send(render_text(self.board))
+        if winner == Side.Player1:
+            self.send('You win!')
+            results = (Result.Win, Result.Loss)
+        elif winner == Side.Player2:
+            self.send(f'{self.opponent.name} wins!')
+            results = (Result.Loss, Result.Win)
+        else:
+            self.send('Tie game!')
+            results = (Result.Tie, Result.Tie)
+        await self.flush()
+
+        for player, result in zip(self._players, results):
+            player.game_over(result)
+        return winner
+
+
+class GameServer:
+    """
+    Hosts a Session for every connection.
+
+    Each connection gets its own board and its own opponent, created from
+    opponent_type with opponent_kwargs, so sessions share nothing but the
+    executor their opponents think on.
+    """
+
+    def __init__(
+        self,
+        opponent_type=PlayerType.Defensive,
+        side_length=6,
+        initial_seeds=3,
+        opponent_kwargs=None,
+        executor=None,
+    ):
+        self.opponent_type = opponent_type
+        self.side_length = side_length
+        self.initial_seeds = initial_seeds
+        self.opponent_kwargs = opponent_kwargs or {}
+
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor()
+
+        self.active_sessions = 0
+        self.sessions_served = 0
+
+    async def handle_connection(self, reader, writer):
+        self.active_sessions += 1
+        try:
+            human = RemotePlayer('Remote player', reader, writer)
+            opponent = PlayerFactory.create(
+                self.opponent_type, 'Computer', wait_time=0, **self.opponent_kwargs
+            )
+            session = Session(
+                human,
+                opponent,
+                self.executor,
+                side_length=self.side_length,
+                initial_seeds=self.initial_seeds,
+            )
+
+            await session.run()
+            self.sessions_served += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+    async def start_tcp(self, host='127.0.0.1', port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def start_unix(self, path):
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+
+async def _serve(game_server, host, port, unix_path):
+    if unix_path:
+        server = await game_server.start_unix(unix_path)
+        print(f'Serving on {unix_path}')
+    else:
+        server = await game_server.start_tcp(host, port)
+        for sock in server.sockets:
+            print(f'Serving on {sock.getsockname()}')
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Host mancala games against the computer over the network'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help='Listen on a Unix socket')
+    parser.add_argument(
+        '--opponent',
+        type=PlayerType,
+        default=PlayerType.Defensive,
+        choices=[
+            player_type
+            for player_type in PlayerFactory.all_types()
+            if player_type != PlayerType.Human
+        ],
+    )
+    parser.add_argument('--side-length', type=int, default=6)
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    game_server = GameServer(
+        opponent_type=args.opponent,
+        side_length=args.side_length,
+        initial_seeds=args.seeds,
+    )
+    try:
+        asyncio.run(_serve(game_server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game_server.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+
+
+if __name__ == '__main__':
+    main()
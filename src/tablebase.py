@@ -0,0 +1,310 @@
+import argparse
+import itertools
+import mmap
+import struct
+import time
+from array import array
+
+from src.engine import Side, sow_cups
+
+MAGIC = b'MTBL'
+VERSION = 1
+# Values are stored as signed bytes, which bounds the seeds a table can hold
+MAX_TABLEBASE_SEEDS = 127
+
+_HEADER = struct.Struct('<4sHHH')
+
+
+class TablebaseError(Exception):
+    pass
+
+
+class _Indexer:
+    """
+    Ranks the playable cups of a board holding at most max_seeds seeds.
+
+    Configurations are grouped by the total number of seeds. Within a group,
+    a configuration is a composition of the total into one part per playable
+    cup, which is ranked with the combinatorial number system: the partial
+    sums mark P - 1 bar positions among total + P - 1 slots. Ranking is
+    linear in the number of cups and does not depend on the size of the
+    table.
+    """
+
+    def __init__(self, side_length, max_seeds):
+        self.side_length = side_length
+        self.max_seeds = max_seeds
+        self.number_of_cups = side_length * 2 + 2
+        self.midpoint = self.number_of_cups // 2
+
+        self.playable = tuple(range(1, self.midpoint)) + tuple(
+            range(self.midpoint + 1, self.number_of_cups)
+        )
+        parts = len(self.playable)
+
+        self._binomial = [[0] * (parts + 1) for _ in range(max_seeds + parts + 1)]
+        for n in range(max_seeds + parts + 1):
+            self._binomial[n][0] = 1
+            for k in range(1, min(n, parts) + 1):
+                self._binomial[n][k] = (
+                    self._binomial[n - 1][k - 1] + self._binomial[n - 1][k]
+                )
+
+        # Configurations holding fewer than total seeds
+        self._offsets = [
+            self._binomial[total + parts - 1][parts] for total in range(max_seeds + 2)
+        ]
+        self.positions_per_side = self._offsets[max_seeds + 1]
+
+    def rank(self, cups):
+        """
+        Rank of the playable cups of cups, or None when they hold more than
+        max_seeds seeds.
+        """
+        binomial = self._binomial
+        playable = self.playable
+
+        total = 0
+        rank = 0
+        for part, index in enumerate(playable[:-1]):
+            total += cups[index]
+            if total > self.max_seeds:
+                return None
+            rank += binomial[total + part][part + 1]
+
+        total += cups[playable[-1]]
+        if total > self.max_seeds:
+            return None
+        return self._offsets[total] + rank
+
+    def configurations(self, total):
+        """
+        Every cups list, stores empty, with total seeds in the rows.
+        """
+        playable = self.playable
+        parts = len(playable)
+        slots = total + parts - 1
+
+        for bars in itertools.combinations(range(slots), parts - 1):
+            cups = [0] * self.number_of_cups
+            previous = -1
+            for index, bar in zip(playable, bars):
+                cups[index] = bar - previous - 1
+                previous = bar
+            cups[playable[-1]] = slots - previous - 1
+            yield cups
+
+    def potential(self, cups):
+        """
+        Sum over the seeds in the rows of the distance to the next store.
+        Moves that keep every seed in the rows strictly lower it.
+        """
+        midpoint = self.midpoint
+        number_of_cups = self.number_of_cups
+        return sum(
+            cups[index]
+            * (midpoint - index if index < midpoint else number_of_cups - index)
+            for index in self.playable
+        )
+
+
+def build_tablebase(side_length, max_seeds):
+    """
+    Solve every position with at most max_seeds seeds in the rows.
+
+    Seeds never leave a store, so the best store difference still to be won
+    depends only on the rows and the side to move. Positions are solved
+    by retrograde analysis in order of (seeds in the rows, potential): every
+    move either drops seeds into a store or keeps them all in the rows and
+    lowers the potential, so each child has already been solved. Extra turns
+    fall out of the same recurrence, with the child's value added rather
+    than subtracted.
+
+    Returns the values as a signed byte array indexed by
+    side * positions_per_side + rank.
+    """
+    if not 0 <= max_seeds <= MAX_TABLEBASE_SEEDS:
+        raise ValueError(
+            f'max_seeds must be between 0 and {MAX_TABLEBASE_SEEDS}. Got {max_seeds}.'
+        )
+
+    indexer = _Indexer(side_length, max_seeds)
+    per_side = indexer.positions_per_side
+    values = array('b', bytes(2 * per_side))
+    stores = (0, indexer.midpoint)
+
+    for total in range(1, max_seeds + 1):
+        for cups in sorted(indexer.configurations(total), key=indexer.potential):
+            rank = indexer.rank(cups)
+
+            for side in Side:
+                mine = stores[side]
+                theirs = stores[side.opponent]
+
+                best = None
+                for index in indexer.playable:
+                    if not cups[index]:
+                        continue
+
+                    child = list(cups)
+                    last_index = sow_cups(child, index)
+                    gain = child[mine] - child[theirs]
+                    child[mine] = child[theirs] = 0
+
+                    child_rank = indexer.rank(child)
+                    if last_index == mine:
+                        value = gain + values[side * per_side + child_rank]
+                    else:
+                        value = gain - values[side.opponent * per_side + child_rank]
+
+                    if best is None or value > best:
+                        best = value
+
+                values[side * per_side + rank] = best
+
+    return values
+
+
+def write_tablebase(path, side_length, max_seeds):
+    values = build_tablebase(side_length, max_seeds)
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, side_length, max_seeds))
+        f.write(values.tobytes())
+
+    return len(values)
+
+
+class Tablebase:
+    """
+    Read-only view of a tablebase file.
+
+    The file is memory-mapped rather than read, so probes only touch the
+    pages they need and every process that opens the same file shares one
+    copy through the page cache. Pickling reopens the file by path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise TablebaseError(f'{path} is too short to be a tablebase')
+
+        magic, version, side_length, max_seeds = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise TablebaseError(f'{path} is not a version {VERSION} tablebase')
+
+        self._indexer = _Indexer(side_length, max_seeds)
+        if len(self._mmap) != _HEADER.size + 2 * self._indexer.positions_per_side:
+            self._mmap.close()
+            raise TablebaseError(f'{path} is truncated')
+
+        self._values = memoryview(self._mmap)[_HEADER.size :].cast('b')
+        self.hits = 0
+
+    def __reduce__(self):
+        return (self.__class__, (self.path,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._values.release()
+        self._mmap.close()
+
+    @property
+    def side_length(self):
+        return self._indexer.side_length
+
+    @property
+    def max_seeds(self):
+        return self._indexer.max_seeds
+
+    def probe(self, position):
+        """
+        Best store difference the side to move can still gain from position
+        with perfect play on both sides, or None if position is not covered.
+        """
+        if len(position.cups) != self._indexer.number_of_cups:
+            return None
+
+        rank = self._indexer.rank(position.cups)
+        if rank is None:
+            return None
+
+        self.hits += 1
+        return self._values[
+            position.side_to_move * self._indexer.positions_per_side + rank
+        ]
+
+    def score(self, position):
+        """
+        Final store difference for the side to move under perfect play, or
+        None if position is not covered.
+        """
+        value = self.probe(position)
+        if value is None:
+            return None
+        return position.store_difference() + value
+
+    def best_move(self, position):
+        """
+        Index of a move that keeps the perfect play score, or None if position
+        is not covered or is over.
+        """
+        if self.probe(position) is None:
+            return None
+
+        best_move = None
+        best_score = None
+        for index in position.legal_moves():
+            child = position.apply_move(index)
+            score = self.score(child)
+            if child.side_to_move != position.side_to_move:
+                score = -score
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best_move = index
+
+        return best_move
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Solve every endgame position with few seeds left in play'
+    )
+    parser.add_argument('--side-length', type=int, default=6)
+    parser.add_argument(
+        '--max-seeds',
+        type=int,
+        default=8,
+        help='Largest number of seeds left in the rows',
+    )
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    output = args.output or f'tablebase-{args.side_length}-{args.max_seeds}.bin'
+
+    start = time.perf_counter()
+    try:
+        positions = write_tablebase(output, args.side_length, args.max_seeds)
+    except KeyboardInterrupt:
+        return
+
+    print(
+        f'Solved {positions:,} positions in {time.perf_counter() - start:.1f}s. '
+        f'Wrote {output}'
+    )
+
+
+if __name__ == '__main__':
+    main()
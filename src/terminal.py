@@ -1,4 +1,23 @@
-from blessings import Terminal as BlessingsTerm
+_STYLES = frozenset(
+    (
+        'black',
+        'red',
+        'green',
+        'yellow',
+        'blue',
+        'magenta',
+        'cyan',
+        'white',
+        'bold',
+        'reverse',
+        'underline',
+        'no_underline',
+        'blink',
+        'normal',
+    )
+)
+
+_shared_terminal = None
 
 
 class Location:
@@ -38,29 +57,38 @@ class Location:
 
 
 class Terminal:
+    """
+    Wrapper around a blessings Terminal.
+
+    blessings, and the curses setup that comes with it, is only imported
+    and initialized the first time something is actually drawn.
+    """
+
     def __init__(self):
-        self._term = BlessingsTerm()
-
-    def __getattribute__(self, name):
-        if name in (
-            'black',
-            'red',
-            'green',
-            'yellow',
-            'blue',
-            'magenta',
-            'cyan',
-            'white',
-            'bold',
-            'reverse',
-            'underline',
-            'no_underline',
-            'blink',
-            'normal',
-        ):
+        self._blessings = None
+
+    @property
+    def _term(self):
+        if self._blessings is None:
+            from blessings import Terminal as BlessingsTerm
+
+            self._blessings = BlessingsTerm()
+        return self._blessings
+
+    def __getattr__(self, name):
+        # Only reached for names not found the normal way
+        if name in _STYLES:
             return getattr(self._term, name)
-        else:
-            return super().__getattribute__(name)
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+    @property
+    def width(self):
+        """
+        Width in characters, or None when it cannot be determined.
+        """
+        return self._term.width
 
     def display(self, val, color=None):
         if color:
@@ -74,6 +102,17 @@ class Terminal:
     def clear(self):
         self.display(self._term.clear())
 
+    def clear_eos(self):
+        self.display(self._term.clear_eos)
+
+    def move_sequence(self, row_or_location, column=None):
+        """
+        Return the escape sequence for a move instead of printing it.
+        """
+        if isinstance(row_or_location, Location):
+            return self._term.move(*row_or_location)
+        return self._term.move(row_or_location, column)
+
     def move(self, row_or_location, column=None):
         if isinstance(row_or_location, Location):
             if column is not None:
@@ -96,3 +135,41 @@ class Terminal:
 
     def move_down(self):
         self.display(self._term.move_down)
+
+
+class _NullSequence(str):
+    """
+    Empty escape sequence that also stands in for parametrized ones.
+    """
+
+    def __call__(self, *args):
+        return self
+
+
+class _NullBlessings:
+    width = None
+
+    def __getattr__(self, name):
+        return _NullSequence()
+
+
+class NullTerminal(Terminal):
+    """
+    Terminal for headless runs. Every style and escape sequence is empty,
+    nothing is printed, and blessings is never imported.
+    """
+
+    _term = _NullBlessings()
+
+    def display(self, val, color=None):
+        pass
+
+
+def get_terminal():
+    """
+    The Terminal shared by everything that draws, created on first use.
+    """
+    global _shared_terminal
+    if _shared_terminal is None:
+        _shared_terminal = Terminal()
+    return _shared_terminal
@@ -0,0 +1,285 @@
+import argparse
+import itertools
+import json
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from tabulate import tabulate
+
+from src.factory import PlayerFactory
+from src.player import PlayerType
+from src.series import Series, game_seed
+
+INITIAL_RATING = 1500
+RATING_ITERATIONS = 200
+RATING_STEP = 32
+
+# Rough per-move cost of each strategy relative to RandomPlayer. Only used to
+# decide which pairings to start first.
+_PLAYER_COSTS = {
+    PlayerType.AlphaBeta: 100,
+    PlayerType.MonteCarlo: 200,
+    PlayerType.Defensive: 3,
+}
+
+Pairing = namedtuple(
+    'Pairing', 'player1_type player2_type initial_seeds side_length number_of_games'
+)
+PairingResult = namedtuple('PairingResult', 'pairing wins losses ties')
+
+
+def _pairing_cost(pairing):
+    seeds_in_play = pairing.initial_seeds * pairing.side_length * 2
+    player_cost = _PLAYER_COSTS.get(pairing.player1_type, 1) + _PLAYER_COSTS.get(
+        pairing.player2_type, 1
+    )
+    return pairing.number_of_games * seeds_in_play * player_cost
+
+
+def _play_pairing(pairing, seed):
+    series = Series(
+        initial_seeds=pairing.initial_seeds,
+        number_of_games=pairing.number_of_games,
+        side_length=pairing.side_length,
+        player1=PlayerFactory.create(pairing.player1_type, 'Player 1', wait_time=0),
+        player2=PlayerFactory.create(pairing.player2_type, 'Player 2', wait_time=0),
+        headless=True,
+        seed=seed,
+    )
+    series.run_games()
+
+    return PairingResult(
+        pairing=pairing,
+        wins=series.player1.wins,
+        losses=series.player1.losses,
+        ties=series.player1.ties,
+    )
+
+
+def elo_ratings(results):
+    """
+    Fit Elo ratings to pairing results.
+
+    Rather than updating game by game, which makes the ratings depend on the
+    order games finished in, every pass moves each rating towards the value
+    where its expected score matches its actual score.
+    """
+    ratings = {}
+    for result in results:
+        ratings.setdefault(result.pairing.player1_type, INITIAL_RATING)
+        ratings.setdefault(result.pairing.player2_type, INITIAL_RATING)
+
+    for _ in range(RATING_ITERATIONS):
+        surplus = dict.fromkeys(ratings, 0)
+        games = dict.fromkeys(ratings, 0)
+
+        for result in results:
+            player1 = result.pairing.player1_type
+            player2 = result.pairing.player2_type
+            number_of_games = result.wins + result.losses + result.ties
+
+            expected = 1 / (1 + 10 ** ((ratings[player2] - ratings[player1]) / 400))
+            actual = result.wins + 0.5 * result.ties
+
+            surplus[player1] += actual - expected * number_of_games
+            surplus[player2] -= actual - expected * number_of_games
+            games[player1] += number_of_games
+            games[player2] += number_of_games
+
+        for player_type in ratings:
+            if games[player_type]:
+                ratings[player_type] += (
+                    RATING_STEP * surplus[player_type] / games[player_type]
+                )
+
+    return ratings
+
+
+class Tournament:
+    """
+    Round robin between every registered player type.
+
+    Every pair of player types plays number_of_games games for each
+    combination of initial seeds and side length. Pairings are spread over a
+    worker pool with the most expensive ones started first so a long pairing
+    does not end up running alone at the end.
+    """
+
+    def __init__(
+        self,
+        number_of_games=10,
+        initial_seeds=(3,),
+        side_lengths=(6,),
+        player_types=None,
+        workers=None,
+        seed=0,
+    ):
+        self.number_of_games = number_of_games
+        self.initial_seeds = tuple(initial_seeds)
+        self.side_lengths = tuple(side_lengths)
+        self.workers = workers
+        self.seed = seed
+
+        if player_types is None:
+            player_types = [
+                player_type
+                for player_type in PlayerFactory.all_types()
+                if player_type != PlayerType.Human
+            ]
+        self.player_types = list(player_types)
+
+        self.results = []
+
+    @property
+    def pairings(self):
+        pairings = [
+            Pairing(
+                player1_type=player1_type,
+                player2_type=player2_type,
+                initial_seeds=initial_seeds,
+                side_length=side_length,
+                number_of_games=self.number_of_games,
+            )
+            for (player1_type, player2_type), initial_seeds, side_length in (
+                itertools.product(
+                    itertools.combinations(self.player_types, 2),
+                    self.initial_seeds,
+                    self.side_lengths,
+                )
+            )
+        ]
+        pairings.sort(key=_pairing_cost, reverse=True)
+        return pairings
+
+    def run(self):
+        pairings = self.pairings
+        seeds = [game_seed(self.seed, idx) for idx in range(len(pairings))]
+
+        if self.workers and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(_play_pairing, pairings, seeds))
+        else:
+            results = list(map(_play_pairing, pairings, seeds))
+
+        self.results = sorted(
+            results,
+            key=lambda result: (
+                result.pairing.player1_type.value,
+                result.pairing.player2_type.value,
+                result.pairing.initial_seeds,
+                result.pairing.side_length,
+            ),
+        )
+        return self.results
+
+    def standings(self):
+        ratings = elo_ratings(self.results)
+        records = {
+            player_type: {'wins': 0, 'losses': 0, 'ties': 0} for player_type in ratings
+        }
+
+        for result in self.results:
+            player1 = records[result.pairing.player1_type]
+            player2 = records[result.pairing.player2_type]
+
+            player1['wins'] += result.wins
+            player1['losses'] += result.losses
+            player1['ties'] += result.ties
+            player2['wins'] += result.losses
+            player2['losses'] += result.wins
+            player2['ties'] += result.ties
+
+        standings = []
+        for player_type, rating in sorted(
+            ratings.items(), key=lambda item: item[1], reverse=True
+        ):
+            record = records[player_type]
+            games = record['wins'] + record['losses'] + record['ties']
+            score = (record['wins'] + 0.5 * record['ties']) / games if games else 0
+            standings.append(
+                {
+                    'player': player_type.value,
+                    'rating': round(rating) if math.isfinite(rating) else rating,
+                    'games': games,
+                    **record,
+                    'score': score,
+                }
+            )
+        return standings
+
+    def ratings_table(self):
+        return tabulate(
+            [
+                [
+                    rank,
+                    row['player'],
+                    row['rating'],
+                    row['games'],
+                    row['wins'],
+                    row['losses'],
+                    row['ties'],
+                    f"{row['score']:.1%}",
+                ]
+                for rank, row in enumerate(self.standings(), start=1)
+            ],
+            headers=['#', 'Player', 'Rating', 'Games', 'W', 'L', 'T', 'Score'],
+        )
+
+    def write_results(self, path):
+        data = {
+            'seed': self.seed,
+            'number_of_games': self.number_of_games,
+            'initial_seeds': list(self.initial_seeds),
+            'side_lengths': list(self.side_lengths),
+            'pairings': [
+                {
+                    'player1': result.pairing.player1_type.value,
+                    'player2': result.pairing.player2_type.value,
+                    'initial_seeds': result.pairing.initial_seeds,
+                    'side_length': result.pairing.side_length,
+                    'games': result.pairing.number_of_games,
+                    'player1_wins': result.wins,
+                    'player1_losses': result.losses,
+                    'ties': result.ties,
+                }
+                for result in self.results
+            ],
+            'standings': self.standings(),
+        }
+
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play every registered player type against every other'
+    )
+    parser.add_argument('--games', type=int, default=10, help='Games per pairing')
+    parser.add_argument('--seeds', type=int, nargs='+', default=[3])
+    parser.add_argument('--side-lengths', type=int, nargs='+', default=[6])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='tournament.json')
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        number_of_games=args.games,
+        initial_seeds=args.seeds,
+        side_lengths=args.side_lengths,
+        workers=args.workers,
+        seed=args.seed,
+    )
+
+    try:
+        tournament.run()
+    except KeyboardInterrupt:
+        return
+
+    print(tournament.ratings_table())
+    tournament.write_results(args.output)
+
+
+if __name__ == '__main__':
+    main()
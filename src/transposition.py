@@ -0,0 +1,182 @@
+import functools
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+
+from src.engine import Side
+from src.rng import splitmix64
+
+ZOBRIST_SEED = 0x6D616E63616C61
+DEFAULT_TABLE_BYTES = 64 * 1024 * 1024
+
+_MASK_64 = (1 << 64) - 1
+
+TableEntry = namedtuple('TableEntry', 'depth bound score best_move')
+TableStats = namedtuple(
+    'TableStats',
+    'size probes hits hit_rate collisions stores evictions occupied occupancy',
+)
+
+
+class Bound(IntEnum):
+    Exact = 0
+    Lower = 1
+    Upper = 2
+
+
+class ZobristKeys:
+    """
+    Zobrist keys for every (cup index, seed count) pair of one board size.
+
+    Seed counts are unbounded, so keys are derived from the cup index and seed
+    count with splitmix64 rather than drawn from a shared random stream. That
+    keeps them identical across processes no matter which counts get looked
+    up first. An empty cup always hashes to 0.
+    """
+
+    def __init__(self, number_of_cups, seed=ZOBRIST_SEED):
+        self.number_of_cups = number_of_cups
+        self.seed = seed
+        self.side_key = splitmix64(seed ^ _MASK_64)
+        self._keys = [[0] for _ in range(number_of_cups)]
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def for_cups(cls, number_of_cups):
+        return cls(number_of_cups)
+
+    def cup_key(self, index, seeds):
+        keys = self._keys[index]
+
+        while len(keys) <= seeds:
+            keys.append(splitmix64(self.seed ^ (index << 32) ^ len(keys) ^ (1 << 63)))
+        return keys[seeds]
+
+    def hash_position(self, position):
+        key = self.side_key if position.side_to_move == Side.Player2 else 0
+
+        for index, seeds in enumerate(position.cups):
+            if seeds:
+                key ^= self.cup_key(index, seeds)
+        return key
+
+    def sown_cups_key(self, cups, index, seeds):
+        """
+        XOR of the keys of the cups that sowing seeds from index passes
+        through, at their counts in cups. Applying it before and after the
+        move rehashes just those cups.
+        """
+        number_of_cups = self.number_of_cups
+        touched = min(seeds, number_of_cups - 1)
+
+        key = 0
+        for offset in range(touched + 1):
+            cup = (index + offset) % number_of_cups
+            key ^= self.cup_key(cup, cups[cup])
+        return key
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hash.
+
+    Entries live in parallel typed arrays so the memory footprint is known up
+    front from max_bytes. Each key maps to a single slot. A slot is replaced
+    when it is empty, holds the same position, was written during an earlier
+    search, or holds a shallower result than the incoming one.
+    """
+
+    ENTRY_BYTES = 8 + 2 + 1 + 4 + 4 + 2
+
+    _EMPTY = -1
+
+    def __init__(self, max_bytes=DEFAULT_TABLE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = max(1, max_bytes // self.ENTRY_BYTES)
+
+        self._keys = array('Q', bytes(8 * self.size))
+        self._depths = array('h', [self._EMPTY]) * self.size
+        self._bounds = array('B', bytes(self.size))
+        self._scores = array('i', bytes(4 * self.size))
+        self._best_moves = array('I', bytes(4 * self.size))
+        self._generations = array('H', bytes(2 * self.size))
+
+        self.generation = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0
+        self.stores = 0
+        self.evictions = 0
+        self.occupied = 0
+
+    def new_search(self):
+        """
+        Mark the start of a new search. Entries from earlier searches are
+        still probed but are the first to be replaced.
+        """
+        self.generation = (self.generation + 1) & 0xFFFF
+
+    def clear(self):
+        for idx in range(self.size):
+            self._depths[idx] = self._EMPTY
+        self.generation = 0
+        self._reset_stats()
+
+    def probe(self, key):
+        self.probes += 1
+        slot = key % self.size
+
+        if self._depths[slot] == self._EMPTY:
+            return None
+
+        if self._keys[slot] != key:
+            self.collisions += 1
+            return None
+
+        self.hits += 1
+        best_move = self._best_moves[slot]
+        return TableEntry(
+            depth=self._depths[slot],
+            bound=Bound(self._bounds[slot]),
+            score=self._scores[slot],
+            best_move=best_move if best_move else None,
+        )
+
+    def store(self, key, depth, bound, score, best_move=None):
+        slot = key % self.size
+        stored_depth = self._depths[slot]
+
+        if stored_depth == self._EMPTY:
+            self.occupied += 1
+        elif self._keys[slot] == key:
+            if depth < stored_depth and self._generations[slot] == self.generation:
+                return
+        elif depth >= stored_depth or self._generations[slot] != self.generation:
+            self.evictions += 1
+        else:
+            return
+
+        self.stores += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._bounds[slot] = bound
+        self._scores[slot] = score
+        self._best_moves[slot] = best_move or 0
+        self._generations[slot] = self.generation
+
+    @property
+    def stats(self):
+        return TableStats(
+            size=self.size,
+            probes=self.probes,
+            hits=self.hits,
+            hit_rate=self.hits / self.probes if self.probes else 0,
+            collisions=self.collisions,
+            stores=self.stores,
+            evictions=self.evictions,
+            occupied=self.occupied,
+            occupancy=self.occupied / self.size,
+        )
@@ -2,6 +2,11 @@ alphabet = 'abcdefghijklmnopqrstuvwxyz'
 
 
 def generate_sequence(number_of_items):
+    """
+    The first number_of_items labels, in order: a, b, ..., z, aa, ab, ...,
+    zz, aaa, ... Each label is built from an earlier one, so the whole
+    sequence takes linear time and every label is unique.
+    """
     if number_of_items <= 0:
         raise ValueError(f'number_of_items must be positive. Got {number_of_items}.')
 
@@ -20,3 +25,32 @@ def generate_sequence(number_of_items):
         count += 1
 
     return sequence
+
+
+def write_varint(value, out):
+    """
+    Append value to the bytearray out as an unsigned LEB128 varint: seven
+    bits per byte, low bits first, with the high bit set on every byte but
+    the last.
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """
+    Read the varint starting at offset. Returns the value and the offset just
+    past it. Raises IndexError if data ends in the middle of the number.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.animation import AnimationScheduler, sow_frames
+from src.engine import sow_cups
+
+
+class TestSowFrames:
+    def test_frame_per_seed(self):
+        cups = [0, 4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4]
+        frames = sow_frames(cups, 1)
+
+        assert [frame.indicator_index for frame in frames] == [1, 2, 3, 4, 5]
+        assert frames[0].cups[1] == 0
+        assert cups[1] == 4
+
+    def test_full_laps_compressed(self):
+        cups = [0, 4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4]
+        cups[3] = 100
+        frames = sow_frames(cups, 3)
+
+        # Emptied cup, seven full laps, then two single seeds
+        assert len(frames) == 1 + 7 + 2
+        assert [frame.indicator_index for frame in frames[1:8]] == [3] * 7
+
+        sow_cups(cups, 3)
+        assert list(frames[-1].cups) == cups
+        assert frames[-1].indicator_index == 5
+
+
+class TestAnimationScheduler:
+    def test_draws_every_frame(self):
+        drawn = []
+        scheduler = AnimationScheduler(0.02, skip_on_keypress=False)
+
+        scheduler.play(list(range(5)), drawn.append)
+
+        assert drawn == [0, 1, 2, 3, 4]
+        assert scheduler.frames_dropped == 0
+
+    def test_total_duration_capped(self):
+        drawn = []
+        scheduler = AnimationScheduler(1, max_duration=0.05, skip_on_keypress=False)
+
+        start = time.monotonic()
+        scheduler.play(list(range(10)), drawn.append)
+
+        assert time.monotonic() - start < 0.5
+        assert drawn[-1] == 9
+
+    def test_drops_frames_when_behind(self):
+        drawn = []
+
+        def slow_render(frame):
+            drawn.append(frame)
+            time.sleep(0.03)
+
+        scheduler = AnimationScheduler(0.01, max_duration=None, skip_on_keypress=False)
+        scheduler.play(list(range(10)), slow_render)
+
+        assert scheduler.frames_dropped > 0
+        assert scheduler.frames_drawn + scheduler.frames_dropped == 10
+        assert drawn[-1] == 9
+
+    @pytest.mark.skipif(not hasattr(os, 'openpty'), reason='needs a pty')
+    def test_keypress_skips_to_end(self):
+        master, slave = os.openpty()
+        stream = os.fdopen(slave)
+        try:
+            threading.Timer(0.05, os.write, args=(master, b' ')).start()
+
+            drawn = []
+            scheduler = AnimationScheduler(1, input_stream=stream)
+            start = time.monotonic()
+            scheduler.play(list(range(10)), drawn.append)
+
+            assert time.monotonic() - start < 0.5
+            assert scheduler.skipped
+            assert drawn == [0, 9]
+        finally:
+            stream.close()
+            os.close(master)
@@ -0,0 +1,171 @@
+import random
+
+import pytest
+
+from src.engine import Engine, Side
+from src.player import PlayerType
+
+np = pytest.importorskip('numpy')
+
+from src.batch import (  # noqa: E402
+    BatchEngine,
+    BatchSeries,
+    improved_random_moves,
+    random_moves,
+)
+
+
+class TestBatchEngine:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = BatchEngine(4, side_length=6, initial_seeds=4)
+
+    def test_initial_cups(self):
+        assert self.engine.cups[0].tolist() == [
+            0,
+            4,
+            4,
+            4,
+            4,
+            4,
+            4,
+            0,
+            4,
+            4,
+            4,
+            4,
+            4,
+            4,
+        ]
+        assert not self.engine.finished.any()
+
+    def test_apply_moves(self):
+        last = self.engine.apply_moves(np.array([4, 10, 6, 1]))
+
+        assert last.tolist() == [8, 0, 10, 5]
+        assert self.engine.cups[0].tolist() == [
+            0,
+            4,
+            4,
+            4,
+            0,
+            5,
+            5,
+            1,
+            5,
+            4,
+            4,
+            4,
+            4,
+            4,
+        ]
+        assert self.engine.side_to_move.tolist() == [
+            Side.Player2,
+            Side.Player1,
+            Side.Player2,
+            Side.Player2,
+        ]
+
+    def test_full_laps(self):
+        self.engine.cups[0, 3] = 31
+
+        self.engine.apply_moves(np.array([3, 1, 1, 1]))
+
+        # Two full laps of 14 cups plus three more seeds
+        assert self.engine.cups[0].tolist() == [
+            2,
+            6,
+            6,
+            2,
+            7,
+            7,
+            7,
+            2,
+            6,
+            6,
+            6,
+            6,
+            6,
+            6,
+        ]
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_engine(self, seed):
+        rand = random.Random(seed)
+        engine = Engine(6)
+        engine.initialize_cups(4)
+        batch = BatchEngine(1, side_length=6, initial_seeds=4)
+        side = Side.Player1
+
+        while not engine.done():
+            index = rand.choice(engine.legal_moves())
+            side = engine.next_side(side, engine.sow_index(index))
+            batch.apply_moves(np.array([index]))
+
+            assert batch.cups[0].tolist() == engine.cups
+            assert batch.side_to_move[0] == side
+
+        assert batch.finished.all()
+
+    def test_drop_finished(self):
+        self.engine.cups[1:3] = 0
+        self.engine.cups[1, 0] = 30
+        self.engine.cups[2, 7] = 30
+        self.engine.finished = self.engine.done()
+
+        game_ids, winners = self.engine.drop_finished()
+
+        assert game_ids.tolist() == [1, 2]
+        assert winners.tolist() == [Side.Player1, Side.Player2]
+        assert self.engine.game_ids.tolist() == [0, 3]
+        assert self.engine.cups.shape == (2, 14)
+
+
+class TestBatchPolicies:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = BatchEngine(2, side_length=6, initial_seeds=0)
+        self.rng = np.random.default_rng(0)
+
+    def test_random_moves_are_legal(self):
+        self.engine.cups[0, 5] = 1
+        self.engine.cups[1, 9] = 2
+
+        assert random_moves(self.engine, self.rng).tolist() == [5, 9]
+
+    def test_improved_random_prefers_free_play(self):
+        """
+        Player1's store is at index 0, so cup 13 with one seed and cup 12
+        with two seeds are both free plays; the one with fewer seeds wins.
+        """
+        self.engine.cups[:, 13] = 1
+        self.engine.cups[:, 12] = 2
+        self.engine.cups[:, 3] = 5
+
+        assert improved_random_moves(self.engine, self.rng).tolist() == [13, 13]
+
+
+class TestBatchSeries:
+    def test_run_games(self):
+        series = BatchSeries(
+            PlayerType.ImprovedRandom, PlayerType.Random, number_of_games=200, seed=1
+        )
+        series.run_games()
+
+        assert series.wins + series.losses + series.ties == 200
+        assert series.wins > series.losses
+
+    def test_seeded_runs_repeat(self):
+        results = []
+        for _ in range(2):
+            series = BatchSeries(
+                PlayerType.Random, PlayerType.Random, number_of_games=50, seed=3
+            )
+            series.run_games()
+            results.append((series.wins, series.losses, series.ties))
+
+        assert results[0] == results[1]
+
+    def test_unsupported_policy(self):
+        with pytest.raises(KeyError):
+            BatchSeries(PlayerType.Defensive, PlayerType.Random)
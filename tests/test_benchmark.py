@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+from src.benchmark import (
+    benchmarks,
+    compare,
+    environment_differences,
+    main,
+    measure,
+    run,
+)
+
+
+def _results(**seconds):
+    return {
+        'benchmarks': {
+            name: {'seconds_per_op': value, 'number': 1, 'repeat': 1}
+            for name, value in seconds.items()
+        }
+    }
+
+
+class TestBenchmarks:
+    def test_every_benchmark_runs(self):
+        for name, function in benchmarks().items():
+            function()
+
+    def test_measure(self):
+        result = measure(lambda: None, min_time=0.001, repeat=2)
+
+        assert result['seconds_per_op'] > 0
+        assert result['number'] >= 1
+        assert result['repeat'] == 2
+
+    def test_run_filters_by_name(self):
+        results = run(['generate_sequence'], min_time=0.001, repeat=1)
+
+        assert list(results['benchmarks']) == ['generate_sequence[1000]']
+        assert results['python']
+
+
+class TestCompare:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.baseline = _results(sow=1.0, search=2.0, removed=1.0)
+
+    def test_within_threshold(self):
+        current = _results(sow=1.2, search=1.0)
+
+        comparisons = compare(self.baseline, current, threshold=0.25)
+
+        assert [comparison.name for comparison in comparisons] == ['sow', 'search']
+        assert not any(comparison.regressed for comparison in comparisons)
+
+    def test_regression(self):
+        current = _results(sow=1.3, search=2.0)
+
+        comparisons = compare(self.baseline, current, threshold=0.25)
+
+        assert [comparison.regressed for comparison in comparisons] == [True, False]
+        assert comparisons[0].ratio == pytest.approx(1.3)
+
+    def test_new_benchmarks_skipped(self):
+        current = _results(added=5.0)
+
+        assert compare(self.baseline, current) == []
+
+
+class TestEnvironmentDifferences:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.baseline = {
+            'python': '3.8.18',
+            'implementation': 'CPython',
+            'machine': 'x86_64',
+        }
+
+    def test_same_minor_version(self):
+        current = dict(self.baseline, python='3.8.20')
+
+        assert environment_differences(self.baseline, current) == []
+
+    def test_different_python(self):
+        current = dict(self.baseline, python='3.11.7')
+
+        assert environment_differences(self.baseline, current) == [
+            ('python', '3.8.18', '3.11.7')
+        ]
+
+    def test_different_machine(self):
+        current = dict(self.baseline, machine='arm64')
+
+        assert environment_differences(self.baseline, current) == [
+            ('machine', 'x86_64', 'arm64')
+        ]
+
+
+class TestMain:
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmp_path):
+        self.baseline = tmp_path / 'baseline.json'
+        self.args = [
+            'generate_sequence',
+            '--baseline',
+            str(self.baseline),
+            '--output',
+            str(tmp_path / 'current.json'),
+            '--min-time',
+            '0.001',
+            '--repeat',
+            '1',
+        ]
+
+    def test_missing_baseline_fails(self):
+        with pytest.raises(SystemExit) as exc_info:
+            main(self.args)
+
+        assert exc_info.value.code == 1
+
+    def test_compares_with_saved_baseline(self):
+        main(self.args + ['--save-baseline'])
+
+        main(self.args + ['--threshold', '100'])
+
+    def test_other_environment_fails(self):
+        main(self.args + ['--save-baseline'])
+        results = json.loads(self.baseline.read_text())
+        results['python'] = '2.7.18'
+        self.baseline.write_text(json.dumps(results))
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(self.args + ['--threshold', '100'])
+
+        assert exc_info.value.code == 1
@@ -54,12 +54,12 @@ class TestBuildIndexDicts:
         }
         assert expected_index_to_cup == board._index_to_cup
 
-        assert board.top_row_indices == [1, 2, 3, 4, 5, 6, 7]
-        assert board.top_row_cups == ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+        assert board.top_row_indices == (1, 2, 3, 4, 5, 6, 7)
+        assert board.top_row_cups == ('a', 'b', 'c', 'd', 'e', 'f', 'g')
         assert board.top_row == [0, 0, 0, 0, 0, 0, 0]
 
-        assert board.bottom_row_indices == [9, 10, 11, 12, 13, 14, 15]
-        assert board.bottom_row_cups == ['h', 'i', 'j', 'k', 'l', 'm', 'n']
+        assert board.bottom_row_indices == (9, 10, 11, 12, 13, 14, 15)
+        assert board.bottom_row_cups == ('h', 'i', 'j', 'k', 'l', 'm', 'n')
         assert board.bottom_row == [0, 0, 0, 0, 0, 0, 0]
 
     def test_six_cups(self):
@@ -103,15 +103,15 @@ class TestBuildIndexDicts:
         }
         assert expected_index_to_cup == board._index_to_cup
 
-        assert board.top_row_indices == [1, 2, 3, 4, 5, 6]
-        assert board.top_row_cups == [
+        assert board.top_row_indices == (1, 2, 3, 4, 5, 6)
+        assert board.top_row_cups == (
             'a',
             'b',
             'c',
             'd',
             'e',
             'f',
-        ]
+        )
 
         assert board.top_row == [
             0,
@@ -122,22 +122,22 @@ class TestBuildIndexDicts:
             0,
         ]
 
-        assert board.bottom_row_indices == [
+        assert board.bottom_row_indices == (
             8,
             9,
             10,
             11,
             12,
             13,
-        ]
-        assert board.bottom_row_cups == [
+        )
+        assert board.bottom_row_cups == (
             'g',
             'h',
             'i',
             'j',
             'k',
             'l',
-        ]
+        )
         assert board.bottom_row == [0, 0, 0, 0, 0, 0]
 
 
@@ -340,3 +340,88 @@ class TestDone:
         self.board.cups[self.board.player_2_cup_index] = 15
 
         assert self.board.done()
+
+
+class TestDisplayCups:
+    @pytest.fixture(autouse=True)
+    def setUp(self, player_factory):
+        self.board = Board(
+            6,
+            player1=player_factory(color=None),
+            player2=player_factory(color=None),
+            animation_wait=0,
+        )
+        self.board.initialize_cups(4)
+
+    def test_only_changed_cells_written(self, capsys):
+        self.board.display_cups()
+        first = capsys.readouterr().out
+
+        self.board.cups[1] = 7
+        self.board.display_cups()
+        second = capsys.readouterr().out
+
+        assert second.endswith('7')
+        assert 'a' not in second
+        assert len(second) < len(first)
+
+    def test_sow_writes_once_without_animation(self, mocker, capsys):
+        self.board.display_cups()
+        capsys.readouterr()
+
+        flush = mocker.spy(self.board.renderer, 'flush')
+        self.board.sow('a')
+
+        assert flush.call_count == 1
+
+
+class TestWindowedDisplay:
+    @pytest.fixture(autouse=True)
+    def setUp(self, player_factory, mocker):
+        self.board = Board(
+            40,
+            player1=player_factory(color=None),
+            player2=player_factory(color=None),
+            animation_wait=0,
+        )
+        self.board.initialize_cups(4)
+        mocker.patch.object(
+            type(self.board.term), 'width', new_callable=mocker.PropertyMock
+        ).return_value = 80
+
+        self.drawn = {}
+        mocker.patch.object(
+            self.board.renderer,
+            'flush',
+            side_effect=lambda: self.drawn.update(self.board.renderer._current),
+        )
+
+    def _labels(self):
+        return {text for text, color in self.drawn.values() if text.isalpha()}
+
+    def test_only_visible_columns_drawn(self):
+        assert self.board.visible_columns == 15
+
+        self.board.display_cups()
+
+        assert max(column for row, column in self.drawn) < 80
+        assert self.board.max_column < 80
+        assert 'a' in self._labels()
+        assert 'o' in self._labels()
+        assert 'p' not in self._labels()
+
+    def test_window_follows_indicator(self):
+        index = self.board.cup_to_index['ad']
+        self.board.display_cups(indicator_index=index)
+
+        labels = self._labels()
+        assert 'ad' in labels
+        assert 'a' not in labels
+        assert max(column for row, column in self.drawn) < 80
+
+    def test_stores_always_drawn(self):
+        self.board.cups[self.board.player_2_cup_index] = 123
+        self.board.display_cups(indicator_index=self.board.player_2_cup_index)
+
+        assert ('123', None) in self.drawn.values()
+        assert ('<', None) in self.drawn.values()
@@ -0,0 +1,143 @@
+import pickle
+
+import pytest
+
+from src.book import (
+    BookError,
+    BookTable,
+    OpeningBook,
+    book_filename,
+    build_book,
+    opening_positions,
+    starting_position,
+)
+from src.engine import Side
+from src.game import Game
+from src.player import AlphaBetaPlayer, DefensivePlayer, RandomPlayer
+
+SIDE_LENGTH = 3
+INITIAL_SEEDS = 2
+
+
+@pytest.fixture(scope='module')
+def book_directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('books')
+    table = build_book(SIDE_LENGTH, INITIAL_SEEDS, plies=2, depth=3)
+    table.write(directory / book_filename(SIDE_LENGTH, INITIAL_SEEDS))
+    return directory
+
+
+class TestBookTable:
+    @pytest.fixture(autouse=True)
+    def setUp(self, book_directory):
+        self.path = book_directory / book_filename(SIDE_LENGTH, INITIAL_SEEDS)
+        self.table = BookTable.load(self.path)
+
+    def test_covers_opening_positions(self):
+        positions = opening_positions(SIDE_LENGTH, INITIAL_SEEDS, 2)
+
+        assert len(self.table) == len(positions)
+        for position in positions:
+            assert position.cups[self.table.move(position)]
+
+    def test_matches_search(self):
+        position = starting_position(SIDE_LENGTH, INITIAL_SEEDS)
+        searcher = AlphaBetaPlayer('Searcher', wait_time=0, depth=3)
+
+        assert self.table.move(position) == searcher._search(position)
+
+    def test_unknown_position(self):
+        position = starting_position(SIDE_LENGTH, INITIAL_SEEDS + 1)
+        assert self.table.move(position) is None
+
+        position = starting_position(SIDE_LENGTH + 1, INITIAL_SEEDS)
+        assert self.table.move(position) is None
+
+    def test_write_round_trip(self, tmp_path):
+        path = tmp_path / 'copy.bin'
+        self.table.write(path)
+
+        assert path.read_bytes() == self.path.read_bytes()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'not-a-book.bin'
+        path.write_bytes(b'not a book')
+
+        with pytest.raises(BookError):
+            BookTable.load(path)
+
+    def test_rejects_truncated_files(self, tmp_path):
+        path = tmp_path / 'truncated.bin'
+        path.write_bytes(self.path.read_bytes()[:-1])
+
+        with pytest.raises(BookError):
+            BookTable.load(path)
+
+
+class TestOpeningBook:
+    @pytest.fixture(autouse=True)
+    def setUp(self, book_directory):
+        self.book = OpeningBook(book_directory)
+
+    def test_loads_lazily(self):
+        assert self.book._tables == {}
+
+        position = starting_position(SIDE_LENGTH, INITIAL_SEEDS)
+        assert self.book.move(position, INITIAL_SEEDS) is not None
+        assert list(self.book._tables) == [(SIDE_LENGTH, INITIAL_SEEDS)]
+
+    def test_missing_configuration(self):
+        position = starting_position(SIDE_LENGTH, INITIAL_SEEDS + 1)
+
+        assert self.book.move(position, INITIAL_SEEDS + 1) is None
+        assert self.book.move(position, None) is None
+
+    def test_pickle_drops_loaded_tables(self):
+        self.book.table(SIDE_LENGTH, INITIAL_SEEDS)
+
+        copy = pickle.loads(pickle.dumps(self.book))
+        assert copy.directory == self.book.directory
+        assert copy._tables == {}
+
+
+class TestPlayersUseBook:
+    @pytest.fixture(autouse=True)
+    def setUp(self, book_directory):
+        self.book = OpeningBook(book_directory)
+        self.expected = BookTable.load(
+            book_directory / book_filename(SIDE_LENGTH, INITIAL_SEEDS)
+        ).move(starting_position(SIDE_LENGTH, INITIAL_SEEDS))
+
+    def _game(self, player1):
+        return Game(
+            player1=player1,
+            player2=RandomPlayer('Player2', wait_time=0),
+            side_length=SIDE_LENGTH,
+            initial_seeds=INITIAL_SEEDS,
+            headless=True,
+        )
+
+    def test_defensive_player(self, mocker):
+        player = DefensivePlayer('Player1', wait_time=0, opening_book=self.book)
+        game = self._game(player)
+        free_play_moves = mocker.spy(player, '_free_play_moves')
+
+        assert player.side == Side.Player1
+        assert player.take_turn() == game.board.index_to_cup[self.expected]
+        assert free_play_moves.call_count == 0
+
+    def test_alpha_beta_skips_search(self, mocker):
+        player = AlphaBetaPlayer('Player1', wait_time=0, opening_book=self.book)
+        game = self._game(player)
+        search = mocker.spy(player, '_search')
+
+        assert player.take_turn() == game.board.index_to_cup[self.expected]
+        assert search.call_count == 0
+
+    def test_without_book(self, mocker):
+        player = AlphaBetaPlayer('Player1', wait_time=0, depth=2)
+        self._game(player)
+        search = mocker.spy(player, '_search')
+
+        player.take_turn()
+        assert search.call_count == 1
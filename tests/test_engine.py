@@ -0,0 +1,380 @@
+import pickle
+import random
+
+import pytest
+
+from src.engine import (
+    Engine,
+    MutablePosition,
+    Position,
+    Side,
+    sow_cups,
+)
+from src.player import Player
+
+
+class TestSowIndex:
+    """
+    Indexes and their associated letters:
+
+        a   b   c   d   e   f
+        1   2   3   4   5   6
+    0                            7
+        13  12  11  10  9   8
+        g   h   i   j   k   l
+    """
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+        self.engine.initialize_cups(4)
+
+    def test_sow_index(self):
+        last_index = self.engine.sow_index(4)
+
+        assert last_index == 8
+        assert self.engine.cups == [0, 4, 4, 4, 0, 5, 5, 1, 5, 4, 4, 4, 4, 4]
+
+    def test_legal_moves(self):
+        self.engine.cups[3] = 0
+        self.engine.cups[9] = 0
+
+        assert self.engine.legal_moves() == [1, 2, 4, 5, 6, 8, 10, 11, 12, 13]
+
+
+class TestReset:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.player1 = Player('Player1')
+        self.player2 = Player('Player2')
+        self.engine = Engine(6, player1=self.player1, player2=self.player2)
+        self.engine.initialize_cups(4)
+        self.engine.sow_index(4)
+        self.engine.sow_index(8)
+
+    def test_keeps_seeds_and_seats(self):
+        cups = self.engine.cups
+        self.engine.reset()
+
+        assert self.engine.cups is cups
+        assert cups == [0, 4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4]
+        assert cups.seeds_in_play == 48
+        assert self.engine.players == [self.player1, self.player2]
+
+    def test_new_seeds(self):
+        self.engine.reset(initial_seeds=2)
+
+        assert self.engine.initial_seeds == 2
+        assert self.engine.cups == [0, 2, 2, 2, 2, 2, 2, 0, 2, 2, 2, 2, 2, 2]
+
+    def test_swap_seats(self):
+        self.engine.reset(player1=self.player2, player2=self.player1)
+
+        assert self.engine.player1 is self.player2
+        assert self.engine.player2 is self.player1
+        assert self.player1.board is self.engine
+
+    def test_needs_both_players(self):
+        with pytest.raises(ValueError):
+            self.engine.reset(player1=self.player2)
+
+
+class TestMutablePosition:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.position = Position([0, 4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4])
+        self.board = MutablePosition.from_position(self.position, depth=2)
+
+    def test_make_move_matches_apply_move(self):
+        self.board.make_move(4)
+        assert self.board.to_position() == self.position.apply_move(4)
+
+    def test_make_move_extra_turn(self):
+        self.board.make_move(10)
+        assert self.board.side_to_move == Side.Player1
+
+    def test_sow_index_keeps_side_to_move(self):
+        self.board.sow_index(4)
+        assert self.board.side_to_move == Side.Player1
+
+        assert self.board.unsow() == Side.Player1
+        assert self.board.to_position() == self.position
+
+    def test_unmake_restores_position(self):
+        self.board.make_move(4)
+        self.board.unmake_move()
+
+        assert self.board.to_position() == self.position
+        assert len(self.board) == 0
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_random_lines_unwind(self, seed):
+        rand = random.Random(seed)
+        cups = [rand.randint(0, 40) for _ in range(14)]
+        position = Position(cups, rand.choice(list(Side)))
+        board = MutablePosition.from_position(position, depth=1)
+
+        # Deeper than the preallocated stack, with laps around the board
+        expected = [position]
+        for _ in range(30):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            index = rand.choice(moves)
+            board.make_move(index)
+            expected.append(expected[-1].apply_move(index))
+            assert board.to_position() == expected[-1]
+
+        while len(board):
+            expected.pop()
+            board.unmake_move()
+            assert board.to_position() == expected[-1]
+
+    def test_queries_match_position(self):
+        self.board.make_move(9)
+        position = self.board.to_position()
+
+        assert self.board.legal_moves() == position.legal_moves()
+        assert self.board.store_difference() == position.store_difference()
+        assert self.board.store_index(Side.Player2) == position.store_index(
+            Side.Player2
+        )
+
+    def test_nothing_to_unmake(self):
+        with pytest.raises(IndexError):
+            self.board.unmake_move()
+
+
+class TestEngineMakeMove:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+        self.engine.initialize_cups(4)
+
+    def test_make_and_unmake(self):
+        before = list(self.engine.cups)
+
+        self.engine.make_move(4)
+        self.engine.make_move(9)
+        self.engine.unmake_move()
+        self.engine.unmake_move()
+
+        assert self.engine.cups == before
+        assert self.engine.cups.seeds_in_play == 48
+
+    def test_aggregates_kept(self):
+        self.engine.make_move(4)
+        expected = Engine(6)
+        expected.initialize_cups(4)
+        expected.sow_index(4)
+
+        assert self.engine.cups == expected.cups
+        assert self.engine.cups.seeds_in_play == expected.cups.seeds_in_play
+        assert self.engine.cups.landing_in_store == expected.cups.landing_in_store
+
+    def test_undo_stack_created_on_first_move(self):
+        assert self.engine._moves is None
+
+        self.engine.make_move(4)
+
+        assert len(self.engine._moves) == 1
+
+    def test_load_position_forgets_moves(self):
+        self.engine.make_move(4)
+        self.engine.load_position(Position([0] + [4] * 6 + [0] + [4] * 6))
+
+        with pytest.raises(IndexError):
+            self.engine.unmake_move()
+
+
+class TestNextSide:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+
+    @pytest.mark.parametrize('side', [Side.Player1, Side.Player2])
+    def test_extra_turn(self, side):
+        assert self.engine.next_side(side, self.engine.store_index(side)) == side
+
+    @pytest.mark.parametrize('side', [Side.Player1, Side.Player2])
+    def test_no_extra_turn(self, side):
+        assert self.engine.next_side(side, 5) == side.opponent
+
+
+class TestWinner:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+
+    @pytest.mark.parametrize(
+        'player_1_seeds,player_2_seeds,expected',
+        [(10, 5, Side.Player1), (5, 10, Side.Player2), (7, 7, None)],
+    )
+    def test_winner(self, player_1_seeds, player_2_seeds, expected):
+        self.engine.cups[self.engine.player_1_cup_index] = player_1_seeds
+        self.engine.cups[self.engine.player_2_cup_index] = player_2_seeds
+
+        assert self.engine.winner() == expected
+
+
+class TestPosition:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+        self.engine.initialize_cups(4)
+        self.position = self.engine.to_position(Side.Player1)
+
+    def test_hashable(self):
+        assert self.position == self.engine.to_position(Side.Player1)
+        assert hash(self.position) == hash(self.engine.to_position(Side.Player1))
+        assert self.position != self.engine.to_position(Side.Player2)
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            self.position.cups = ()
+
+    def test_apply_move_returns_new_position(self):
+        child = self.position.apply_move(4)
+
+        assert child.cups == (0, 4, 4, 4, 0, 5, 5, 1, 5, 4, 4, 4, 4, 4)
+        assert child.side_to_move == Side.Player2
+        assert self.position.cups == tuple(self.engine.cups)
+
+    def test_apply_move_extra_turn(self):
+        child = self.position.apply_move(10)
+
+        assert child.side_to_move == Side.Player1
+
+    def test_pack_round_trip(self):
+        assert Position.unpack(self.position.pack()) == self.position
+
+    def test_pack_large_counts(self):
+        position = Position([70000, 1, 128, 0, 2**40, 3], Side.Player2)
+
+        assert Position.unpack(position.pack()) == position
+
+    def test_pack_small_counts_one_byte_each(self):
+        assert len(self.position.pack()) == 1 + len(self.position.cups)
+
+    def test_load_position(self):
+        child = self.position.apply_move(4)
+        self.engine.load_position(child)
+
+        assert tuple(self.engine.cups) == child.cups
+
+
+def _naive_sow(cups, index):
+    seeds = cups[index]
+    cups[index] = 0
+
+    while seeds:
+        index += 1
+        cups[index % len(cups)] += 1
+        seeds -= 1
+
+    return index % len(cups)
+
+
+class TestSowCups:
+    @pytest.mark.parametrize('index', [1, 6, 8, 13])
+    @pytest.mark.parametrize('seeds', [1, 5, 13, 14, 15, 27, 28, 100, 1000])
+    def test_matches_seed_by_seed_sow(self, index, seeds):
+        cups = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
+        cups[index] = seeds
+        expected = list(cups)
+
+        assert sow_cups(cups, index) == _naive_sow(expected, index)
+        assert cups == expected
+
+
+class TestLandingIndex:
+    def test_wraps_around(self):
+        engine = Engine(6)
+
+        assert engine.landing_index(1, 5) == 6
+        assert engine.landing_index(13, 1) == 0
+        assert engine.landing_index(6, 13) == 5
+
+    @pytest.mark.parametrize('seeds', [1, 13, 14, 29])
+    def test_landing_index(self, seeds):
+        engine = Engine(6)
+        engine.cups[10] = seeds
+
+        assert engine.landing_index(10, seeds) == engine.sow_index(10)
+
+
+class TestCupsAggregates:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+        self.engine.initialize_cups(4)
+
+    def _assert_aggregates_match(self):
+        cups = self.engine.cups
+        playable = [
+            index for index in range(len(cups)) if index not in (0, len(cups) // 2)
+        ]
+
+        assert cups.seeds_in_play == sum(cups[index] for index in playable)
+        assert self.engine.legal_moves() == [index for index in playable if cups[index]]
+        for side in Side:
+            assert self.engine.free_play_moves(side) == [
+                index
+                for index in playable
+                if cups[index]
+                and self.engine.landing_index(index, cups[index])
+                == self.engine.store_index(side)
+            ]
+
+    def test_initial(self):
+        assert self.engine.cups.seeds_in_play == 48
+        assert self.engine.free_play_moves(Side.Player1) == [10]
+        assert self.engine.free_play_moves(Side.Player2) == [3]
+        self._assert_aggregates_match()
+
+    def test_direct_writes(self):
+        self.engine.cups[3] = 0
+        self.engine.cups[-1] = 1
+
+        assert 3 not in self.engine.legal_moves()
+        assert self.engine.free_play_moves(Side.Player1) == [10, 13]
+        self._assert_aggregates_match()
+
+    def test_slice_writes(self):
+        self.engine.cups[:] = [0, 1, 0, 0, 0, 0, 1, 5, 0, 0, 0, 0, 0, 0]
+
+        assert self.engine.legal_moves() == [1, 6]
+        self._assert_aggregates_match()
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_through_a_game(self, seed):
+        rand = random.Random(seed)
+
+        while not self.engine.done():
+            self.engine.sow_index(rand.choice(self.engine.legal_moves()))
+            self._assert_aggregates_match()
+
+        assert self.engine.cups.seeds_in_play == 0
+
+    def test_legal_cups_in_label_order(self):
+        self.engine.cups[2] = 0
+        self.engine.cups[12] = 0
+
+        assert self.engine.legal_cups() == [
+            'a',
+            'c',
+            'd',
+            'e',
+            'f',
+            'g',
+            'i',
+            'j',
+            'k',
+            'l',
+        ]
+
+    def test_pickle(self):
+        cups = pickle.loads(pickle.dumps(self.engine.cups))
+
+        assert cups == self.engine.cups
+        assert cups.seeds_in_play == 48
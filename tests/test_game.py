@@ -43,3 +43,73 @@ class TestFullGame:
 
     def test_full_game(self):
         self.game.run()
+
+
+class TestHeadlessGame:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.player1 = RandomPlayer('Player1')
+        self.player2 = RandomPlayer('Player2')
+        self.game = Game(
+            player1=self.player1,
+            player2=self.player2,
+            initial_seeds=3,
+            headless=True,
+        )
+
+    def test_board_does_not_render(self):
+        assert not self.game.board.renders
+
+    def test_full_game_without_output(self, capsys):
+        self.game.run()
+
+        assert capsys.readouterr().out == ''
+        assert self.player1.games_played == 1
+        assert self.player2.games_played == 1
+
+
+class TestReset:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.player1 = RandomPlayer('Player1', wait_time=0)
+        self.player2 = RandomPlayer('Player2', wait_time=0)
+        self.game = Game(
+            player1=self.player1,
+            player2=self.player2,
+            initial_seeds=3,
+            headless=True,
+        )
+        self.board = self.game.board
+        self.cups = self.board.cups
+        self.game.run()
+
+    def test_starting_position(self):
+        self.game.reset()
+
+        assert self.game.board is self.board
+        assert self.board.cups is self.cups
+        assert self.cups == [0, 3, 3, 3, 3, 3, 3, 0, 3, 3, 3, 3, 3, 3]
+        assert self.cups.seeds_in_play == 36
+        assert self.game.moves == []
+
+    def test_same_seats(self):
+        self.game.reset()
+
+        assert self.game.current_player is self.player1
+        assert self.board.player1 is self.player1
+        assert self.player2.board is self.board
+
+    def test_swap_seats(self):
+        self.game.reset(swap_seats=True)
+
+        assert self.game.player1 is self.player2
+        assert self.game.current_player is self.player2
+        assert self.board.player1 is self.player2
+        assert self.board.player2 is self.player1
+
+    def test_play_again(self):
+        self.game.reset(swap_seats=True)
+        self.game.run()
+
+        assert self.player1.games_played == 2
+        assert self.player2.games_played == 2
@@ -0,0 +1,108 @@
+import pickle
+
+import pytest
+
+from src.engine import Engine, Side
+from src.geometry import BoardGeometry, board_geometry
+
+
+class TestBoardGeometry:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.geometry = board_geometry(7)
+
+    def test_shared_per_side_length(self):
+        assert board_geometry(7) is self.geometry
+        assert board_geometry(6) is not self.geometry
+
+    def test_engines_share_geometry(self):
+        assert Engine(7).geometry is Engine(7).geometry
+        assert Engine(7).cup_to_index is Engine(7).cup_to_index
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            self.geometry.midpoint = 3
+
+        with pytest.raises(TypeError):
+            self.geometry.cup_to_index['a'] = 2
+
+    def test_rows_and_stores(self):
+        assert self.geometry.number_of_cups == 16
+        assert self.geometry.store_indices == (0, 8)
+        assert self.geometry.top_row_indices == (1, 2, 3, 4, 5, 6, 7)
+        assert self.geometry.bottom_row_indices == (9, 10, 11, 12, 13, 14, 15)
+        assert self.geometry.label_order == (
+            1,
+            2,
+            3,
+            4,
+            5,
+            6,
+            7,
+            15,
+            14,
+            13,
+            12,
+            11,
+            10,
+            9,
+        )
+
+    def test_locations_line_up(self):
+        for idx in self.geometry.top_row_indices:
+            value = self.geometry.value_locations[idx]
+            label = self.geometry.label_locations[idx]
+            indicator = self.geometry.indicators[idx]
+            assert value[1] == label[1] == indicator.location[1]
+            assert indicator.location[0] < label[0] < value[0]
+
+        for idx in self.geometry.bottom_row_indices:
+            value = self.geometry.value_locations[idx]
+            label = self.geometry.label_locations[idx]
+            indicator = self.geometry.indicators[idx]
+            assert value[1] == label[1] == indicator.location[1]
+            assert value[0] < label[0] < indicator.location[0]
+
+        # The bottom row is drawn right to left
+        assert (
+            self.geometry.value_locations[15][1] == self.geometry.value_locations[1][1]
+        )
+
+        player_1_store = self.geometry.value_locations[
+            self.geometry.store_indices[Side.Player1]
+        ]
+        assert self.geometry.indicators[0].location[1] < player_1_store[1]
+        assert self.geometry.max_column == self.geometry.indicators[8].location[1]
+
+    def test_pickle_returns_shared_instance(self):
+        assert pickle.loads(pickle.dumps(self.geometry)) is self.geometry
+
+    def test_invalid_side_length(self):
+        with pytest.raises(ValueError):
+            BoardGeometry(0)
+
+
+class TestLargeBoards:
+    def test_labels_are_unique_and_round_trip(self):
+        geometry = board_geometry(5000)
+
+        assert len(geometry.cup_to_index) == 10000
+        for label, idx in geometry.cup_to_index.items():
+            assert geometry.index_to_cup[idx] == label
+
+    def test_window_indices(self):
+        geometry = board_geometry(10)
+
+        assert geometry.window_indices(0, 10) is geometry.label_order
+        assert geometry.window_indices(2, 3) == (3, 4, 5, 19, 18, 17)
+        assert all(
+            geometry.row_positions[idx] in (2, 3, 4)
+            for idx in geometry.window_indices(2, 3)
+        )
+
+    def test_columns_that_fit(self):
+        geometry = board_geometry(100)
+
+        assert geometry.columns_that_fit(80) == 15
+        assert geometry.columns_that_fit(10) == 1
+        assert board_geometry(6).columns_that_fit(80) == 6
@@ -0,0 +1,222 @@
+import pytest
+
+from src.engine import Engine, Side
+from src.game import Game
+from src.metrics import (
+    DECISION,
+    EXTRA_TURNS,
+    INVALID_CUP_RETRIES,
+    RENDER,
+    SEEDS_MOVED,
+    SOW,
+    Histogram,
+    Metrics,
+)
+from src.player import ImprovedRandomPlayer, Player, RandomPlayer
+
+
+class InvalidThenValidPlayer(Player):
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self.turns = 0
+
+    def take_turn(self):
+        self.turns += 1
+        if self.turns == 1:
+            return 'not a cup'
+        return self.board.legal_cups()[0]
+
+
+class TestHistogram:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.histogram = Histogram()
+        for millis in range(1, 101):
+            self.histogram.observe(millis / 1000)
+
+    def test_summary_values(self):
+        assert self.histogram.count == 100
+        assert self.histogram.sum == pytest.approx(5.05)
+        assert self.histogram.min == 0.001
+        assert self.histogram.max == 0.1
+
+    @pytest.mark.parametrize('quantile', [0.5, 0.95, 0.99])
+    def test_percentiles_within_a_bucket(self, quantile):
+        assert self.histogram.percentile(quantile) == pytest.approx(
+            quantile / 10, rel=0.2
+        )
+
+    def test_percentiles_clamped_to_observed_range(self):
+        assert self.histogram.percentile(0) >= 0.001
+        assert self.histogram.percentile(1) == 0.1
+
+    def test_empty(self):
+        assert Histogram().percentile(0.5) is None
+
+    def test_above_last_bucket(self):
+        histogram = Histogram(bounds=(1.0,))
+        histogram.observe(5.0)
+
+        assert histogram.counts == [0, 1]
+        assert histogram.percentile(0.5) == 5.0
+
+    def test_merge(self):
+        other = Histogram()
+        other.observe(10.0)
+
+        self.histogram.merge(other)
+
+        assert self.histogram.count == 101
+        assert self.histogram.max == 10.0
+        assert self.histogram.min == 0.001
+
+    def test_merge_different_buckets(self):
+        with pytest.raises(ValueError):
+            self.histogram.merge(Histogram(bounds=(1.0,)))
+
+
+class TestMetrics:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.metrics = Metrics()
+        self.metrics.observe(DECISION, 'Player "1"', 0.002)
+        self.metrics.observe(RENDER, None, 0.0001)
+        self.metrics.increment(SEEDS_MOVED, 'Player "1"', 4)
+        self.metrics.increment(SEEDS_MOVED, 'Player "1"', 3)
+
+    def test_increment(self):
+        assert self.metrics.counters[(SEEDS_MOVED, 'Player "1"')] == 7
+
+    def test_merge(self):
+        other = Metrics()
+        other.observe(DECISION, 'Player "1"', 0.004)
+        other.increment(SEEDS_MOVED, 'Player "1"')
+        other.increment(EXTRA_TURNS, 'Player 2')
+
+        self.metrics.merge(other)
+
+        assert self.metrics.histograms[(DECISION, 'Player "1"')].count == 2
+        assert self.metrics.counters[(SEEDS_MOVED, 'Player "1"')] == 8
+        assert self.metrics.counters[(EXTRA_TURNS, 'Player 2')] == 1
+
+    def test_summary(self):
+        summary = self.metrics.summary()
+
+        assert 'p99 (ms)' in summary
+        assert DECISION in summary
+        assert SEEDS_MOVED in summary
+
+    def test_prometheus(self):
+        lines = self.metrics.to_prometheus().splitlines()
+
+        assert '# TYPE mancala_phase_seconds histogram' in lines
+        assert (
+            'mancala_phase_seconds_count{phase="decision",player="Player \\"1\\""} 1'
+            in lines
+        )
+        assert 'mancala_phase_seconds_bucket{phase="render",le="+Inf"} 1' in lines
+        assert '# TYPE mancala_seeds_moved_total counter' in lines
+        assert 'mancala_seeds_moved_total{player="Player \\"1\\""} 7' in lines
+
+    def test_buckets_are_cumulative(self):
+        counts = [
+            int(line.rsplit(' ', 1)[1])
+            for line in self.metrics.to_prometheus().splitlines()
+            if line.startswith('mancala_phase_seconds_bucket{phase="decision"')
+        ]
+
+        assert counts == sorted(counts)
+        assert counts[-1] == 1
+
+    def test_write_prometheus(self, tmp_path):
+        path = tmp_path / 'metrics.prom'
+        self.metrics.write_prometheus(path)
+
+        assert path.read_text() == self.metrics.to_prometheus()
+
+
+class TestGameMetrics:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.metrics = Metrics()
+        self.player1 = InvalidThenValidPlayer('Player1')
+        self.player2 = ImprovedRandomPlayer('Player2', wait_time=0)
+        self.game = Game(
+            player1=self.player1,
+            player2=self.player2,
+            initial_seeds=3,
+            headless=True,
+            metrics=self.metrics,
+        )
+        self.game.run()
+
+    def test_phases_timed_per_player(self):
+        decisions = sum(
+            self.metrics.histograms[(DECISION, player.name)].count
+            for player in (self.player1, self.player2)
+        )
+        sows = sum(
+            self.metrics.histograms[(SOW, player.name)].count
+            for player in (self.player1, self.player2)
+        )
+
+        assert sows == len(self.game.moves)
+        # The invalid cup was decided but never sown
+        assert decisions == len(self.game.moves) + 1
+
+    def test_counters(self):
+        counters = self.metrics.counters
+
+        assert counters[(INVALID_CUP_RETRIES, self.player1.name)] == 1
+        assert counters[(SEEDS_MOVED, self.player1.name)] + counters[
+            (SEEDS_MOVED, self.player2.name)
+        ] >= len(self.game.moves)
+
+    def test_extra_turns(self):
+        engine = Engine(6)
+        engine.initialize_cups(3)
+
+        extra_turns = 0
+        side = Side.Player1
+        for move in self.game.moves:
+            next_side = engine.next_side(side, engine.sow_index(move))
+            extra_turns += next_side == side
+            side = next_side
+
+        assert extra_turns == sum(
+            value
+            for (name, player), value in self.metrics.counters.items()
+            if name == EXTRA_TURNS
+        )
+
+    def test_headless_game_does_not_render(self):
+        assert (RENDER, None) not in self.metrics.histograms
+
+
+class TestRenderedGameMetrics:
+    @pytest.fixture(autouse=True)
+    def setUp(self, capsys):
+        self.wait = 0.02
+        self.metrics = Metrics()
+        self.player1 = RandomPlayer('Player1', wait_time=self.wait)
+        self.player2 = RandomPlayer('Player2', wait_time=self.wait)
+        self.player1.seed(0)
+        self.player2.seed(1)
+        self.game = Game(
+            player1=self.player1,
+            player2=self.player2,
+            side_length=2,
+            initial_seeds=1,
+            animation_wait=self.wait,
+            metrics=self.metrics,
+        )
+        self.game.run()
+
+    def test_pauses_and_animation_not_timed(self):
+        for player in (self.player1, self.player2):
+            for phase in (DECISION, SOW):
+                histogram = self.metrics.histograms[(phase, player.name)]
+                assert histogram.max < self.wait
+
+    def test_drawing_timed(self):
+        assert self.metrics.histograms[(RENDER, None)].count
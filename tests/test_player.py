@@ -1,6 +1,9 @@
+import math
+
 import pytest
 
-from src.player import DefensivePlayer
+from src.engine import MutablePosition, Side
+from src.player import AlphaBetaPlayer, DefensivePlayer, MonteCarloPlayer
 
 
 class TestDefensiveMove:
@@ -94,3 +97,155 @@ class TestScoreMoves:
             {'cup': 'l', 'score': 8.0},
         ]
         assert scored_moves == expected
+
+
+def _minimax(position, depth):
+    moves = position.legal_moves()
+    if depth == 0 or not moves:
+        return position.store_difference()
+
+    scores = []
+    for index in moves:
+        child = position.apply_move(index)
+        score = _minimax(child, depth - 1)
+        if child.side_to_move != position.side_to_move:
+            score = -score
+        scores.append(score)
+    return max(scores)
+
+
+class TestAlphaBetaPlayer:
+    @pytest.fixture(autouse=True)
+    def setUp(self, basic_game_setup):
+        self.player = AlphaBetaPlayer('Player1', wait_time=0, depth=3)
+        basic_game_setup(self, player1=self.player)
+
+    @pytest.mark.parametrize('depth', [0, -1])
+    def test_invalid_depth(self, depth):
+        with pytest.raises(ValueError):
+            AlphaBetaPlayer('Player1', wait_time=0, depth=depth)
+
+    def test_matches_minimax(self):
+        position = self.player.position
+
+        board = MutablePosition.from_position(position)
+
+        self.player._nodes = 0
+        assert self.player._negamax_in_place(board, 3, -math.inf, math.inf) == _minimax(
+            position, 3
+        )
+
+    def test_free_play_moves_ordered_first(self):
+        """
+            a   b   c   d   e   f
+            0   0   0   0   0   0
+        0                           0
+            1   4   0   0   2   0
+            g   h   i   j   k   l
+        """
+        self.board.initialize_cups(0)
+        self.board.cups[9] = 2
+        self.board.cups[12] = 4
+        self.board.cups[13] = 1
+
+        position = self.player.position
+        assert self.player._order_moves(position, position.legal_moves()) == [
+            13,
+            9,
+            12,
+        ]
+
+    def test_takes_extra_turns(self):
+        """
+            a   b   c   d   e   f
+            0   0   0   0   0   0
+        0                           0
+            1   2   0   0   0   5
+            g   h   i   j   k   l
+        """
+        self.board.initialize_cups(0)
+        self.board.cups[8] = 5
+        self.board.cups[12] = 2
+        self.board.cups[13] = 1
+
+        assert self.player.take_turn() == 'g'
+
+    def test_records_search_stats(self):
+        self.player.take_turn()
+
+        stats = self.player.last_search_stats
+        assert stats.nodes > 1
+        assert stats.nodes_per_second > 0
+        assert self.player.total_nodes == stats.nodes
+
+
+class TestMonteCarloPlayer:
+    @pytest.fixture(autouse=True)
+    def setUp(self, basic_game_setup):
+        self.player = MonteCarloPlayer('Player1', wait_time=0, playouts=200)
+        basic_game_setup(self, player1=self.player)
+
+    def test_playout_count(self):
+        self.player.take_turn()
+
+        assert self.player.last_search_stats.nodes == 200
+        assert self.player._root.visits == 200
+
+    def test_time_budget(self):
+        self.player.playouts = None
+        self.player.time_budget = 0.05
+
+        self.player.take_turn()
+
+        assert self.player.last_search_stats.nodes > 0
+        assert self.player.last_search_stats.elapsed < 1
+
+    def test_expired_time_budget_still_moves(self):
+        self.player.playouts = None
+        self.player.time_budget = 0
+
+        assert self.player.take_turn() in self.board.legal_cups()
+        assert self.player.last_search_stats.nodes == 1
+
+    @pytest.mark.parametrize('playouts,time_budget', [(None, None), (0, None), (-1, 1)])
+    def test_invalid_limits(self, playouts, time_budget):
+        with pytest.raises(ValueError):
+            MonteCarloPlayer(
+                'Player1', wait_time=0, playouts=playouts, time_budget=time_budget
+            )
+
+    def test_playout_does_not_touch_board(self):
+        cups = list(self.board.cups)
+
+        self.player._playout(self.player.position)
+
+        assert self.board.cups == cups
+
+    def test_takes_only_move(self):
+        """
+            a   b   c   d   e   f
+            0   0   0   0   0   0
+        0                           0
+            0   0   0   0   0   3
+            g   h   i   j   k   l
+        """
+        self.board.initialize_cups(0)
+        self.board.cups[8] = 3
+
+        assert self.player.take_turn() == 'l'
+
+    def test_reuses_tree(self):
+        self.player.take_turn()
+
+        frontier = list(self.player._root.children.values())
+        node = frontier.pop(0)
+        while node.position.side_to_move != Side.Player1 or not node.visits:
+            frontier.extend(node.children.values())
+            node = frontier.pop(0)
+
+        visits = node.visits
+        self.board.load_position(node.position)
+        self.player.take_turn()
+
+        assert self.player.last_reused_visits == visits
+        assert self.player._root is node
@@ -0,0 +1,88 @@
+import pstats
+import sys
+
+import pytest
+
+from src.engine import Engine
+from src.game import Game
+from src.metrics import DECISION, RENDER, SOW
+from src.player import ImprovedRandomPlayer, Player
+from src.profiling import OTHER, Profile, SamplingProfiler
+
+
+class SamplingPlayer(Player):
+    def __init__(self, name, sampler, **kwargs):
+        super().__init__(name, **kwargs)
+        self.sampler = sampler
+        self.stack = None
+
+    def take_turn(self):
+        self.stack = self.sampler._sample(sys._getframe())
+        return self.board.legal_cups()[0]
+
+
+class TestSamplingProfiler:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.sampler = SamplingProfiler()
+
+    def test_stack_is_outermost_first(self):
+        stack = self.sampler._sample(sys._getframe())
+
+        assert stack[0] == OTHER
+        assert stack[-1].endswith('test_stack_is_outermost_first')
+
+    def test_decision_phase(self):
+        player = SamplingPlayer('Player1', self.sampler)
+        engine = Engine(6)
+        engine.assign_player(player)
+        engine.assign_player(Player('Player2'))
+        engine.initialize_cups(3)
+
+        player._take_turn()
+
+        assert player.stack[0] == DECISION
+        assert player.stack[-2].endswith('Player._take_turn')
+        assert player.stack[-1].endswith('SamplingPlayer.take_turn')
+
+    def test_write_collapsed(self, tmp_path):
+        self.sampler.stacks[(SOW, 'a', 'b')] += 3
+        self.sampler.stacks[(RENDER, 'a')] += 1
+        path = tmp_path / 'stacks.collapsed'
+
+        self.sampler.write_collapsed(path)
+
+        assert path.read_text() == 'render;a 1\nsow;a;b 3\n'
+        assert self.sampler.phase_samples() == {SOW: 3, RENDER: 1}
+
+    def test_switch_interval_restored(self):
+        before = sys.getswitchinterval()
+
+        self.sampler.start()
+        self.sampler.stop()
+
+        assert sys.getswitchinterval() == before
+
+
+class TestProfile:
+    def test_writes_pstats_and_collapsed(self, tmp_path):
+        path = str(tmp_path / 'series')
+        with Profile(path) as profile:
+            for _ in range(5):
+                Game(
+                    player1=ImprovedRandomPlayer('Player1', wait_time=0),
+                    player2=ImprovedRandomPlayer('Player2', wait_time=0),
+                    initial_seeds=4,
+                    headless=True,
+                ).run()
+
+        stats = pstats.Stats(profile.pstats_path)
+        assert any(function == 'run' for _, _, function in stats.stats)
+
+        with open(profile.collapsed_path) as f:
+            for line in f:
+                stack, count = line.rsplit(' ', 1)
+                assert int(count) > 0
+                assert stack.split(';')[0] in (DECISION, SOW, RENDER, OTHER)
+
+        assert profile.path in profile.summary()
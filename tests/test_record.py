@@ -0,0 +1,202 @@
+import pytest
+
+from src.board import Board
+from src.game import Game
+from src.player import DefensivePlayer, Player, RandomPlayer
+from src.record import (
+    GameRecord,
+    GameRecordReader,
+    GameRecordWriter,
+    RecordError,
+    decode_record,
+    encode_record,
+    rebuild_index,
+    replay,
+)
+from src.series import Series
+
+
+def _record(moves=(1, 9, 200, 3)):
+    return GameRecord(
+        side_length=6,
+        initial_seeds=3,
+        player1_type='RandomPlayer',
+        player2_type='DefensivePlayer',
+        moves=tuple(moves),
+    )
+
+
+class TestEncoding:
+    def test_round_trip(self):
+        record = _record()
+        encoded = encode_record(record)
+
+        assert decode_record(encoded) == (record, len(encoded))
+
+    def test_small_moves_take_one_byte(self):
+        short = encode_record(_record(moves=(1,) * 10))
+        longer = encode_record(_record(moves=(1,) * 20))
+
+        assert len(longer) - len(short) == 10
+
+    def test_truncated(self):
+        encoded = encode_record(_record())
+
+        with pytest.raises(RecordError):
+            decode_record(encoded[:-1])
+
+
+class TestWriterAndReader:
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmp_path):
+        self.path = tmp_path / 'games.rec'
+        self.records = [_record(moves=range(1, idx + 2)) for idx in range(20)]
+
+    def _write(self, records, **kwargs):
+        with GameRecordWriter(self.path, **kwargs) as writer:
+            for record in records:
+                writer.write(record)
+
+    def test_buffering_is_bounded(self):
+        writer = GameRecordWriter(self.path, buffer_bytes=100)
+        for record in self.records:
+            writer.write(record)
+            assert len(writer._buffer) < 100 + len(encode_record(record))
+
+        assert self.path.stat().st_size > 0
+        writer.close()
+
+    def test_nothing_lost_on_close(self):
+        self._write(self.records)
+
+        with GameRecordReader(self.path) as reader:
+            assert list(reader) == self.records
+            assert len(reader) == len(self.records)
+
+    def test_seek_to_game(self):
+        self._write(self.records, buffer_bytes=50)
+
+        with GameRecordReader(self.path) as reader:
+            assert reader[13] == self.records[13]
+            assert reader[-1] == self.records[-1]
+
+            with pytest.raises(IndexError):
+                reader[len(self.records)]
+
+    def test_appends_to_existing_file(self):
+        self._write(self.records[:5])
+        self._write(self.records[5:])
+
+        with GameRecordReader(self.path) as reader:
+            assert list(reader) == self.records
+            assert reader[7] == self.records[7]
+
+    def test_rebuild_index(self):
+        self._write(self.records)
+        index = self.path.with_name(self.path.name + '.idx')
+        expected = index.read_bytes()
+        index.unlink()
+
+        rebuild_index(self.path)
+        assert index.read_bytes() == expected
+
+    def test_rejects_other_files(self):
+        self.path.write_bytes(b'not a record file')
+
+        with pytest.raises(RecordError):
+            GameRecordReader(self.path)
+
+
+class TestReplay:
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmp_path):
+        self.path = tmp_path / 'games.rec'
+        player1 = RandomPlayer('Player1', wait_time=0)
+        player2 = DefensivePlayer('Player2', wait_time=0)
+        player1.seed(1)
+        player2.seed(2)
+
+        with GameRecordWriter(self.path) as writer:
+            self.game = Game(
+                player1=player1,
+                player2=player2,
+                initial_seeds=3,
+                headless=True,
+                recorder=writer,
+            )
+            self.game.run()
+
+        with GameRecordReader(self.path) as reader:
+            self.record = reader[0]
+
+    def test_record_header(self):
+        assert self.record.side_length == 6
+        assert self.record.initial_seeds == 3
+        assert self.record.player1_type == 'RandomPlayer'
+        assert self.record.player2_type == 'DefensivePlayer'
+
+    def test_headless_replay_reaches_final_position(self):
+        board = replay(self.record)
+
+        assert board.cups == self.game.board.cups
+        assert not board.renders
+
+    def test_rendered_replay(self, mocker):
+        board = Board(
+            6,
+            animation_wait=0,
+            player1=Player('Player1'),
+            player2=Player('Player2'),
+        )
+        display_cups = mocker.patch.object(board, 'display_cups')
+
+        replay(self.record, board)
+
+        assert board.cups == self.game.board.cups
+        assert display_cups.call_count == len(self.record.moves) + 1
+
+    def test_illegal_move(self):
+        record = self.record._replace(moves=(0,))
+
+        with pytest.raises(RecordError):
+            replay(record)
+
+    def test_store_index_is_illegal(self):
+        # Once seeds reach Player 2's store, only the index can rule it out
+        moves = self.record.moves
+        played = next(
+            idx
+            for idx in range(len(moves))
+            if replay(self.record._replace(moves=moves[:idx])).cups[7]
+        )
+        record = self.record._replace(moves=moves[:played] + (7,))
+
+        with pytest.raises(RecordError):
+            replay(record)
+
+
+class TestSeriesRecording:
+    def _series(self, path, **kwargs):
+        return Series(
+            player1=RandomPlayer('Player1', wait_time=0),
+            player2=DefensivePlayer('Player2', wait_time=0),
+            number_of_games=6,
+            headless=True,
+            seed=99,
+            record_path=path,
+            **kwargs,
+        )
+
+    def test_parallel_records_match_sequential(self, tmp_path):
+        self._series(tmp_path / 'sequential.rec').run_games()
+        self._series(tmp_path / 'parallel.rec', workers=2).run_games()
+
+        with GameRecordReader(tmp_path / 'sequential.rec') as reader:
+            sequential = list(reader)
+        with GameRecordReader(tmp_path / 'parallel.rec') as reader:
+            parallel = list(reader)
+
+        assert len(sequential) == 6
+        assert sequential == parallel
+        # Seats swap every game
+        assert sequential[1].player1_type == 'DefensivePlayer'
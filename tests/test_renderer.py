@@ -0,0 +1,111 @@
+import io
+
+import pytest
+
+from src.metrics import RENDER, Metrics
+from src.renderer import FrameRenderer
+
+
+class FakeTerminal:
+    normal = '</>'
+
+    def move_sequence(self, row, column):
+        return f'[{row},{column}]'
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestFrameRenderer:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.stream = CountingStream()
+        self.renderer = FrameRenderer(FakeTerminal(), stream=self.stream)
+
+    def _flush(self):
+        self.stream.seek(0)
+        self.stream.truncate()
+        self.renderer.flush()
+        return self.stream.getvalue()
+
+    def test_first_frame_draws_everything(self):
+        self.renderer.draw((1, 1), 4)
+        self.renderer.draw((1, 5), 'a', color='<y>')
+
+        assert self._flush() == '[1,1]4[1,5]<y>a</>'
+        assert self.stream.writes == 1
+
+    def test_unchanged_cells_not_redrawn(self):
+        self.renderer.draw((1, 1), 4)
+        self.renderer.draw((1, 5), 4)
+        self._flush()
+
+        self.renderer.draw((1, 1), 4)
+        self.renderer.draw((1, 5), 5)
+
+        assert self._flush() == '[1,5]5'
+
+    def test_nothing_written_when_nothing_changed(self):
+        self.renderer.draw((1, 1), 4)
+        self._flush()
+        writes = self.stream.writes
+
+        self.renderer.draw((1, 1), 4)
+        assert self._flush() == ''
+        assert self.stream.writes == writes
+
+    def test_color_change_redraws(self):
+        self.renderer.draw((1, 1), 'v', color='<r>')
+        self._flush()
+
+        self.renderer.draw((1, 1), 'v', color='<b>')
+        assert self._flush() == '[1,1]<b>v</>'
+
+    def test_narrower_value_is_padded(self):
+        self.renderer.draw((1, 1), 10)
+        self._flush()
+
+        self.renderer.draw((1, 1), 9)
+        assert self._flush() == '[1,1]9 '
+
+    def test_missing_cells_are_blanked(self):
+        self.renderer.draw((1, 1), 4)
+        self.renderer.draw((2, 1), '^')
+        self._flush()
+
+        self.renderer.draw((1, 1), 4)
+        assert self._flush() == '[2,1] '
+
+    def test_invalidate_redraws(self):
+        self.renderer.draw((1, 1), 4)
+        self._flush()
+
+        self.renderer.invalidate()
+        self.renderer.draw((1, 1), 4)
+        assert self._flush() == '[1,1]4'
+
+    def test_clear(self):
+        self.renderer.draw((1, 1), 12)
+        self._flush()
+
+        self.stream.seek(0)
+        self.stream.truncate()
+        self.renderer.clear()
+        assert self.stream.getvalue() == '[1,1]  '
+
+    def test_flush_time_recorded(self):
+        metrics = Metrics()
+        self.renderer.metrics = metrics
+        self.renderer.draw((1, 1), 4)
+
+        self.renderer.flush()
+        self.renderer.flush()
+
+        assert metrics.histograms[(RENDER, None)].count == 2
@@ -0,0 +1,138 @@
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src import series
+from src.player import MonteCarloPlayer, RandomPlayer
+from src.rng import RandomSource, create_rng, derive_seed, rand, splitmix64
+from src.series import Series, _initialize_worker
+
+
+class TestSplitmix64:
+    def test_reference_value(self):
+        # First output of the reference splitmix64 generator seeded with 0
+        assert splitmix64(0) == 0xE220A8397B1DCDAF
+
+    def test_fits_in_64_bits(self):
+        assert splitmix64((1 << 64) - 1) < 1 << 64
+
+
+class TestDeriveSeed:
+    def test_stable(self):
+        assert derive_seed(1234, 7) == derive_seed(1234, 7)
+
+    def test_distinct_streams(self):
+        seeds = {derive_seed(1234, stream) for stream in range(1000)}
+        assert len(seeds) == 1000
+
+    def test_distinct_series_seeds(self):
+        assert derive_seed(1, 0) != derive_seed(2, 0)
+        assert derive_seed(1, 1) != derive_seed(2, 0)
+
+
+class TestCreateRng:
+    def test_fast_is_reproducible(self):
+        first = create_rng(42)
+        second = create_rng(42)
+
+        assert [first.random() for _ in range(5)] == [second.random() for _ in range(5)]
+
+    def test_system(self):
+        assert isinstance(create_rng(source=RandomSource.System), random.SystemRandom)
+
+    def test_system_cannot_be_seeded(self):
+        with pytest.raises(ValueError):
+            create_rng(1, source=RandomSource.System)
+
+
+class TestPlayerRng:
+    def test_shared_by_default(self):
+        assert RandomPlayer('Player1').rand is rand
+
+    def test_given_rng(self):
+        rng = create_rng(3)
+        assert RandomPlayer('Player1', rng=rng).rand is rng
+
+    def test_shared_rng_not_pickled(self):
+        player = pickle.loads(pickle.dumps(RandomPlayer('Player1')))
+        assert player.rand is rand
+
+    def test_seeded_rng_pickled(self):
+        player = RandomPlayer('Player1')
+        player.seed(5)
+
+        copy = pickle.loads(pickle.dumps(player))
+
+        assert copy.rand is not player.rand
+        assert copy.rand.random() == player.rand.random()
+
+    def test_system_rng_pickled(self):
+        player = RandomPlayer('Player1', rng=create_rng(source=RandomSource.System))
+
+        copy = pickle.loads(pickle.dumps(player))
+
+        assert isinstance(copy.rand, random.SystemRandom)
+
+    def test_unseeded_playouts_use_shared_rng(self):
+        player = pickle.loads(pickle.dumps(MonteCarloPlayer('Player1')))
+        assert player._playout_rand is rand
+
+    def test_seeded_playouts_pickled(self):
+        player = MonteCarloPlayer('Player1')
+        player.seed(5)
+
+        copy = pickle.loads(pickle.dumps(player))
+
+        assert copy._playout_rand is not copy.rand
+        assert copy._playout_rand.random() == player._playout_rand.random()
+
+
+def _worker_playout_rand(_):
+    player = series._worker_series.player1
+    return type(player._playout_rand).__name__, player._playout_rand is player.rand
+
+
+class TestSeriesRandomSource:
+    def _series(self, **kwargs):
+        return Series(
+            player1=RandomPlayer('Player1', wait_time=0),
+            player2=RandomPlayer('Player2', wait_time=0),
+            number_of_games=4,
+            headless=True,
+            **kwargs,
+        )
+
+    def test_system_random(self):
+        series = self._series(random_source=RandomSource.System, workers=2)
+        series.run_games()
+
+        assert isinstance(series.player1.rand, random.SystemRandom)
+        assert series.player1.games_played == 4
+
+    def test_system_random_reaches_playouts_in_workers(self):
+        pooled = Series(
+            player1=MonteCarloPlayer('Player1', wait_time=0, playouts=5),
+            player2=MonteCarloPlayer('Player2', wait_time=0, playouts=5),
+            number_of_games=2,
+            headless=True,
+            workers=2,
+            random_source=RandomSource.System,
+        )
+        assert pooled.player1._playout_rand is pooled.player1.rand
+
+        with ProcessPoolExecutor(
+            max_workers=2, initializer=_initialize_worker, initargs=(pooled,)
+        ) as executor:
+            # A SystemRandom has no state for workers to share
+            assert set(executor.map(_worker_playout_rand, range(4))) == {
+                ('SystemRandom', True)
+            }
+
+        pooled.run_games()
+        assert pooled.player1.games_played == 2
+
+    def test_seeded_system_random_rejected(self):
+        with pytest.raises(ValueError):
+            self._series(random_source=RandomSource.System, seed=1)
@@ -0,0 +1,169 @@
+import pytest
+
+from src.metrics import Metrics
+from src.player import (
+    AlphaBetaPlayer,
+    DefensivePlayer,
+    ImprovedRandomPlayer,
+    RandomPlayer,
+)
+from src.series import Series, game_seed
+from src.transposition import TranspositionTable
+
+
+def _results(series):
+    return [
+        (player.wins, player.losses, player.ties)
+        for player in (series.player1, series.player2)
+    ]
+
+
+class TestGameSeed:
+    def test_distinct_per_game(self):
+        assert game_seed(1, 0) != game_seed(1, 1)
+
+    def test_stable(self):
+        assert game_seed(1, 5) == game_seed(1, 5)
+
+
+class TestRunGames:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.kwargs = dict(
+            number_of_games=8,
+            headless=True,
+            seed=1234,
+        )
+
+    def _series(self, **kwargs):
+        return Series(
+            player1=RandomPlayer('Player1', wait_time=0),
+            player2=DefensivePlayer('Player2', wait_time=0),
+            **self.kwargs,
+            **kwargs,
+        )
+
+    def test_games_played(self):
+        series = self._series()
+        series.run_games()
+
+        assert series.player1.games_played == 8
+        assert series.player2.games_played == 8
+        assert series.player1.wins == series.player2.losses
+
+    def test_seeded_runs_repeat(self):
+        first = self._series()
+        first.run_games()
+
+        second = self._series()
+        second.run_games()
+
+        assert _results(first) == _results(second)
+
+    def test_parallel_matches_sequential(self):
+        sequential = self._series()
+        sequential.run_games()
+
+        parallel = self._series(workers=2)
+        parallel.run_games()
+
+        assert _results(parallel) == _results(sequential)
+
+
+class TestTranspositionTableResults:
+    def _series(self, **kwargs):
+        return Series(
+            player1=AlphaBetaPlayer('Player1', wait_time=0, depth=2),
+            player2=RandomPlayer('Player2', wait_time=0),
+            number_of_games=2,
+            headless=True,
+            seed=1234,
+            transposition_table=TranspositionTable(max_bytes=1024),
+            **kwargs,
+        )
+
+    def test_reported_for_sequential_runs(self, capsys):
+        series = self._series()
+        series.run_games()
+        series.final_results()
+
+        assert 'Transposition Table:' in capsys.readouterr().out
+
+    def test_not_reported_from_pool(self, capsys):
+        # The parent's table is never probed, so its stats would read 0/0
+        series = self._series(workers=2)
+        series.run_games()
+        series.final_results()
+
+        assert 'Transposition Table:' not in capsys.readouterr().out
+
+
+class TestAlternateSeats:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.player1 = ImprovedRandomPlayer('Player1', wait_time=0)
+        self.player2 = ImprovedRandomPlayer('Player2', wait_time=0)
+        self.series = Series(
+            number_of_games=2,
+            headless=True,
+            player1=self.player1,
+            player2=self.player2,
+        )
+
+    def test_seats_alternate(self):
+        first = self.series._play_game(0)
+        assert first.player1 is self.player1
+
+        second = self.series._play_game(1)
+        assert second.player1 is self.player2
+        assert second.board.player1 is self.player2
+
+    def test_game_reused(self):
+        first = self.series._play_game(0)
+        board = first.board
+
+        second = self.series._play_game(1)
+        third = self.series._play_game(2)
+
+        assert second is first
+        assert third is first
+        assert third.board is board
+        assert third.player1 is self.player1
+
+
+class TestSeriesMetrics:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.kwargs = dict(number_of_games=4, headless=True, seed=99)
+
+    def _series(self, **kwargs):
+        return Series(
+            player1=RandomPlayer('Player1', wait_time=0),
+            player2=DefensivePlayer('Player2', wait_time=0),
+            metrics=Metrics(),
+            **self.kwargs,
+            **kwargs,
+        )
+
+    def test_collected_for_both_players(self):
+        series = self._series()
+        series.run_games()
+
+        players = {player for phase, player in series.metrics.histograms}
+        assert players == {series.player1.name, series.player2.name}
+
+    def test_parallel_matches_sequential_counters(self):
+        sequential = self._series()
+        sequential.run_games()
+
+        parallel = self._series(workers=2)
+        parallel.run_games()
+
+        assert parallel.metrics.counters == sequential.metrics.counters
+
+    def test_final_results_include_metrics(self, capsys):
+        series = self._series()
+        series.run_games()
+        series.final_results()
+
+        assert 'p95 (ms)' in capsys.readouterr().out
@@ -0,0 +1,171 @@
+import asyncio
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.engine import Engine
+from src.player import PlayerType
+from src.server import PROMPT, GameServer, render_text
+
+
+async def _play(reader, writer, choose=lambda legal_moves: legal_moves[0]):
+    """
+    Play a whole game as a client and return everything the server sent.
+    """
+    received = []
+    while True:
+        try:
+            data = await reader.readuntil(PROMPT.encode())
+        except asyncio.IncompleteReadError as e:
+            received.append(e.partial.decode())
+            break
+
+        text = data.decode()
+        received.append(text)
+
+        legal_line = [
+            line for line in text.splitlines() if line.startswith('Legal moves:')
+        ][-1]
+        legal_moves = legal_line.split(':')[1].split()
+        writer.write(f'{choose(legal_moves)}\n'.encode())
+        await writer.drain()
+
+    writer.close()
+    return ''.join(received)
+
+
+def _game_over(output):
+    return any(result in output for result in ('You win!', 'wins!', 'Tie game!'))
+
+
+class TestRenderText:
+    def test_layout(self):
+        engine = Engine(3)
+        engine.initialize_cups(2)
+        engine.cups[0] = 5
+
+        lines = render_text(engine).splitlines()
+
+        assert lines[0].split() == ['a', 'b', 'c']
+        assert lines[1].split() == ['2', '2', '2']
+        assert lines[2].split() == ['5', '0']
+        assert lines[4].split() == ['d', 'e', 'f']
+        # Labels sit above and below their cups
+        assert lines[0].index('a') == lines[1].index('2')
+
+
+class TestGameServer:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.server = GameServer(
+            opponent_type=PlayerType.Random,
+            side_length=3,
+            initial_seeds=2,
+            executor=self.executor,
+        )
+        yield
+        self.executor.shutdown()
+
+    def test_concurrent_tcp_sessions(self):
+        async def scenario():
+            server = await self.server.start_tcp('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            async def client():
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                return await _play(reader, writer)
+
+            async with server:
+                return await asyncio.gather(*(client() for _ in range(5)))
+
+        outputs = asyncio.run(scenario())
+
+        assert all(_game_over(output) for output in outputs)
+        assert self.server.sessions_served == 5
+        assert self.server.active_sessions == 0
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='No Unix sockets')
+    def test_unix_socket(self, tmp_path):
+        path = str(tmp_path / 'mancala.sock')
+
+        async def scenario():
+            server = await self.server.start_unix(path)
+            async with server:
+                reader, writer = await asyncio.open_unix_connection(path)
+                return await _play(reader, writer)
+
+        assert _game_over(asyncio.run(scenario()))
+
+    def test_invalid_moves_are_reported(self):
+        async def scenario():
+            server = await self.server.start_tcp('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            async with server:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                await reader.readuntil(PROMPT.encode())
+
+                writer.write(b'zz\n')
+                await writer.drain()
+                return (await reader.readuntil(PROMPT.encode())).decode()
+
+        assert 'Invalid cup' in asyncio.run(scenario())
+
+    def test_quit(self):
+        async def scenario():
+            server = await self.server.start_tcp('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            async with server:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                await reader.readuntil(PROMPT.encode())
+
+                writer.write(b'quit\n')
+                await writer.drain()
+                return (await reader.read()).decode()
+
+        assert 'Goodbye!' in asyncio.run(scenario())
+        assert self.server.sessions_served == 1
+
+    def test_ai_turns_leave_the_event_loop_free(self, mocker):
+        slow_turns = []
+
+        def slow_take_turn(player):
+            slow_turns.append(player)
+            time.sleep(0.05)
+            return player.board.legal_cups()[0]
+
+        mocker.patch(
+            'src.player.RandomPlayer.take_turn',
+            autospec=True,
+            side_effect=slow_take_turn,
+        )
+
+        async def scenario():
+            server = await self.server.start_tcp('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            async with server:
+                tick_task = asyncio.create_task(ticker())
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                await _play(reader, writer)
+                tick_task.cancel()
+
+            return ticks
+
+        ticks = asyncio.run(scenario())
+
+        assert slow_turns
+        # The loop kept running while the opponent was thinking
+        assert ticks >= len(slow_turns) * 5
@@ -0,0 +1,165 @@
+import functools
+import math
+import pickle
+import random
+
+import pytest
+
+from src.engine import MutablePosition, Position, Side
+from src.player import AlphaBetaPlayer, MonteCarloPlayer
+from src.tablebase import (
+    Tablebase,
+    TablebaseError,
+    _Indexer,
+    build_tablebase,
+    write_tablebase,
+)
+
+SIDE_LENGTH = 3
+MAX_SEEDS = 6
+
+
+@functools.lru_cache(maxsize=None)
+def _solve(position):
+    """
+    Perfect play score for the side to move, by exhaustive search.
+    """
+    moves = position.legal_moves()
+    if not moves:
+        return position.store_difference()
+
+    scores = []
+    for index in moves:
+        child = position.apply_move(index)
+        score = _solve(child)
+        if child.side_to_move != position.side_to_move:
+            score = -score
+        scores.append(score)
+    return max(scores)
+
+
+def _random_position(max_seeds, rand):
+    cups = [0] * (SIDE_LENGTH * 2 + 2)
+    playable = [idx for idx in range(len(cups)) if idx not in (0, SIDE_LENGTH + 1)]
+    for _ in range(rand.randint(0, max_seeds)):
+        cups[rand.choice(playable)] += 1
+
+    cups[0] = rand.randint(0, 5)
+    cups[SIDE_LENGTH + 1] = rand.randint(0, 5)
+    return Position(cups, rand.choice(list(Side)))
+
+
+@pytest.fixture(scope='module')
+def tablebase_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('tablebase') / 'tablebase.bin'
+    write_tablebase(path, SIDE_LENGTH, MAX_SEEDS)
+    return path
+
+
+class TestIndexer:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.indexer = _Indexer(SIDE_LENGTH, 4)
+
+    def test_ranks_are_dense_and_unique(self):
+        ranks = sorted(
+            self.indexer.rank(cups)
+            for total in range(5)
+            for cups in self.indexer.configurations(total)
+        )
+        assert ranks == list(range(self.indexer.positions_per_side))
+
+    def test_too_many_seeds(self):
+        cups = [0, 5, 0, 0, 0, 0, 0, 0]
+        assert self.indexer.rank(cups) is None
+
+
+class TestTablebase:
+    @pytest.fixture(autouse=True)
+    def setUp(self, tablebase_path):
+        self.tablebase = Tablebase(tablebase_path)
+        yield
+        self.tablebase.close()
+
+    def test_matches_exhaustive_search(self):
+        rand = random.Random(0)
+        for _ in range(50):
+            position = _random_position(MAX_SEEDS, rand)
+            assert self.tablebase.score(position) == _solve(position)
+
+    def test_uncovered_positions(self):
+        assert self.tablebase.probe(Position([0, 7, 0, 0, 0, 0, 0, 0])) is None
+        assert self.tablebase.probe(Position([0] * 14)) is None
+
+    def test_best_move_keeps_score(self):
+        position = Position([0, 1, 0, 2, 0, 0, 1, 1])
+        move = self.tablebase.best_move(position)
+        child = position.apply_move(move)
+
+        score = self.tablebase.score(child)
+        if child.side_to_move != position.side_to_move:
+            score = -score
+        assert score == self.tablebase.score(position)
+
+    def test_matches_built_values(self):
+        values = build_tablebase(SIDE_LENGTH, MAX_SEEDS)
+        assert list(self.tablebase._values) == list(values)
+
+    def test_pickle_reopens_file(self):
+        copy = pickle.loads(pickle.dumps(self.tablebase))
+        position = Position([0, 1, 2, 0, 0, 0, 3, 0])
+
+        assert copy.probe(position) == self.tablebase.probe(position)
+        copy.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'not-a-tablebase.bin'
+        path.write_bytes(b'not a tablebase at all')
+
+        with pytest.raises(TablebaseError):
+            Tablebase(path)
+
+    def test_rejects_too_many_seeds(self):
+        with pytest.raises(ValueError):
+            build_tablebase(SIDE_LENGTH, 128)
+
+
+class TestSearchWithTablebase:
+    @pytest.fixture(autouse=True)
+    def setUp(self, tablebase_path):
+        self.tablebase = Tablebase(tablebase_path)
+        yield
+        self.tablebase.close()
+
+    def test_alpha_beta_uses_exact_scores(self):
+        player = AlphaBetaPlayer(
+            'Player1', wait_time=0, depth=1, tablebase=self.tablebase
+        )
+        rand = random.Random(1)
+
+        for _ in range(20):
+            position = _random_position(MAX_SEEDS + 3, rand)
+            board = MutablePosition.from_position(position)
+
+            player._nodes = 0
+            assert player._negamax_in_place(board, 12, -math.inf, math.inf) == _solve(
+                position
+            )
+
+    def test_alpha_beta_root_probe(self):
+        player = AlphaBetaPlayer(
+            'Player1', wait_time=0, depth=1, tablebase=self.tablebase
+        )
+        position = Position([0, 1, 0, 2, 0, 0, 1, 1])
+
+        assert player._search(position) == self.tablebase.best_move(position)
+        assert player.last_search_stats.nodes == 1
+
+    def test_monte_carlo_playout_uses_tablebase(self):
+        player = MonteCarloPlayer(
+            'Player1', wait_time=0, playouts=10, tablebase=self.tablebase
+        )
+        position = Position([3, 0, 0, 1, 0, 0, 0, 0], Side.Player2)
+
+        # Player 2 sows d into their own store and then the rows are empty
+        assert player._playout(position) == Side.Player1
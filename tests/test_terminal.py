@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.terminal import Location, NullTerminal, Terminal, get_terminal
+
+
+class TestTerminal:
+    def test_blessings_not_set_up_until_used(self):
+        term = Terminal()
+
+        assert term._blessings is None
+        term.normal
+        assert term._blessings is not None
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            Terminal().not_a_style
+
+    def test_shared(self):
+        assert get_terminal() is get_terminal()
+
+
+class TestNullTerminal:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.term = NullTerminal()
+
+    def test_styles_are_empty(self):
+        assert self.term.bold + self.term.red == ''
+        assert self.term.normal == ''
+
+    def test_sequences_are_empty(self):
+        assert self.term.move_sequence(1, 2) == ''
+        assert self.term.move_sequence(Location(1, 2)) == ''
+
+    def test_width_unknown(self):
+        assert self.term.width is None
+
+    def test_prints_nothing(self, capsys):
+        self.term.clear()
+        self.term.move(Location(3, 4))
+        self.term.clear_eos()
+        self.term.display('text', color=self.term.red)
+
+        assert capsys.readouterr().out == ''
+
+
+def test_headless_series_imports_nothing_it_does_not_use():
+    code = '\n'.join(
+        [
+            'import sys',
+            'from src.player import DefensivePlayer, RandomPlayer',
+            'from src.series import Series',
+            'Series(',
+            "    player1=DefensivePlayer('Player1', wait_time=0),",
+            "    player2=RandomPlayer('Player2', wait_time=0),",
+            '    number_of_games=2,',
+            '    headless=True,',
+            ').run_games()',
+            "assert 'blessings' not in sys.modules",
+            "assert 'curses' not in sys.modules",
+            "assert 'tabulate' not in sys.modules",
+            "assert 'concurrent.futures' not in sys.modules",
+            "assert 'cProfile' not in sys.modules",
+        ]
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=root)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from src.player import PlayerType
+from src.tournament import Pairing, PairingResult, Tournament, elo_ratings
+
+
+def _result(player1_type, player2_type, wins, losses, ties=0):
+    return PairingResult(
+        pairing=Pairing(
+            player1_type=player1_type,
+            player2_type=player2_type,
+            initial_seeds=3,
+            side_length=6,
+            number_of_games=wins + losses + ties,
+        ),
+        wins=wins,
+        losses=losses,
+        ties=ties,
+    )
+
+
+class TestEloRatings:
+    def test_even_results(self):
+        ratings = elo_ratings(
+            [_result(PlayerType.Random, PlayerType.ImprovedRandom, 5, 5)]
+        )
+
+        assert ratings[PlayerType.Random] == pytest.approx(1500)
+        assert ratings[PlayerType.ImprovedRandom] == pytest.approx(1500)
+
+    def test_stronger_player_rated_higher(self):
+        ratings = elo_ratings(
+            [
+                _result(PlayerType.Random, PlayerType.Defensive, 2, 8),
+                _result(PlayerType.Random, PlayerType.ImprovedRandom, 4, 6),
+                _result(PlayerType.ImprovedRandom, PlayerType.Defensive, 3, 7),
+            ]
+        )
+
+        assert (
+            ratings[PlayerType.Defensive]
+            > ratings[PlayerType.ImprovedRandom]
+            > ratings[PlayerType.Random]
+        )
+
+    def test_order_independent(self):
+        results = [
+            _result(PlayerType.Random, PlayerType.Defensive, 2, 8),
+            _result(PlayerType.Random, PlayerType.ImprovedRandom, 4, 6),
+        ]
+
+        assert elo_ratings(results) == pytest.approx(
+            elo_ratings(list(reversed(results)))
+        )
+
+
+class TestTournament:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.tournament = Tournament(
+            number_of_games=2,
+            initial_seeds=(2, 3),
+            player_types=[
+                PlayerType.Random,
+                PlayerType.ImprovedRandom,
+                PlayerType.Defensive,
+            ],
+        )
+
+    def test_pairings(self):
+        pairings = self.tournament.pairings
+
+        assert len(pairings) == 6
+        assert pairings[0].initial_seeds == 3
+        assert PlayerType.Defensive in (
+            pairings[0].player1_type,
+            pairings[0].player2_type,
+        )
+
+    def test_excludes_human_by_default(self):
+        assert PlayerType.Human not in Tournament().player_types
+
+    def test_run(self, tmp_path):
+        self.tournament.run()
+
+        standings = self.tournament.standings()
+        assert len(standings) == 3
+        assert all(row['games'] == 8 for row in standings)
+        assert 'defensive' in self.tournament.ratings_table()
+
+        path = tmp_path / 'results.json'
+        self.tournament.write_results(path)
+        data = json.loads(path.read_text())
+        assert len(data['pairings']) == 6
+        assert len(data['standings']) == 3
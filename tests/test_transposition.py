@@ -0,0 +1,131 @@
+import math
+
+import pytest
+
+from src.engine import Engine, MutablePosition, Side
+from src.player import AlphaBetaPlayer
+from src.transposition import Bound, TranspositionTable, ZobristKeys
+
+
+class TestZobristKeys:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.engine = Engine(6)
+        self.engine.initialize_cups(4)
+        self.keys = ZobristKeys.for_cups(len(self.engine.cups))
+
+    def test_side_to_move_changes_key(self):
+        assert self.keys.hash_position(
+            self.engine.to_position(Side.Player1)
+        ) != self.keys.hash_position(self.engine.to_position(Side.Player2))
+
+    @pytest.mark.parametrize('index', [1, 4, 6, 8, 13])
+    def test_sown_cups_key_matches_full_hash(self, index):
+        self.engine.cups[index] = 20
+        board = MutablePosition.from_position(self.engine.to_position(Side.Player1))
+        seeds = board.cups[index]
+
+        key = self.keys.hash_position(board.to_position())
+        key ^= self.keys.sown_cups_key(board.cups, index, seeds)
+        board.make_move(index)
+        key ^= self.keys.sown_cups_key(board.cups, index, seeds)
+        if board.side_to_move != Side.Player1:
+            key ^= self.keys.side_key
+
+        assert key == self.keys.hash_position(board.to_position())
+
+
+class TestTranspositionTable:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.table = TranspositionTable(max_bytes=TranspositionTable.ENTRY_BYTES * 4)
+
+    def test_size_from_memory_cap(self):
+        assert self.table.size == 4
+
+    def test_store_and_probe(self):
+        self.table.store(5, depth=3, bound=Bound.Lower, score=-2, best_move=9)
+
+        entry = self.table.probe(5)
+        assert entry.depth == 3
+        assert entry.bound == Bound.Lower
+        assert entry.score == -2
+        assert entry.best_move == 9
+
+    def test_miss(self):
+        assert self.table.probe(5) is None
+        assert self.table.stats.hit_rate == 0
+
+    def test_collision(self):
+        self.table.store(1, depth=3, bound=Bound.Exact, score=0)
+
+        assert self.table.probe(5) is None
+        assert self.table.stats.collisions == 1
+
+    def test_keeps_deeper_entry_from_same_search(self):
+        self.table.store(1, depth=3, bound=Bound.Exact, score=0)
+        self.table.store(5, depth=2, bound=Bound.Exact, score=1)
+
+        assert self.table.probe(1).score == 0
+        assert self.table.stats.evictions == 0
+
+    def test_replaces_entry_from_earlier_search(self):
+        self.table.store(1, depth=3, bound=Bound.Exact, score=0)
+        self.table.new_search()
+        self.table.store(5, depth=2, bound=Bound.Exact, score=1)
+
+        assert self.table.probe(5).score == 1
+        assert self.table.stats.evictions == 1
+
+    def test_occupancy(self):
+        self.table.store(1, depth=3, bound=Bound.Exact, score=0)
+        self.table.store(2, depth=3, bound=Bound.Exact, score=0)
+
+        assert self.table.stats.occupancy == 0.5
+
+
+class TestAlphaBetaWithTable:
+    """
+        a   b   c   d   e   f
+        0   2   0   1   0   0
+    0                           0
+        1   0   3   0   2   0
+        g   h   i   j   k   l
+    """
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, basic_game_setup):
+        self.player = AlphaBetaPlayer(
+            'Player1',
+            wait_time=0,
+            depth=12,
+            transposition_table=TranspositionTable(max_bytes=1024 * 1024),
+        )
+        basic_game_setup(self, player1=self.player)
+
+        self.board.initialize_cups(0)
+        self.board.cups[2] = 2
+        self.board.cups[4] = 1
+        self.board.cups[9] = 2
+        self.board.cups[11] = 3
+        self.board.cups[13] = 1
+
+    def test_same_score_as_plain_search(self):
+        position = self.player.position
+        keys = ZobristKeys.for_cups(len(position.cups))
+        self.player._zobrist = keys
+        self.player._nodes = 0
+
+        board = MutablePosition.from_position(position)
+        with_table = self.player._negamax_in_place(
+            board, 12, -math.inf, math.inf, keys.hash_position(position)
+        )
+        without_table = self.player._negamax_in_place(board, 12, -math.inf, math.inf)
+        assert with_table == without_table
+
+    def test_table_is_used(self):
+        self.player.take_turn()
+
+        stats = self.player.transposition_table.stats
+        assert stats.stores > 0
+        assert stats.hits > 0
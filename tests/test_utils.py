@@ -50,3 +50,12 @@ class TestGenerateSequence:
         ]
         actual = generate_sequence(32)
         assert expected == actual
+
+    def test_longer_labels(self):
+        sequence = generate_sequence(703)
+
+        assert sequence[701] == 'zz'
+        assert sequence[702] == 'aaa'
+
+    def test_unique(self):
+        assert len(set(generate_sequence(20000))) == 20000